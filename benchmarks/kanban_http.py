@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+"""
+HTTP benchmark for the kanban server's /api/status and /api/projects
+
+Compares plain requests with conditional (If-None-Match) requests and
+gzip-accepting requests, and prints the results as JSON.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'kanban'))
+
+from synthetic import make_project
+
+def measure(client, url, count, headers=None):
+    """Issue count GET requests and return requests per second and body size"""
+    
+    size = 0
+    start = time.perf_counter()
+    for _ in range(count):
+        response = client.get(url, headers=headers or {})
+        size = len(response.data)
+    elapsed = time.perf_counter() - start
+    return {'rps': round(count / elapsed, 1), 'status': response.status_code, 'bytes': size}
+
+def measure_baseline(count, project_path):
+    """Requests per second of the old handler: reparse and reserialize each time"""
+    
+    import server
+    
+    start = time.perf_counter()
+    with server.app.test_request_context():
+        for _ in range(count):
+            server._parse_cache.clear()
+            server.jsonify(server.parse_project_status(project_path))
+    elapsed = time.perf_counter() - start
+    return {'rps': round(count / elapsed, 1)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', metavar='N', type=int, default=2000,
+                        help='requests per measurement')
+    parser.add_argument('--tasks', metavar='N', type=int, default=200,
+                        help='tasks per terminal in the test project')
+    args = parser.parse_args()
+    count = args.requests
+    tasks = args.tasks
+    
+    with tempfile.TemporaryDirectory() as root:
+        import server
+        
+        server.PROJECTS_DIR = Path(root)
+        server.project_index = server.ProjectIndex(root)
+        for i in range(20):
+            make_project(root, f'bench-{i}', tasks_per_terminal=tasks, seed=i)
+        server.current_project = str(Path(root) / 'bench-0')
+        
+        client = server.app.test_client()
+        results = {'requests': count, 'tasks_per_terminal': tasks}
+        
+        for name, url in (('status', '/api/status'), ('projects', '/api/projects')):
+            etag = client.get(url).headers['ETag']
+            results[name] = {
+                'plain': measure(client, url, count),
+                'gzip': measure(client, url, count, {'Accept-Encoding': 'gzip'}),
+                'not_modified': measure(client, url, count, {'If-None-Match': etag})
+            }
+            results[name]['speedup_304'] = round(
+                results[name]['not_modified']['rps'] / results[name]['plain']['rps'], 2)
+        
+        results['status']['baseline'] = measure_baseline(count, server.current_project)
+        results['status']['speedup_vs_baseline'] = round(
+            results['status']['not_modified']['rps'] / results['status']['baseline']['rps'], 2)
+        
+        if server.file_observer:
+            server.file_observer.stop()
+    
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
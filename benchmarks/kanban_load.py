@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+
+"""
+Load test for the kanban server
+
+Generates synthetic projects, starts the server on them, attaches Socket.IO,
+SSE and HTTP polling clients, and drives simulated agent edits into the todo
+and phase-status files. Reports file-write-to-client latency percentiles and
+the server's CPU and memory use as JSON.
+
+With --workers N the server runs as a hub with N worker processes and the
+clients are spread over the workers. --scale 1,2,4 repeats the run for each
+worker count and reports delivered events per second for each.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from synthetic import make_project, toggle_random_task, write_phase_status
+
+KANBAN_DIR = Path(__file__).parent.parent / 'kanban'
+
+MARKER_PATTERN = re.compile(r'@(m\d+)')
+
+def int_list(value):
+    return [int(n) for n in value.split(',')]
+
+def percentiles(values):
+    """Summarize latencies in milliseconds"""
+    
+    if not values:
+        return {'count': 0}
+    
+    values = sorted(values)
+    
+    def pick(fraction):
+        return round(values[min(int(fraction * len(values)), len(values) - 1)] * 1000, 1)
+    
+    return {
+        'count': len(values),
+        'p50_ms': pick(0.50),
+        'p90_ms': pick(0.90),
+        'p99_ms': pick(0.99),
+        'max_ms': round(values[-1] * 1000, 1)
+    }
+
+class ProcessSampler:
+    """Samples CPU time and RSS of a process and its children from /proc,
+    or psutil if present"""
+    
+    def __init__(self, pid):
+        self.pid = pid
+        self.peak_rss = 0
+        self.rss_samples = []
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+    
+    def pids(self):
+        try:
+            import psutil
+            return [self.pid] + [p.pid for p in psutil.Process(self.pid).children()]
+        except ImportError:
+            with open(f'/proc/{self.pid}/task/{self.pid}/children') as f:
+                return [self.pid] + [int(pid) for pid in f.read().split()]
+    
+    def cpu_seconds(self):
+        return sum(self._cpu_seconds(pid) for pid in self.pids())
+    
+    def _cpu_seconds(self, pid):
+        try:
+            import psutil
+            times = psutil.Process(pid).cpu_times()
+            return times.user + times.system
+        except ImportError:
+            with open(f'/proc/{pid}/stat') as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+            return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    
+    def rss_bytes(self):
+        return sum(self._rss_bytes(pid) for pid in self.pids())
+    
+    def _rss_bytes(self, pid):
+        try:
+            import psutil
+            return psutil.Process(pid).memory_info().rss
+        except ImportError:
+            with open(f'/proc/{pid}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        return int(line.split()[1]) * 1024
+        return 0
+    
+    def _run(self):
+        while self.running:
+            try:
+                rss = self.rss_bytes()
+            except (OSError, ValueError):
+                break
+            self.peak_rss = max(self.peak_rss, rss)
+            self.rss_samples.append(rss)
+            time.sleep(0.5)
+
+class LatencyRecorder:
+    """Matches markers seen by clients against the time they were written"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.written = {}
+        self.latencies = {}
+        self.seen = set()
+        self.received = {}
+    
+    def wrote(self, marker):
+        with self.lock:
+            self.written[marker] = time.perf_counter()
+    
+    def saw(self, kind, client_id, payload):
+        now = time.perf_counter()
+        with self.lock:
+            self.received[kind] = self.received.get(kind, 0) + 1
+            for marker in set(MARKER_PATTERN.findall(payload)):
+                key = (client_id, marker)
+                if key in self.seen or marker not in self.written:
+                    continue
+                self.seen.add(key)
+                self.latencies.setdefault(kind, []).append(now - self.written[marker])
+
+def run_socketio_client(base_url, client_id, project, recorder, ready):
+    import socketio
+    
+    client = socketio.Client(reconnection=True)
+    
+    def on_event(event):
+        def handler(data):
+            recorder.saw('socketio', client_id, json.dumps(data))
+            if event == 'status_update':
+                ready.set()
+        return handler
+    
+    client.on('status_update', on_event('status_update'))
+    client.on('status_delta', on_event('status_delta'))
+    client.connect(base_url, transports=['websocket'])
+    client.emit('subscribe', {'project': project})
+    return client
+
+def run_sse_client(port, client_id, project, recorder, stop):
+    connection = http.client.HTTPConnection('localhost', port, timeout=30)
+    connection.request('GET', f'/api/stream?project={project}')
+    response = connection.getresponse()
+    while not stop.is_set():
+        line = response.fp.readline()
+        if not line:
+            break
+        if line.startswith(b'data:'):
+            recorder.saw('sse', client_id, line.decode())
+    connection.close()
+
+def run_http_client(port, project, interval, counters, stop):
+    connection = http.client.HTTPConnection('localhost', port, timeout=30)
+    etag = None
+    while not stop.is_set():
+        headers = {'Accept-Encoding': 'gzip'}
+        if etag:
+            headers['If-None-Match'] = etag
+        start = time.perf_counter()
+        connection.request('GET', f'/api/status?project={project}', headers=headers)
+        response = connection.getresponse()
+        response.read()
+        elapsed = time.perf_counter() - start
+        etag = response.getheader('ETag') or etag
+        with counters['lock']:
+            counters['latencies'].append(elapsed)
+            counters[response.status] = counters.get(response.status, 0) + 1
+        stop.wait(interval)
+    connection.close()
+
+def wait_for_server(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            connection = http.client.HTTPConnection('localhost', port, timeout=1)
+            connection.request('GET', '/api/projects')
+            connection.getresponse().read()
+            return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+def run(config, port):
+    """Run one load test and return its results"""
+    
+    projects = config['projects']
+    terminals = config['terminals']
+    workers = config['workers']
+    duration = config['duration']
+    results = {'config': config}
+    
+    with tempfile.TemporaryDirectory() as root:
+        project_paths = [
+            make_project(root, f'load-{i}', terminals, config['tasks_per_terminal'], seed=i)
+            for i in range(projects)
+        ]
+        
+        env = dict(os.environ, KANBAN_PORT=str(port), KANBAN_PROJECTS_DIR=root,
+                   KANBAN_WORKERS=str(workers))
+        server = subprocess.Popen(
+            [sys.executable, str(KANBAN_DIR / 'server.py')],
+            cwd=KANBAN_DIR, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        
+        # Clients go to the workers when there are several, else the server
+        ports = [port + i for i in range(1, workers + 1)] if workers > 1 else [port]
+        
+        try:
+            if not all(wait_for_server(p) for p in ports):
+                raise RuntimeError('Kanban server did not start')
+            
+            recorder = LatencyRecorder()
+            stop = threading.Event()
+            sampler = ProcessSampler(server.pid)
+            sampler.thread.start()
+            
+            # Attach clients, spread over the projects and ports
+            sockets = []
+            for i in range(config['socketio_clients']):
+                ready = threading.Event()
+                sockets.append(run_socketio_client(
+                    f'http://localhost:{ports[i % len(ports)]}', f'sio-{i}',
+                    f'load-{i % projects}', recorder, ready))
+                ready.wait(10)
+            
+            threads = []
+            for i in range(config['sse_clients']):
+                threads.append(threading.Thread(
+                    target=run_sse_client, daemon=True,
+                    args=(ports[i % len(ports)], f'sse-{i}', f'load-{i % projects}', recorder, stop)))
+            
+            http_counters = {'lock': threading.Lock(), 'latencies': []}
+            for i in range(config['http_clients']):
+                threads.append(threading.Thread(
+                    target=run_http_client, daemon=True,
+                    args=(ports[i % len(ports)], f'load-{i % projects}', 0.1, http_counters, stop)))
+            
+            for thread in threads:
+                thread.start()
+            time.sleep(1)
+            
+            # Drive agent edits
+            rng = random.Random(0)
+            cpu_start = sampler.cpu_seconds()
+            wall_start = time.perf_counter()
+            edits = 0
+            edits_per_project = [0] * projects
+            phase_terminals = [
+                {str(t): {'task': f'Workstream {t}', 'status': 'IN_PROGRESS', 'progress': 0}
+                 for t in range(1, terminals + 1)}
+                for _ in range(projects)
+            ]
+            # Edits coalesced into one update overwrite each other's status
+            # text, so the last few markers are reported together
+            recent_markers = [deque(maxlen=8) for _ in range(projects)]
+            while time.perf_counter() - wall_start < duration:
+                project = rng.randrange(projects)
+                project_path = project_paths[project]
+                edits_per_project[project] += 1
+                marker = f'm{edits}'
+                recorder.wrote(marker)
+                recent_markers[project].append(marker)
+                markers = ' '.join(f'@{m}' for m in recent_markers[project])
+                if edits % 5 == 4:
+                    phase_terminals[project] = {
+                        str(t): {'task': f'Workstream {t} {markers}', 'status': 'IN_PROGRESS',
+                                 'progress': rng.randint(0, 100)}
+                        for t in range(1, terminals + 1)
+                    }
+                else:
+                    # Status events carry task counts, not task text, so the
+                    # agent also reports the task it just touched
+                    todo_file = toggle_random_task(project_path, terminals, rng, marker)
+                    terminal = todo_file.stem.split('-')[1]
+                    phase_terminals[project][terminal]['task'] = f'Toggled a task {markers}'
+                write_phase_status(project_path, phase_terminals[project])
+                edits += 1
+                time.sleep(1 / config['edit_rate'])
+            
+            # Let the last updates arrive
+            time.sleep(2)
+            wall = time.perf_counter() - wall_start
+            cpu = sampler.cpu_seconds() - cpu_start
+            
+            stop.set()
+            sampler.running = False
+            for client in sockets:
+                client.disconnect()
+            
+            # Every client subscribed to a project should see each of its edits
+            expected = {
+                'socketio': sum(edits_per_project[i % projects] for i in range(config['socketio_clients'])),
+                'sse': sum(edits_per_project[i % projects] for i in range(config['sse_clients']))
+            }
+            
+            results['edits'] = edits
+            results['latency'] = {
+                kind: dict(percentiles(values),
+                           delivered_ratio=round(len(values) / expected[kind], 3) if expected.get(kind) else None)
+                for kind, values in recorder.latencies.items()
+            }
+            results['events_received'] = recorder.received
+            results['events_delivered_per_second'] = round(
+                sum(len(values) for values in recorder.latencies.values()) / wall, 1)
+            results['http'] = dict(
+                percentiles(http_counters['latencies']),
+                responses={str(k): v for k, v in http_counters.items() if isinstance(k, int)}
+            )
+            results['server'] = {
+                'cpu_percent': round(cpu / wall * 100, 1),
+                'peak_rss_mb': round(sampler.peak_rss / 2 ** 20, 1),
+                'mean_rss_mb': round(sum(sampler.rss_samples) / max(len(sampler.rss_samples), 1) / 2 ** 20, 1)
+            }
+        finally:
+            server.terminate()
+            server.wait(10)
+    
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--projects', metavar='N', type=int, default=5, help='synthetic projects')
+    parser.add_argument('--terminals', metavar='N', type=int, default=5,
+                        help='terminals per project')
+    parser.add_argument('--tasks', metavar='N', type=int, default=100, help='tasks per terminal')
+    parser.add_argument('--socketio-clients', metavar='N', type=int, default=20)
+    parser.add_argument('--sse-clients', metavar='N', type=int, default=10)
+    parser.add_argument('--http-clients', metavar='N', type=int, default=5,
+                        help='clients polling /api/status')
+    parser.add_argument('--edit-rate', metavar='PER_SECOND', type=float, default=5.0,
+                        help='file edits per second')
+    parser.add_argument('--duration', metavar='SECONDS', type=float, default=20.0,
+                        help='seconds of edits')
+    parser.add_argument('--workers', metavar='N', type=int, default=1,
+                        help='server worker processes')
+    parser.add_argument('--scale', metavar='N,N,...', type=int_list,
+                        help='comma-separated worker counts to run in turn')
+    parser.add_argument('--port', metavar='N', type=int, default=5611)
+    parser.add_argument('--output', metavar='FILE', help='also write the report to this file')
+    args = parser.parse_args()
+    
+    config = {
+        'projects': args.projects,
+        'terminals': args.terminals,
+        'tasks_per_terminal': args.tasks,
+        'socketio_clients': args.socketio_clients,
+        'sse_clients': args.sse_clients,
+        'http_clients': args.http_clients,
+        'edit_rate': args.edit_rate,
+        'duration': args.duration,
+        'workers': args.workers
+    }
+    port = args.port
+    output = args.output
+    scale = args.scale
+    
+    if scale:
+        runs = [run(dict(config, workers=workers), port) for workers in scale]
+        base = runs[0]['events_delivered_per_second'] or 1
+        results = {
+            'runs': runs,
+            'scaling': [
+                {
+                    'workers': r['config']['workers'],
+                    'events_delivered_per_second': r['events_delivered_per_second'],
+                    'speedup': round(r['events_delivered_per_second'] / base, 2),
+                    'cpu_percent': r['server']['cpu_percent']
+                }
+                for r in runs
+            ],
+            'cpus': os.cpu_count()
+        }
+    else:
+        results = run(config, port)
+    
+    report = json.dumps(results, indent=2)
+    if output:
+        with open(output, 'w') as f:
+            f.write(report + '\n')
+    print(report)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+"""
+Change request task extraction benchmark
+
+Extracts tasks from large synthetic change requests (prose paragraphs,
+bullet and numbered lists, long unpunctuated lines as in pasted issue
+dumps) with TaskTracker.extract_tasks_from_request and with the
+implementation it replaced: seven re.finditer passes plus two regexes per
+line. Prints time, throughput and tasks found per input size as JSON.
+"""
+
+import argparse
+import importlib.util
+import json
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from synthetic import make_project
+
+VERBS = ['add', 'adds', 'implement', 'create', 'build', 'fix', 'fixes', 'update', 'improve']
+WORDS = ['the', 'login', 'page', 'api', 'cache', 'search', 'admin', 'dashboard', 'export',
+         'billing', 'flow', 'tests', 'for', 'with', 'user', 'settings', 'docs', 'mobile']
+
+def legacy_extract(request):
+    """extract_tasks_from_request before the combined pattern"""
+    
+    tasks = []
+    patterns = [
+        r'add[s]?\s+(.+?)(?:\.|,|;|$)',
+        r'implement[s]?\s+(.+?)(?:\.|,|;|$)',
+        r'create[s]?\s+(.+?)(?:\.|,|;|$)',
+        r'build[s]?\s+(.+?)(?:\.|,|;|$)',
+        r'fix[es]?\s+(.+?)(?:\.|,|;|$)',
+        r'update[s]?\s+(.+?)(?:\.|,|;|$)',
+        r'improve[s]?\s+(.+?)(?:\.|,|;|$)',
+    ]
+    
+    request_lower = request.lower()
+    for pattern in patterns:
+        for match in re.finditer(pattern, request_lower):
+            task = match.group(1).strip()
+            if len(task) > 5:
+                tasks.append(task)
+    
+    for line in request.split('\n'):
+        line = line.strip()
+        if re.match(r'^[-*•]\s+(.+)$', line):
+            tasks.append(re.sub(r'^[-*•]\s+', '', line))
+        elif re.match(r'^\d+\.\s+(.+)$', line):
+            tasks.append(re.sub(r'^\d+\.\s+', '', line))
+    
+    return tasks
+
+def phrase(rng, low, high):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+def make_request(rng, size):
+    """Change request text of about size bytes"""
+    
+    parts = []
+    length = 0
+    while length < size:
+        kind = rng.random()
+        if kind < 0.5:
+            sentence = ', '.join(
+                f"{rng.choice(VERBS)} {phrase(rng, 2, 8)}" if rng.random() < 0.6 else phrase(rng, 3, 10)
+                for _ in range(rng.randint(1, 4)))
+            part = sentence.capitalize() + '.'
+        elif kind < 0.7:
+            part = f"- {rng.choice(VERBS).capitalize()} {phrase(rng, 2, 8)}"
+        elif kind < 0.85:
+            part = f"{rng.randint(1, 99)}. {phrase(rng, 3, 10)}"
+        else:
+            # Pasted logs and issue text: long lines without punctuation
+            part = ' '.join(f"{rng.choice(VERBS)} {phrase(rng, 4, 12)}" for _ in range(rng.randint(5, 30)))
+        parts.append(part)
+        length += len(part) + 1
+    return '\n'.join(parts)
+
+def time_extract(extract, text, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tasks = extract(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, tasks
+
+def float_list(value):
+    return [float(n) for n in value.split(',')]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', metavar='MB,MB,...', type=float_list, default=[1, 4, 16],
+                        help='comma-separated request sizes in MB')
+    parser.add_argument('--repeat', metavar='N', type=int, default=3,
+                        help='runs of each extraction; the best is reported')
+    args = parser.parse_args()
+    sizes = args.sizes
+    repeat = args.repeat
+    
+    spec = importlib.util.spec_from_file_location(
+        'task_tracker', Path(__file__).parent.parent / 'bin' / 'task-tracker.py')
+    task_tracker = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(task_tracker)
+    
+    results = {'repeat': repeat, 'sizes': []}
+    with tempfile.TemporaryDirectory() as root:
+        tracker = task_tracker.TaskTracker(make_project(root, 'extract', tasks_per_terminal=0))
+        rng = random.Random(0)
+        
+        for size_mb in sizes:
+            text = make_request(rng, int(size_mb * 1024 * 1024))
+            megabytes = len(text.encode()) / (1024 * 1024)
+            
+            legacy_seconds, legacy_tasks = time_extract(legacy_extract, text, repeat)
+            seconds, tasks = time_extract(tracker.extract_tasks_from_request, text, repeat)
+            
+            results['sizes'].append({
+                'megabytes': round(megabytes, 2),
+                'legacy': {
+                    'seconds': round(legacy_seconds, 3),
+                    'mb_per_second': round(megabytes / legacy_seconds, 1),
+                    'tasks': len(legacy_tasks),
+                    'distinct_tasks': len(set(legacy_tasks))
+                },
+                'combined_pattern': {
+                    'seconds': round(seconds, 3),
+                    'mb_per_second': round(megabytes / seconds, 1),
+                    'tasks': len(tasks)
+                },
+                'speedup': round(legacy_seconds / seconds, 1)
+            })
+    
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+
+"""
+Concurrent writer stress test for todo and phase-status files
+
+Starts many writer processes that all read-modify-write the same
+phase-status.json (each bumps its own terminal's progress) and the same
+todo file (each checks off its own tasks), while a reader keeps parsing
+both. Afterwards every increment and every checked task must be there.
+Runs once with bin/state_files.py and once with the plain open('w')
+writes it replaced. Prints lost updates and torn reads as JSON, and exits
+non-zero if the state_files run lost anything.
+"""
+
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'bin'))
+
+import state_files
+from synthetic import make_project, write_phase_status
+
+def load_task_tracker():
+    spec = importlib.util.spec_from_file_location(
+        'task_tracker', Path(__file__).parent.parent / 'bin' / 'task-tracker.py')
+    task_tracker = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(task_tracker)
+    return task_tracker
+
+def bump_progress(data, writer):
+    data['phase_1']['terminals'][str(writer)]['progress'] += 1
+
+def plain_bump(phase_file, writer):
+    # A torn read loses this update rather than crashing the writer
+    try:
+        with open(phase_file, 'r') as f:
+            data = json.load(f)
+    except ValueError:
+        return
+    bump_progress(data, writer)
+    with open(phase_file, 'w') as f:
+        json.dump(data, f, indent=2)
+
+def plain_check_off(todo_file, task_text):
+    with open(todo_file, 'r') as f:
+        lines = f.readlines()
+    for i, line in enumerate(lines):
+        if line.startswith('- [ ] ') and line[6:].rstrip('\n') == task_text:
+            lines[i] = f'- [x] {task_text}\n'
+    with open(todo_file, 'w') as f:
+        f.writelines(lines)
+
+def writer_task(project_path, writer, updates, use_state_files):
+    phase_file = project_path / 'coordination' / 'phase-status.json'
+    todo_file = project_path / 'todo' / 'terminal-1.md'
+    tracker = load_task_tracker().TaskTracker(project_path) if use_state_files else None
+    
+    for i in range(updates):
+        task_text = f'Task {i} of writer {writer}'
+        if use_state_files:
+            state_files.update_json(phase_file, lambda data: bump_progress(data, writer))
+            tracker.update_task_status(1, task_text, True)
+        else:
+            plain_bump(phase_file, writer)
+            plain_check_off(todo_file, task_text)
+
+def reader_task(project_path, stop, torn_reads):
+    phase_file = project_path / 'coordination' / 'phase-status.json'
+    todo_file = project_path / 'todo' / 'terminal-1.md'
+    while not stop.is_set():
+        try:
+            with open(phase_file, 'r') as f:
+                json.load(f)
+            with open(todo_file, 'r') as f:
+                if not f.read().startswith('# Terminal 1'):
+                    raise ValueError('truncated todo file')
+        except (ValueError, FileNotFoundError):
+            with torn_reads.get_lock():
+                torn_reads.value += 1
+
+def run(root, writers, updates, use_state_files):
+    project_path = make_project(root, 'state_files' if use_state_files else 'plain',
+                                terminals=1, tasks_per_terminal=0)
+    write_phase_status(project_path, {
+        str(w): {'task': f'Writer {w}', 'status': 'IN_PROGRESS', 'progress': 0}
+        for w in range(writers)
+    })
+    with open(project_path / 'todo' / 'terminal-1.md', 'w') as f:
+        f.write('# Terminal 1 - Tasks\n\n## Current Work\n')
+        for i in range(updates):
+            for w in range(writers):
+                f.write(f'- [ ] Task {i} of writer {w}\n')
+    
+    stop = multiprocessing.Event()
+    torn_reads = multiprocessing.Value('i', 0)
+    reader = multiprocessing.Process(target=reader_task, args=(project_path, stop, torn_reads))
+    reader.start()
+    
+    start = time.perf_counter()
+    processes = [
+        multiprocessing.Process(target=writer_task,
+                                args=(project_path, w, updates, use_state_files))
+        for w in range(writers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start
+    
+    stop.set()
+    reader.join()
+    
+    with open(project_path / 'coordination' / 'phase-status.json', 'r') as f:
+        terminals = json.load(f)['phase_1']['terminals']
+    with open(project_path / 'todo' / 'terminal-1.md', 'r') as f:
+        unchecked = f.read().count('- [ ] ')
+    
+    return {
+        'seconds': round(elapsed, 2),
+        'lost_progress_updates': writers * updates - sum(t['progress'] for t in terminals.values()),
+        'lost_task_updates': unchecked,
+        'torn_reads': torn_reads.value,
+        'failed_writers': sum(1 for p in processes if p.exitcode != 0)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--writers', metavar='N', type=int, default=8,
+                        help='concurrent writer processes')
+    parser.add_argument('--updates', metavar='N', type=int, default=50,
+                        help='updates made by each writer')
+    args = parser.parse_args()
+    writers = args.writers
+    updates = args.updates
+    
+    with tempfile.TemporaryDirectory() as root:
+        results = {
+            'writers': writers,
+            'updates_per_writer': updates,
+            'state_files': run(root, writers, updates, True),
+            'plain_writes': run(root, writers, updates, False)
+        }
+    
+    print(json.dumps(results, indent=2))
+    
+    checked = results['state_files']
+    if (checked['lost_progress_updates'] or checked['lost_task_updates']
+            or checked['torn_reads'] or checked['failed_writers']):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
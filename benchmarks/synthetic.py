@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+"""
+Synthetic swarm projects for benchmarks
+"""
+
+import json
+import random
+from pathlib import Path
+
+SECTIONS = ['Current Work', 'Backlog', 'Phase 2: Core Features', 'Phase 3: Advanced Features']
+
+def make_project(root, name, terminals=5, tasks_per_terminal=50, seed=0):
+    """Create a project directory with todo files and phase status
+    
+    Returns the project path.
+    """
+    
+    rng = random.Random(seed)
+    project_path = Path(root) / name
+    (project_path / 'todo').mkdir(parents=True, exist_ok=True)
+    (project_path / 'coordination').mkdir(parents=True, exist_ok=True)
+    
+    with open(project_path / 'swarm.config', 'w') as f:
+        f.write(f'PROJECT_NAME="{name}"\n')
+        f.write('CREATED_AT="2025-01-01 00:00:00"\n')
+        f.write(f'TERMINALS={terminals}\n')
+        f.write('PHASES=4\n')
+        f.write('STATUS="RUNNING"\n')
+    
+    phase_terminals = {
+        str(t): {'task': f'Workstream {t}', 'status': 'IN_PROGRESS', 'progress': 0}
+        for t in range(1, terminals + 1)
+    }
+    write_phase_status(project_path, phase_terminals)
+    
+    for t in range(1, terminals + 1):
+        lines = [f'# Terminal {t} - Tasks\n']
+        for i in range(tasks_per_terminal):
+            if i % 10 == 0:
+                lines.append(f'\n## {SECTIONS[(i // 10) % len(SECTIONS)]}\n')
+            mark = 'x' if rng.random() < 0.3 else ' '
+            lines.append(f'- [{mark}] Implement item {i} of workstream {t} with tests\n')
+        with open(project_path / 'todo' / f'terminal-{t}.md', 'w') as f:
+            f.writelines(lines)
+    
+    return project_path
+
+def write_phase_status(project_path, terminals, phase=1):
+    """Write coordination/phase-status.json for the given terminal states"""
+    
+    data = {
+        'current_phase': phase,
+        f'phase_{phase}': {'name': 'Core Features', 'status': 'ACTIVE', 'terminals': terminals}
+    }
+    with open(Path(project_path) / 'coordination' / 'phase-status.json', 'w') as f:
+        json.dump(data, f, indent=2)
+
+def toggle_random_task(project_path, terminals, rng, marker=None):
+    """Flip one checkbox in a random todo file, as an agent would
+    
+    If marker is given it is appended to the toggled line so that the
+    change can be recognised by clients. Returns the file written.
+    """
+    
+    todo_file = Path(project_path) / 'todo' / f'terminal-{rng.randint(1, terminals)}.md'
+    with open(todo_file, 'r') as f:
+        lines = f.readlines()
+    
+    candidates = [i for i, line in enumerate(lines) if line.startswith('- [')]
+    i = rng.choice(candidates)
+    line = lines[i]
+    text = line[6:].rstrip('\n').split(' @', 1)[0]
+    mark = ' ' if line.startswith('- [x]') else 'x'
+    lines[i] = f'- [{mark}] {text}' + (f' @{marker}' if marker else '') + '\n'
+    
+    with open(todo_file, 'w') as f:
+        f.writelines(lines)
+    return todo_file
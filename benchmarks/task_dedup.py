@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+"""
+Duplicate task detection benchmark
+
+Filters new tasks against a project's open tasks the way
+TaskTracker.merge_new_tasks does, once with the full difflib scan it used
+before and once with the trigram similarity index. Half of the new tasks
+are reworded copies of open tasks. Prints time per run and how often the
+two disagree as JSON.
+"""
+
+import argparse
+import difflib
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'bin'))
+
+from task_similarity import SimilarityIndex
+
+VERBS = ['add', 'implement', 'fix', 'refactor', 'document', 'test', 'optimize',
+         'remove', 'migrate', 'validate', 'cache', 'log', 'secure', 'expose']
+DETAILS = ['for mobile', 'with tests', 'behind a flag', 'for admins', 'in staging',
+           'using redis', 'with pagination', 'for large accounts', 'on startup',
+           'with metrics', 'for the v2 api', 'without downtime', 'per tenant',
+           'across regions', 'in the background', 'with retries']
+SYLLABLES = ['ka', 'lo', 'mi', 'ren', 'do', 'sa', 'vi', 'tor', 'ne', 'pu', 'gal', 'fe',
+             'zo', 'bri', 'ta', 'mun', 'se', 'ko', 'dar', 'li', 'qua', 'hex', 'yo', 'wen',
+             'jus', 'pix', 'orb', 'cle', 'vam', 'ust', 'gri', 'nel', 'fay', 'rho', 'dex',
+             'im', 'ob', 'ux', 'eth', 'ark']
+KINDS = ['service', 'page', 'endpoint', 'worker', 'form', 'report', 'module', 'queue']
+
+def make_nouns(rng, count):
+    """Component names, as varied as a large project's"""
+    
+    return [
+        ''.join(rng.choice(SYLLABLES) for _ in range(3)) + ' ' + rng.choice(KINDS)
+        for _ in range(count)
+    ]
+
+def make_task(rng, nouns):
+    words = [rng.choice(VERBS), rng.choice(nouns), rng.choice(DETAILS)]
+    if rng.random() < 0.5:
+        words.append(rng.choice(DETAILS))
+    return ' '.join(words)
+
+def reword(rng, text):
+    """A near copy of a task, as someone restating it would write it"""
+    
+    words = text.split()
+    edit = rng.randrange(4)
+    if edit == 0:
+        words[rng.randrange(len(words))] = rng.choice(VERBS)
+    elif edit == 1 and len(words) > 3:
+        del words[rng.randrange(len(words))]
+    elif edit == 2:
+        words.insert(rng.randrange(len(words) + 1), rng.choice(['the', 'new', 'all', 'basic']))
+    else:
+        i = rng.randrange(len(text))
+        return (text[:i] + text[i + 1:]).capitalize()
+    return ' '.join(words)
+
+def scan_filter(new_tasks, existing_texts):
+    """merge_new_tasks' duplicate check before the index"""
+    
+    duplicates = []
+    for task in new_tasks:
+        for existing in existing_texts:
+            if difflib.SequenceMatcher(None, task.lower(), existing).ratio() > 0.7:
+                duplicates.append(task)
+                break
+    return duplicates
+
+def index_filter(new_tasks, existing_texts):
+    index = SimilarityIndex(0.7)
+    for text in existing_texts:
+        index.add(text)
+    return [task for task in new_tasks if index.find(task) is not None]
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def int_list(value):
+    return [int(n) for n in value.split(',')]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--existing', metavar='N,N,...', type=int_list, default=[1000, 5000],
+                        help='comma-separated numbers of open tasks to check against')
+    parser.add_argument('--new', metavar='N', type=int, default=100,
+                        help='new tasks checked per size')
+    args = parser.parse_args()
+    sizes = args.existing
+    new_count = args.new
+    
+    results = []
+    for size in sizes:
+        rng = random.Random(size)
+        nouns = make_nouns(rng, size)
+        existing_texts = [make_task(rng, nouns).lower() for _ in range(size)]
+        new_tasks = [
+            reword(rng, rng.choice(existing_texts)) if i % 2 else make_task(rng, nouns)
+            for i in range(new_count)
+        ]
+        
+        scan_seconds, scan_duplicates = timed(scan_filter, new_tasks, existing_texts)
+        index_seconds, index_duplicates = timed(index_filter, new_tasks, existing_texts)
+        
+        results.append({
+            'existing': size,
+            'new': new_count,
+            'scan_seconds': round(scan_seconds, 3),
+            'index_seconds': round(index_seconds, 3),
+            'speedup': round(scan_seconds / index_seconds, 1),
+            'duplicates': len(scan_duplicates),
+            'missed': len(set(scan_duplicates) - set(index_duplicates)),
+            'extra': len(set(index_duplicates) - set(scan_duplicates))
+        })
+    
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
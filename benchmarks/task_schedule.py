@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+"""
+Task distribution benchmark
+
+Simulates batches of new tasks handed to terminals that already have
+uneven backlogs, and compares the makespan (when the last terminal
+finishes) of the round-robin distribution TaskTracker used before with the
+load-aware scheduler. Task sizes follow their estimated cost with noise.
+Runs once with equally fast terminals and once with terminals whose speed
+differs and is known from history. Prints the results as JSON.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'bin'))
+
+import task_scheduler
+
+def make_task(rng):
+    return ' '.join(rng.choice(['build', 'the', 'api', 'page', 'test', 'auth', 'cache', 'docs'])
+                    for _ in range(rng.randint(2, 30)))
+
+def round_robin(tasks, current_tasks):
+    """distribute_tasks before the scheduler"""
+    
+    workload = {t: sum(1 for task in ts if task['status'] != 'completed')
+                for t, ts in current_tasks.items()}
+    sorted_terminals = sorted(workload, key=lambda t: workload[t])
+    distribution = {t: [] for t in current_tasks}
+    for i, task in enumerate(tasks):
+        distribution[sorted_terminals[i % len(sorted_terminals)]].append(task)
+    return distribution
+
+def scheduled(tasks, current_tasks, speeds):
+    terminals = sorted(current_tasks)
+    loads = task_scheduler.projected_loads(current_tasks, terminals, speeds)
+    costs = [task_scheduler.estimate_cost(task) for task in tasks]
+    distribution = {t: [] for t in terminals}
+    for task, terminal in zip(tasks, task_scheduler.assign(costs, loads, speeds)):
+        distribution[terminal].append(task)
+    return distribution
+
+def makespan(distribution, current_tasks, true_cost, speeds):
+    return max(
+        speeds.get(t, 1.0) * (
+            sum(true_cost[task['text']] * (0.5 if task['status'] == 'in_progress' else 1)
+                for task in current_tasks[t] if task['status'] != 'completed')
+            + sum(true_cost[task] for task in distribution[t])
+        )
+        for t in current_tasks
+    )
+
+def trial(rng, terminals, varied_speeds):
+    true_cost = {}
+    
+    def new_task():
+        text = f"{make_task(rng)} #{len(true_cost)}"
+        true_cost[text] = task_scheduler.estimate_cost(text) * rng.lognormvariate(0, 0.3)
+        return text
+    
+    current_tasks = {
+        t: [{'text': new_task(), 'status': rng.choice(['pending', 'pending', 'in_progress', 'completed'])}
+            for _ in range(rng.randint(0, 40))]
+        for t in range(1, terminals + 1)
+    }
+    tasks = [new_task() for _ in range(rng.randint(20, 60))]
+    speeds = ({t: rng.uniform(0.6, 1.6) for t in current_tasks} if varied_speeds else {})
+    
+    baseline = makespan(round_robin(tasks, current_tasks), current_tasks, true_cost, speeds)
+    improved = makespan(scheduled(tasks, current_tasks, speeds), current_tasks, true_cost, speeds)
+    return baseline, improved
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--trials', metavar='N', type=int, default=500,
+                        help='random batches scheduled')
+    parser.add_argument('--terminals', metavar='N', type=int, default=5, help='terminals per trial')
+    args = parser.parse_args()
+    trials = args.trials
+    terminals = args.terminals
+    
+    results = {'trials': trials, 'terminals': terminals}
+    for name, varied_speeds in (('equal_speeds', False), ('varied_speeds', True)):
+        rng = random.Random(terminals)
+        runs = [trial(rng, terminals, varied_speeds) for _ in range(trials)]
+        ratios = [improved / baseline for baseline, improved in runs]
+        results[name] = {
+            'round_robin_makespan': round(statistics.mean(b for b, _ in runs), 1),
+            'scheduler_makespan': round(statistics.mean(i for _, i in runs), 1),
+            'mean_ratio': round(statistics.mean(ratios), 3),
+            'worse_trials': sum(1 for r in ratios if r > 1.0001)
+        }
+    
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+"""
+Todo file parsing benchmark
+
+Parses one large synthetic todo file with the shared todo parser, through
+the Kanban server's and the task tracker's wrappers around it, and with the
+two implementations they used before. Prints time and peak memory per parse
+as JSON.
+"""
+
+import argparse
+import importlib.util
+import json
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'bin'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'kanban'))
+
+from synthetic import make_project
+
+def legacy_server_parse(file_path):
+    """parse_todo_file before the shared parser: substring checks per line"""
+    
+    import hashlib
+    
+    tasks = {'completed': [], 'in_progress': [], 'pending': [], 'all': []}
+    with open(file_path, 'r') as f:
+        lines = f.readlines()
+    
+    current_section = ''
+    seen_ids = {}
+    
+    def task_id(section, text):
+        base = hashlib.md5(f"{section}:{text}".encode()).hexdigest()[:8]
+        occurrence = seen_ids.get(base, 0)
+        seen_ids[base] = occurrence + 1
+        return base if occurrence == 0 else f"{base}-{occurrence}"
+    
+    for line in lines:
+        if line.startswith('#'):
+            current_section = line.strip('#').strip()
+        if '- [x]' in line.lower() or '- [X]' in line:
+            task = line.replace('- [x]', '').replace('- [X]', '').strip()
+            tasks['completed'].append({'id': task_id(current_section, task), 'text': task,
+                                       'section': current_section, 'status': 'completed'})
+            tasks['all'].append(task)
+        elif '- [ ]' in line:
+            task = line.replace('- [ ]', '').strip()
+            status = ('in_progress' if any(k in current_section.lower()
+                                           for k in ['current', 'working', 'in progress'])
+                      else 'pending')
+            tasks[status].append({'id': task_id(current_section, task), 'text': task,
+                                  'section': current_section, 'status': status})
+            tasks['all'].append(task)
+    return tasks
+
+def legacy_tracker_parse(file_path):
+    """parse_markdown_tasks before the shared parser: re.match per line"""
+    
+    import hashlib
+    
+    tasks = []
+    current_section = ''
+    with open(file_path, 'r') as f:
+        lines = f.readlines()
+    
+    for i, line in enumerate(lines):
+        if line.startswith('#'):
+            current_section = line.strip('#').strip()
+        task_match = re.match(r'^(\s*)- \[([ xX])\] (.+)$', line)
+        if task_match:
+            task_text = task_match.group(3)
+            normalized = re.sub(r'\d+', 'N', task_text)
+            normalized = re.sub(r'\s+', ' ', normalized).strip().lower()
+            tasks.append({
+                'id': hashlib.md5(f"{file_path.name}:{normalized}".encode()).hexdigest()[:8],
+                'text': task_text,
+                'completed': task_match.group(2).lower() == 'x',
+                'section': current_section,
+                'line_number': i,
+                'indent': len(task_match.group(1)),
+                'file': file_path.name
+            })
+    return tasks
+
+def measure(func, repeat):
+    """Best time of repeat calls, and peak traced memory of one call"""
+    
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    
+    return {'seconds': round(best, 4), 'peak_mb': round(peak / 2 ** 20, 1)}, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', metavar='N', type=int, default=100_000,
+                        help='lines in the todo file')
+    parser.add_argument('--repeat', metavar='N', type=int, default=3,
+                        help='runs of each parser; the best is reported')
+    args = parser.parse_args()
+    line_count = args.lines
+    repeat = args.repeat
+    
+    import todo_parser
+    import server
+    
+    # make_project writes a heading and a blank line every 10 tasks
+    tasks_per_terminal = line_count * 10 // 12
+    
+    spec = importlib.util.spec_from_file_location(
+        'task_tracker', Path(__file__).parent.parent / 'bin' / 'task-tracker.py')
+    task_tracker = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(task_tracker)
+    
+    with tempfile.TemporaryDirectory() as root:
+        project_path = make_project(root, 'parse', terminals=1, tasks_per_terminal=tasks_per_terminal)
+        todo_file = project_path / 'todo' / 'terminal-1.md'
+        tracker = task_tracker.TaskTracker(project_path)
+        
+        with open(todo_file) as f:
+            lines = sum(1 for _ in f)
+        results = {'lines': lines, 'tasks': tasks_per_terminal}
+        
+        # Counting tasks straight off the stream never holds them all
+        def count_tasks():
+            return sum(1 for _ in todo_parser.parse_file(todo_file))
+        
+        cases = {
+            'todo_parser_stream': count_tasks,
+            'todo_parser_list': lambda: list(todo_parser.parse_file(todo_file)),
+            'server_parse_todo_file': lambda: server.parse_todo_file(todo_file),
+            'tracker_parse_markdown_tasks': lambda: tracker.parse_markdown_tasks(todo_file),
+            'legacy_server_parse': lambda: legacy_server_parse(todo_file),
+            'legacy_tracker_parse': lambda: legacy_tracker_parse(todo_file),
+        }
+        
+        for name, func in cases.items():
+            results[name], _ = measure(func, repeat)
+            results[name]['lines_per_second'] = round(lines / results[name]['seconds'])
+        
+        results['server_speedup'] = round(
+            results['legacy_server_parse']['seconds'] / results['server_parse_todo_file']['seconds'], 2)
+        results['tracker_speedup'] = round(
+            results['legacy_tracker_parse']['seconds'] / results['tracker_parse_markdown_tasks']['seconds'], 2)
+    
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
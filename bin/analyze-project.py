@@ -9,8 +9,11 @@ import json
 import os
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+import swarm_config
+
 def analyze_project(project_name, project_prompt, project_path):
-    """Analyze project requirements and generate todos for 5 terminals"""
+    """Analyze project requirements and generate todos for the project's terminals"""
     
     # Parse the project prompt to understand requirements
     prompt_lower = project_prompt.lower()
@@ -20,13 +23,14 @@ def analyze_project(project_name, project_prompt, project_path):
     features = extract_features(prompt_lower)
     
     # Generate phase structure
-    phases = generate_phases(project_type, features)
+    terminal_count = len(swarm_config.terminals(project_path))
+    phases = generate_phases(project_type, features, terminal_count)
     
     # Generate todos for each terminal
-    todos = generate_todos(project_type, features, phases)
+    todos = generate_todos(project_type, features, phases, terminal_count)
     
     # Write todo files
-    for term_num in range(1, 6):
+    for term_num in todos:
         todo_file = Path(project_path) / "todo" / f"terminal-{term_num}.md"
         with open(todo_file, 'w') as f:
             f.write(todos[term_num])
@@ -34,7 +38,7 @@ def analyze_project(project_name, project_prompt, project_path):
     # Write master checklist
     master_file = Path(project_path) / "todo" / "MASTER-CHECKLIST.md"
     with open(master_file, 'w') as f:
-        f.write(generate_master_checklist(project_name, project_prompt, phases))
+        f.write(generate_master_checklist(project_name, project_prompt, phases, terminal_count))
     
     # Write phase status
     phase_file = Path(project_path) / "coordination" / "phase-status.json"
@@ -93,7 +97,15 @@ def extract_features(prompt):
     
     return features
 
-def generate_phases(project_type, features):
+def phase_terminals(tasks, count, status):
+    """Phase status entries of count terminals for a phase's per-role tasks"""
+    
+    return {
+        str(term_num): {"task": task, "status": status, "progress": 0}
+        for term_num, task in swarm_config.spread(tasks, count).items()
+    }
+
+def generate_phases(project_type, features, terminal_count=swarm_config.DEFAULT_TERMINALS):
     """Generate development phases based on project type"""
     
     base_phases = {
@@ -120,51 +132,51 @@ def generate_phases(project_type, features):
         }
     }
     
-    # Assign tasks based on project type
+    # Assign tasks based on project type, one per role
     if project_type == 'webapp':
-        base_phases["phase_1"]["terminals"] = {
-            "1": {"task": "Project setup & build configuration", "status": "NOT_STARTED", "progress": 0},
-            "2": {"task": "Backend API structure", "status": "NOT_STARTED", "progress": 0},
-            "3": {"task": "Frontend framework setup", "status": "NOT_STARTED", "progress": 0},
-            "4": {"task": "Database schema design", "status": "NOT_STARTED", "progress": 0},
-            "5": {"task": "Development environment & tooling", "status": "NOT_STARTED", "progress": 0}
-        }
-        base_phases["phase_2"]["terminals"] = {
-            "1": {"task": "Authentication system", "status": "WAITING", "progress": 0},
-            "2": {"task": "Core API endpoints", "status": "WAITING", "progress": 0},
-            "3": {"task": "Main UI components", "status": "WAITING", "progress": 0},
-            "4": {"task": "Data models & validation", "status": "WAITING", "progress": 0},
-            "5": {"task": "Testing framework", "status": "WAITING", "progress": 0}
-        }
+        base_phases["phase_1"]["terminals"] = phase_terminals([
+            "Project setup & build configuration",
+            "Backend API structure",
+            "Frontend framework setup",
+            "Database schema design",
+            "Development environment & tooling"
+        ], terminal_count, "NOT_STARTED")
+        base_phases["phase_2"]["terminals"] = phase_terminals([
+            "Authentication system",
+            "Core API endpoints",
+            "Main UI components",
+            "Data models & validation",
+            "Testing framework"
+        ], terminal_count, "WAITING")
     elif project_type == 'api':
-        base_phases["phase_1"]["terminals"] = {
-            "1": {"task": "API framework setup", "status": "NOT_STARTED", "progress": 0},
-            "2": {"task": "Database configuration", "status": "NOT_STARTED", "progress": 0},
-            "3": {"task": "Authentication & security", "status": "NOT_STARTED", "progress": 0},
-            "4": {"task": "Core endpoints structure", "status": "NOT_STARTED", "progress": 0},
-            "5": {"task": "Documentation setup", "status": "NOT_STARTED", "progress": 0}
-        }
+        base_phases["phase_1"]["terminals"] = phase_terminals([
+            "API framework setup",
+            "Database configuration",
+            "Authentication & security",
+            "Core endpoints structure",
+            "Documentation setup"
+        ], terminal_count, "NOT_STARTED")
     elif project_type == 'ml':
-        base_phases["phase_1"]["terminals"] = {
-            "1": {"task": "Data pipeline setup", "status": "NOT_STARTED", "progress": 0},
-            "2": {"task": "Model architecture", "status": "NOT_STARTED", "progress": 0},
-            "3": {"task": "Training infrastructure", "status": "NOT_STARTED", "progress": 0},
-            "4": {"task": "Evaluation metrics", "status": "NOT_STARTED", "progress": 0},
-            "5": {"task": "Experiment tracking", "status": "NOT_STARTED", "progress": 0}
-        }
+        base_phases["phase_1"]["terminals"] = phase_terminals([
+            "Data pipeline setup",
+            "Model architecture",
+            "Training infrastructure",
+            "Evaluation metrics",
+            "Experiment tracking"
+        ], terminal_count, "NOT_STARTED")
     else:
         # Generic project phases
-        base_phases["phase_1"]["terminals"] = {
-            "1": {"task": "Core architecture setup", "status": "NOT_STARTED", "progress": 0},
-            "2": {"task": "Data layer implementation", "status": "NOT_STARTED", "progress": 0},
-            "3": {"task": "Business logic layer", "status": "NOT_STARTED", "progress": 0},
-            "4": {"task": "Interface/API layer", "status": "NOT_STARTED", "progress": 0},
-            "5": {"task": "Infrastructure & tooling", "status": "NOT_STARTED", "progress": 0}
-        }
+        base_phases["phase_1"]["terminals"] = phase_terminals([
+            "Core architecture setup",
+            "Data layer implementation",
+            "Business logic layer",
+            "Interface/API layer",
+            "Infrastructure & tooling"
+        ], terminal_count, "NOT_STARTED")
     
     # Add feature-specific tasks to phase 3
     if features:
-        for i, feature in enumerate(features[:5], 1):
+        for i, feature in enumerate(features[:terminal_count], 1):
             base_phases["phase_3"]["terminals"][str(i)] = {
                 "task": f"Implement {feature} feature",
                 "status": "WAITING",
@@ -172,56 +184,57 @@ def generate_phases(project_type, features):
             }
     
     # Phase 4 is always polish and deployment
-    base_phases["phase_4"]["terminals"] = {
-        "1": {"task": "Performance optimization", "status": "WAITING", "progress": 0},
-        "2": {"task": "Security hardening", "status": "WAITING", "progress": 0},
-        "3": {"task": "UI/UX polish", "status": "WAITING", "progress": 0},
-        "4": {"task": "Deployment configuration", "status": "WAITING", "progress": 0},
-        "5": {"task": "Documentation & testing", "status": "WAITING", "progress": 0}
-    }
+    base_phases["phase_4"]["terminals"] = phase_terminals([
+        "Performance optimization",
+        "Security hardening",
+        "UI/UX polish",
+        "Deployment configuration",
+        "Documentation & testing"
+    ], terminal_count, "WAITING")
     
     return base_phases
 
-def generate_todos(project_type, features, phases):
+def generate_todos(project_type, features, phases, terminal_count=swarm_config.DEFAULT_TERMINALS):
     """Generate detailed todo lists for each terminal"""
     
     todos = {}
     
     # Terminal roles based on project type
     if project_type == 'webapp':
-        roles = {
-            1: "Backend Architecture",
-            2: "API Development",
-            3: "Frontend Development",
-            4: "Database & Data",
-            5: "DevOps & Testing"
-        }
+        roles = [
+            "Backend Architecture",
+            "API Development",
+            "Frontend Development",
+            "Database & Data",
+            "DevOps & Testing"
+        ]
     elif project_type == 'api':
-        roles = {
-            1: "Core API Logic",
-            2: "Database Layer",
-            3: "Authentication & Security",
-            4: "Integration & Middleware",
-            5: "Testing & Documentation"
-        }
+        roles = [
+            "Core API Logic",
+            "Database Layer",
+            "Authentication & Security",
+            "Integration & Middleware",
+            "Testing & Documentation"
+        ]
     elif project_type == 'ml':
-        roles = {
-            1: "Data Engineering",
-            2: "Model Development",
-            3: "Training Pipeline",
-            4: "Evaluation & Metrics",
-            5: "Deployment & Serving"
-        }
+        roles = [
+            "Data Engineering",
+            "Model Development",
+            "Training Pipeline",
+            "Evaluation & Metrics",
+            "Deployment & Serving"
+        ]
     else:
-        roles = {
-            1: "Core Architecture",
-            2: "Data Management",
-            3: "Business Logic",
-            4: "Interface Layer",
-            5: "Infrastructure"
-        }
+        roles = [
+            "Core Architecture",
+            "Data Management",
+            "Business Logic",
+            "Interface Layer",
+            "Infrastructure"
+        ]
+    roles = swarm_config.spread(roles, terminal_count)
     
-    for term_num in range(1, 6):
+    for term_num in roles:
         todo_content = f"""# Terminal {term_num} - {roles[term_num]}
 
 ## Role
@@ -269,9 +282,17 @@ def generate_todos(project_type, features, phases):
     
     return todos
 
-def generate_master_checklist(project_name, project_prompt, phases):
+def generate_master_checklist(project_name, project_prompt, phases, terminal_count=swarm_config.DEFAULT_TERMINALS):
     """Generate master checklist for the project"""
     
+    phase_overview = "\n".join(
+        f"### Phase {num}: {phases[f'phase_{num}']['name']}\n" + "".join(
+            f"- Terminal {tid}: {phases[f'phase_{num}']['terminals'].get(str(tid), {}).get('task', 'TBD')}\n"
+            for tid in range(1, terminal_count + 1)
+        )
+        for num in range(1, 5)
+    )
+    
     return f"""# {project_name} - Master Implementation Checklist
 
 ## Project Description
@@ -283,34 +304,7 @@ def generate_master_checklist(project_name, project_prompt, phases):
 
 ## Phase Overview
 
-### Phase 1: {phases['phase_1']['name']}
-- Terminal 1: {phases['phase_1']['terminals']['1']['task']}
-- Terminal 2: {phases['phase_1']['terminals']['2']['task']}
-- Terminal 3: {phases['phase_1']['terminals']['3']['task']}
-- Terminal 4: {phases['phase_1']['terminals']['4']['task']}
-- Terminal 5: {phases['phase_1']['terminals']['5']['task']}
-
-### Phase 2: {phases['phase_2']['name']}
-- Terminal 1: {phases['phase_2']['terminals'].get('1', {}).get('task', 'TBD')}
-- Terminal 2: {phases['phase_2']['terminals'].get('2', {}).get('task', 'TBD')}
-- Terminal 3: {phases['phase_2']['terminals'].get('3', {}).get('task', 'TBD')}
-- Terminal 4: {phases['phase_2']['terminals'].get('4', {}).get('task', 'TBD')}
-- Terminal 5: {phases['phase_2']['terminals'].get('5', {}).get('task', 'TBD')}
-
-### Phase 3: {phases['phase_3']['name']}
-- Terminal 1: {phases['phase_3']['terminals'].get('1', {}).get('task', 'TBD')}
-- Terminal 2: {phases['phase_3']['terminals'].get('2', {}).get('task', 'TBD')}
-- Terminal 3: {phases['phase_3']['terminals'].get('3', {}).get('task', 'TBD')}
-- Terminal 4: {phases['phase_3']['terminals'].get('4', {}).get('task', 'TBD')}
-- Terminal 5: {phases['phase_3']['terminals'].get('5', {}).get('task', 'TBD')}
-
-### Phase 4: {phases['phase_4']['name']}
-- Terminal 1: {phases['phase_4']['terminals']['1']['task']}
-- Terminal 2: {phases['phase_4']['terminals']['2']['task']}
-- Terminal 3: {phases['phase_4']['terminals']['3']['task']}
-- Terminal 4: {phases['phase_4']['terminals']['4']['task']}
-- Terminal 5: {phases['phase_4']['terminals']['5']['task']}
-
+{phase_overview}
 ## Coordination Protocol
 1. Each terminal works on assigned tasks only
 2. Update phase-status.json with progress
@@ -13,6 +13,8 @@ from typing import Dict
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 from prompt_enhancer import PromptEnhancer
+import state_files
+import swarm_config
 
 class ChangeManager:
     """Manages change requests and generates new phases"""
@@ -61,13 +63,7 @@ class ChangeManager:
         }
         
         # Load config
-        config_file = self.project_path / "swarm.config"
-        if config_file.exists():
-            with open(config_file, 'r') as f:
-                for line in f:
-                    if '=' in line:
-                        key, value = line.strip().split('=', 1)
-                        state['config'][key] = value.strip('"')
+        state['config'] = swarm_config.parse_config(self.project_path / "swarm.config")
         
         # Load phase status
         phase_file = self.project_path / "coordination" / "phase-status.json"
@@ -96,6 +92,7 @@ class ChangeManager:
         
         # Determine change complexity
         complexity = self._assess_change_complexity(change, enhanced)
+        count = swarm_config.terminal_count(state['config'])
         
         phases = {}
         
@@ -103,81 +100,97 @@ class ChangeManager:
             # Single phase for minor changes
             phases['change_phase_1'] = {
                 'name': 'Change Implementation',
-                'terminals': {
-                    '1': {'task': 'Update backend for change', 'priority': 'high'},
-                    '2': {'task': 'Update data layer if needed', 'priority': 'medium'},
-                    '3': {'task': 'Update UI for change', 'priority': 'high'},
-                    '4': {'task': 'Update features affected', 'priority': 'medium'},
-                    '5': {'task': 'Test changes thoroughly', 'priority': 'high'}
-                }
+                'terminals': self._phase_terminals([
+                    ('Update backend for change', 'high'),
+                    ('Update data layer if needed', 'medium'),
+                    ('Update UI for change', 'high'),
+                    ('Update features affected', 'medium'),
+                    ('Test changes thoroughly', 'high')
+                ], count)
             }
         
         elif complexity == 'moderate':
             # Two phases for moderate changes
             phases['change_phase_1'] = {
                 'name': 'Change Preparation',
-                'terminals': {
-                    '1': {'task': 'Refactor architecture for change', 'priority': 'high'},
-                    '2': {'task': 'Update data models', 'priority': 'high'},
-                    '3': {'task': 'Prepare UI components', 'priority': 'medium'},
-                    '4': {'task': 'Identify affected features', 'priority': 'medium'},
-                    '5': {'task': 'Create change test plan', 'priority': 'high'}
-                }
+                'terminals': self._phase_terminals([
+                    ('Refactor architecture for change', 'high'),
+                    ('Update data models', 'high'),
+                    ('Prepare UI components', 'medium'),
+                    ('Identify affected features', 'medium'),
+                    ('Create change test plan', 'high')
+                ], count)
             }
             phases['change_phase_2'] = {
                 'name': 'Change Implementation',
-                'terminals': {
-                    '1': {'task': 'Implement backend changes', 'priority': 'high'},
-                    '2': {'task': 'Migrate data if needed', 'priority': 'high'},
-                    '3': {'task': 'Implement UI changes', 'priority': 'high'},
-                    '4': {'task': 'Update all affected features', 'priority': 'high'},
-                    '5': {'task': 'Execute test plan', 'priority': 'high'}
-                }
+                'terminals': self._phase_terminals([
+                    ('Implement backend changes', 'high'),
+                    ('Migrate data if needed', 'high'),
+                    ('Implement UI changes', 'high'),
+                    ('Update all affected features', 'high'),
+                    ('Execute test plan', 'high')
+                ], count)
             }
         
         else:  # major
             # Three phases for major changes
             phases['change_phase_1'] = {
                 'name': 'Change Analysis & Design',
-                'terminals': {
-                    '1': {'task': 'Design new architecture', 'priority': 'high'},
-                    '2': {'task': 'Plan data migration', 'priority': 'high'},
-                    '3': {'task': 'Design new UI/UX', 'priority': 'high'},
-                    '4': {'task': 'Plan feature updates', 'priority': 'medium'},
-                    '5': {'task': 'Create comprehensive test strategy', 'priority': 'high'}
-                }
+                'terminals': self._phase_terminals([
+                    ('Design new architecture', 'high'),
+                    ('Plan data migration', 'high'),
+                    ('Design new UI/UX', 'high'),
+                    ('Plan feature updates', 'medium'),
+                    ('Create comprehensive test strategy', 'high')
+                ], count)
             }
             phases['change_phase_2'] = {
                 'name': 'Change Development',
-                'terminals': {
-                    '1': {'task': 'Build new backend components', 'priority': 'high'},
-                    '2': {'task': 'Implement data changes', 'priority': 'high'},
-                    '3': {'task': 'Build new UI components', 'priority': 'high'},
-                    '4': {'task': 'Develop new features', 'priority': 'high'},
-                    '5': {'task': 'Write comprehensive tests', 'priority': 'high'}
-                }
+                'terminals': self._phase_terminals([
+                    ('Build new backend components', 'high'),
+                    ('Implement data changes', 'high'),
+                    ('Build new UI components', 'high'),
+                    ('Develop new features', 'high'),
+                    ('Write comprehensive tests', 'high')
+                ], count)
             }
             phases['change_phase_3'] = {
                 'name': 'Change Integration',
-                'terminals': {
-                    '1': {'task': 'Integrate and optimize backend', 'priority': 'high'},
-                    '2': {'task': 'Complete data migration', 'priority': 'high'},
-                    '3': {'task': 'Polish UI and UX', 'priority': 'high'},
-                    '4': {'task': 'Final feature integration', 'priority': 'high'},
-                    '5': {'task': 'Full system testing', 'priority': 'high'}
-                }
+                'terminals': self._phase_terminals([
+                    ('Integrate and optimize backend', 'high'),
+                    ('Complete data migration', 'high'),
+                    ('Polish UI and UX', 'high'),
+                    ('Final feature integration', 'high'),
+                    ('Full system testing', 'high')
+                ], count)
             }
         
-        # Add specific tasks based on detected features
+        # Add specific tasks based on detected features, to the backend
+        # and feature roles
+        auth_terminal = str(swarm_config.role_terminal(0, count))
+        payment_terminal = str(swarm_config.role_terminal(3, count))
         for phase_key in phases:
             for feature in enhanced['detected_features']:
-                if feature == 'auth' and '1' in phases[phase_key]['terminals']:
-                    phases[phase_key]['terminals']['1']['subtasks'] = ['Update authentication flow']
-                elif feature == 'payment' and '4' in phases[phase_key]['terminals']:
-                    phases[phase_key]['terminals']['4']['subtasks'] = ['Update payment processing']
+                if feature == 'auth' and auth_terminal in phases[phase_key]['terminals']:
+                    phases[phase_key]['terminals'][auth_terminal].setdefault('subtasks', []).append('Update authentication flow')
+                elif feature == 'payment' and payment_terminal in phases[phase_key]['terminals']:
+                    phases[phase_key]['terminals'][payment_terminal].setdefault('subtasks', []).append('Update payment processing')
         
         return phases
     
+    def _phase_terminals(self, tasks, count: int) -> Dict:
+        """Terminals of a change phase from per-role (task, priority) pairs"""
+        
+        texts = swarm_config.spread([task for task, _ in tasks], count)
+        terminals = {}
+        for terminal, shares in swarm_config.role_shares(len(tasks), count).items():
+            priorities = [tasks[role][1] for role, _, _ in shares]
+            terminals[str(terminal)] = {
+                'task': texts[terminal],
+                'priority': 'high' if 'high' in priorities else priorities[0]
+            }
+        return terminals
+    
     def _assess_change_complexity(self, change: str, enhanced: Dict) -> str:
         """Assess the complexity of a change request"""
         
@@ -208,7 +221,7 @@ class ChangeManager:
         
         todos = {}
         
-        for terminal_num in range(1, 6):
+        for terminal_num in swarm_config.terminals(self.project_path):
             todo_content = f"""# Terminal {terminal_num} - Change Request Tasks
 
 ## Change Implementation
@@ -260,14 +273,12 @@ Tasks:
             'status': 'pending'
         }
         
-        with open(change_file, 'w') as f:
-            json.dump(change_data, f, indent=2)
+        state_files.write_json(change_file, change_data)
         
         # Save todo files
         for terminal, content in todos.items():
             todo_file = changes_dir / f"change_{timestamp}_terminal_{terminal}.md"
-            with open(todo_file, 'w') as f:
-                f.write(content)
+            state_files.write_text(todo_file, content)
     
     def _create_implementation_plan(self, phases: Dict) -> str:
         """Create an implementation plan for the change"""
@@ -334,7 +345,7 @@ def import_existing_project(source_path: str, swarm_path: str, project_name: str
         f.write(f'PROJECT_NAME="{project_name}"\n')
         f.write(f'PROJECT_PROMPT="{description}"\n')
         f.write(f'CREATED_AT="{datetime.now()}"\n')
-        f.write('TERMINALS=5\n')
+        f.write(f'TERMINALS={swarm_config.DEFAULT_TERMINALS}\n')
         f.write('PHASES=4\n')
         f.write('STATUS="IMPORTED"\n')
         f.write(f'SOURCE_PATH="{source_path}"\n')
@@ -430,9 +441,9 @@ def analyze_existing_codebase(workspace_path: Path) -> Dict:
 def generate_todos_for_existing(project_path: Path, analysis: Dict):
     """Generate todo lists for an existing project"""
     
-    # Terminal 1: Architecture & Refactoring
-    todo1 = """# Terminal 1 - Architecture & Refactoring
-
+    # One checklist per role
+    roles = [
+        ("Architecture & Refactoring", """
 ## Phase 1: Analysis
 - [ ] Analyze current architecture
 - [ ] Identify improvement areas
@@ -444,11 +455,8 @@ def generate_todos_for_existing(project_path: Path, analysis: Dict):
 - [ ] Improve code organization
 - [ ] Implement design patterns
 - [ ] Update dependencies
-"""
-    
-    # Terminal 2: Testing
-    todo2 = """# Terminal 2 - Testing & Quality
-
+"""),
+        ("Testing & Quality", """
 ## Phase 1: Test Setup
 - [ ] Set up test framework
 - [ ] Create test structure
@@ -460,11 +468,8 @@ def generate_todos_for_existing(project_path: Path, analysis: Dict):
 - [ ] Add end-to-end tests
 - [ ] Implement test automation
 - [ ] Achieve 80% coverage
-"""
-    
-    # Terminal 3: Features & UI
-    todo3 = """# Terminal 3 - Features & UI Enhancement
-
+"""),
+        ("Features & UI Enhancement", """
 ## Phase 1: UI Analysis
 - [ ] Review current UI/UX
 - [ ] Identify improvement areas
@@ -476,11 +481,8 @@ def generate_todos_for_existing(project_path: Path, analysis: Dict):
 - [ ] Improve user experience
 - [ ] Add responsive design
 - [ ] Implement accessibility
-"""
-    
-    # Terminal 4: DevOps & Deployment
-    todo4 = """# Terminal 4 - DevOps & Deployment
-
+"""),
+        ("DevOps & Deployment", """
 ## Phase 1: Infrastructure
 - [ ] Set up Docker configuration
 - [ ] Create CI/CD pipeline
@@ -492,11 +494,8 @@ def generate_todos_for_existing(project_path: Path, analysis: Dict):
 - [ ] Set up staging environment
 - [ ] Configure production
 - [ ] Implement rollback strategy
-"""
-    
-    # Terminal 5: Documentation & Optimization
-    todo5 = """# Terminal 5 - Documentation & Optimization
-
+"""),
+        ("Documentation & Optimization", """
 ## Phase 1: Documentation
 - [ ] Write README
 - [ ] Create API documentation
@@ -508,18 +507,25 @@ def generate_todos_for_existing(project_path: Path, analysis: Dict):
 - [ ] Optimize database queries
 - [ ] Improve load times
 - [ ] Security hardening
-"""
+""")
+    ]
+    
+    count = len(swarm_config.terminals(project_path))
+    titles = swarm_config.spread([title for title, _ in roles], count)
+    todos = {
+        terminal: f"# Terminal {terminal} - {titles[terminal]}\n" + "".join(
+            roles[role][1] for role, _, _ in shares)
+        for terminal, shares in swarm_config.role_shares(len(roles), count).items()
+    }
     
     # Add suggestions from analysis
-    for i, suggestion in enumerate(analysis['suggestions'][:5], 1):
-        todo_var = locals()[f'todo{i}']
-        todo_var += f"\n## Additional Task\n- [ ] {suggestion}\n"
+    for i, suggestion in enumerate(analysis['suggestions'][:count]):
+        todos[i + 1] += f"\n## Additional Task\n- [ ] {suggestion}\n"
     
     # Save todos
-    for i, content in enumerate([todo1, todo2, todo3, todo4, todo5], 1):
-        todo_file = project_path / "todo" / f"terminal-{i}.md"
-        with open(todo_file, 'w') as f:
-            f.write(content)
+    for terminal, content in todos.items():
+        todo_file = project_path / "todo" / f"terminal-{terminal}.md"
+        state_files.write_text(todo_file, content)
     
     # Create master checklist
     master = f"""# Master Checklist - Existing Project Enhancement
@@ -543,8 +549,7 @@ def generate_todos_for_existing(project_path: Path, analysis: Dict):
 """
     
     master_file = project_path / "todo" / "MASTER-CHECKLIST.md"
-    with open(master_file, 'w') as f:
-        f.write(master)
+    state_files.write_text(master_file, master)
 
 def main():
     """CLI interface"""
@@ -5,6 +5,7 @@
 PROJECT_PATH="$1"
 PROJECT_NAME="$2"
 CLAUDE_CMD="$HOME/.claude/local/claude"
+BIN_DIR="$(cd "$(dirname "$0")" && pwd)"
 
 if [ -z "$PROJECT_PATH" ] || [ -z "$PROJECT_NAME" ]; then
     echo "Error: Missing parameters"
@@ -105,8 +106,9 @@ echo "$osascript_cmd" | osascript
 
 sleep 2
 
-# Launch 5 terminals with code awareness
-for i in {1..5}; do
+# Launch the terminals in swarm.config with code awareness
+TERMINALS=$(grep '^TERMINALS=' "$PROJECT_PATH/swarm.config" 2>/dev/null | cut -d= -f2)
+for i in $(seq 1 "${TERMINALS:-5}"); do
     cat > "$PROJECT_PATH/launch-term-$i.sh" << LAUNCH_SCRIPT
 #!/bin/bash
 TERM_NUM=$i
@@ -143,14 +145,15 @@ echo ""
 
 # Update status
 python3 -c "
-import json
-with open('\$PROJECT_PATH/coordination/phase-status.json', 'r+') as f:
-    data = json.load(f)
+import sys
+sys.path.insert(0, '$BIN_DIR')
+import state_files
+
+def mark_working(data):
     phase = data['current_phase']
     data[f'phase_{phase}']['terminals'][str(\$TERM_NUM)]['status'] = 'WORKING'
-    f.seek(0)
-    json.dump(data, f, indent=2)
-    f.truncate()
+
+state_files.update_json('\$PROJECT_PATH/coordination/phase-status.json', mark_working)
 " 2>/dev/null
 
 # Create enhanced prompt with code awareness
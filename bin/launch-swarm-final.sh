@@ -103,9 +103,13 @@ with open('$PROJECT_PATH/coordination/phase-status.json', 'r') as f:
 
 advance_phase() {
     python3 -c "
-import json
-with open('$PROJECT_PATH/coordination/phase-status.json', 'r+') as f:
-    data = json.load(f)
+import subprocess
+import sys
+sys.path.insert(0, '$SWARM_HOME/bin')
+import state_files
+
+# Decided under the lock, so concurrent terminal updates are not lost
+def advance(data):
     phase = data['current_phase']
     
     # Check completion
@@ -124,24 +128,27 @@ with open('$PROJECT_PATH/coordination/phase-status.json', 'r+') as f:
             data[f'phase_{next_phase}']['terminals'][tid]['status'] = 'NOT_STARTED'
             data[f'phase_{next_phase}']['terminals'][tid]['progress'] = 0
         
-        f.seek(0)
-        json.dump(data, f, indent=2)
-        f.truncate()
-        
-        print(f'✓ Advanced to Phase {next_phase}')
-        print(f'\\nPHASE {next_phase} PROMPTS READY!')
-        print(f'Copy prompts from: prompts/phase-{next_phase}-all-terminals.md')
-        print('Paste the appropriate prompt to each terminal.')
-        
-        # Generate new prompts if needed
-        import subprocess
-        subprocess.run(['python3', '$SWARM_HOME/bin/phase-prompter.py', '$PROJECT_PATH', str(next_phase)])
-        
-    elif phase >= 4:
-        print('All phases complete!')
+        advanced[:] = [next_phase]
     else:
-        print('Current phase not complete')
-    " 2>/dev/null
+        advanced.clear()
+        message[:] = ['All phases complete!' if phase >= 4 else 'Current phase not complete']
+
+advanced = []
+message = []
+state_files.update_json('$PROJECT_PATH/coordination/phase-status.json', advance)
+
+if not advanced:
+    print(message[0])
+else:
+    next_phase = advanced[0]
+    print(f'✓ Advanced to Phase {next_phase}')
+    print(f'\\nPHASE {next_phase} PROMPTS READY!')
+    print(f'Copy prompts from: prompts/phase-{next_phase}-all-terminals.md')
+    print('Paste the appropriate prompt to each terminal.')
+    
+    # Generate new prompts if needed
+    subprocess.run(['python3', '$SWARM_HOME/bin/phase-prompter.py', '$PROJECT_PATH', str(next_phase)])
+    "
 }
 
 show_prompts() {
@@ -225,8 +232,9 @@ EOF
 
 sleep 2
 
-# Launch 5 terminals with phase awareness
-for i in {1..5}; do
+# Launch the terminals in swarm.config with phase awareness
+TERMINALS=$(grep '^TERMINALS=' "$PROJECT_PATH/swarm.config" 2>/dev/null | cut -d= -f2)
+for i in $(seq 1 "${TERMINALS:-5}"); do
     cat > "$PROJECT_PATH/launch-term-$i.sh" << LAUNCH_SCRIPT
 #!/bin/bash
 TERM_NUM=$i
@@ -276,14 +284,15 @@ echo ""
 
 # Update status
 python3 -c "
-import json
-with open('\$PROJECT_PATH/coordination/phase-status.json', 'r+') as f:
-    data = json.load(f)
+import sys
+sys.path.insert(0, '\$SWARM_HOME/bin')
+import state_files
+
+def mark_working(data):
     phase = data['current_phase']
     data[f'phase_{phase}']['terminals'][str(\$TERM_NUM)]['status'] = 'WORKING'
-    f.seek(0)
-    json.dump(data, f, indent=2)
-    f.truncate()
+
+state_files.update_json('\$PROJECT_PATH/coordination/phase-status.json', mark_working)
 " 2>/dev/null
 
 # Get phase prompt
@@ -3,6 +3,7 @@
 # Universal Phase Controller for any project
 
 PROJECT_PATH="${1:-$(pwd)}"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
 echo "========================================"
 echo "    Swarm Phase Controller"
@@ -27,9 +28,12 @@ with open('$PROJECT_PATH/coordination/phase-status.json', 'r') as f:
 
 advance_phase() {
     python3 -c "
-import json
-with open('$PROJECT_PATH/coordination/phase-status.json', 'r+') as f:
-    data = json.load(f)
+import sys
+sys.path.insert(0, '$SCRIPT_DIR')
+import state_files
+
+# Decided under the lock, so concurrent terminal updates are not lost
+def advance(data):
     phase = data['current_phase']
     
     # Check completion
@@ -47,15 +51,16 @@ with open('$PROJECT_PATH/coordination/phase-status.json', 'r+') as f:
             data[f'phase_{phase + 1}']['terminals'][tid]['status'] = 'NOT_STARTED'
             data[f'phase_{phase + 1}']['terminals'][tid]['progress'] = 0
         
-        f.seek(0)
-        json.dump(data, f, indent=2)
-        f.truncate()
-        print(f'✓ Advanced to Phase {phase + 1}')
+        message[:] = [f'✓ Advanced to Phase {phase + 1}']
     elif phase >= 4:
-        print('All phases complete!')
+        message[:] = ['All phases complete!']
     else:
-        print('Current phase not complete')
-    " 2>/dev/null
+        message[:] = ['Current phase not complete']
+
+message = []
+state_files.update_json('$PROJECT_PATH/coordination/phase-status.json', advance)
+print(message[0])
+    "
 }
 
 while true; do
@@ -9,6 +9,9 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent))
+import swarm_config
+
 def generate_phase_prompt(project_path, terminal_num, next_phase):
     """Generate a detailed prompt for the next phase"""
     
@@ -290,10 +293,10 @@ Remember: Quality over speed. Write production-ready code with tests.
     return prompt
 
 def generate_all_phase_prompts(project_path, phase_num):
-    """Generate prompts for all 5 terminals for a specific phase"""
+    """Generate prompts for all terminals for a specific phase"""
     
     prompts = {}
-    for terminal in range(1, 6):
+    for terminal in swarm_config.terminals(project_path):
         prompt = generate_phase_prompt(project_path, terminal, phase_num)
         
         # Save to file
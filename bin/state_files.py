@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+
+"""
+State Files - Safe shared access to todo and coordination files
+
+Agent terminals, the task tracker, the phase controller and the change
+manager all read-modify-write the same `todo/terminal-N.md` and
+`coordination/*.json` files. Writers here take an advisory lock per file,
+replace files by writing a temporary file and renaming it over the
+original, and check that the file did not change under them since it was
+read, so updates are not lost and readers never see a half-written file.
+New sections at the end of a todo file are appended in place instead.
+"""
+
+import copy
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+# Attempts at a read-modify-write before giving up on a file that keeps
+# changing under us, e.g. because an agent is editing it without the lock
+UPDATE_ATTEMPTS = 10
+
+# Files modified this recently may still change without moving mtime on
+# coarse-grained filesystems (1 s on HFS+), so an unchanged mtime and size
+# do not yet show that their content is unchanged
+RACY_WINDOW_NS = 2_000_000_000
+
+class VersionConflict(Exception):
+    """The file kept changing under a read-modify-write"""
+
+def stat_trusted(mtime_ns: int, checked_at_ns: int) -> bool:
+    """Whether a file seen at checked_at_ns is unchanged if its mtime is"""
+    
+    return checked_at_ns - mtime_ns > RACY_WINDOW_NS
+
+def lock_path(path) -> Path:
+    # The lock lives beside the file, as the file itself is replaced on write
+    path = Path(path)
+    return path.parent / f".{path.name}.lock"
+
+@contextmanager
+def locked(path, shared: bool = False):
+    """Hold the advisory lock of a state file
+    
+    Shared locks are for reads that must not interleave with a
+    read-modify-write; plain reads never need a lock.
+    """
+    
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock_path(path), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+def version_of(content: Optional[str]) -> Optional[str]:
+    """Version token of a file's content; None for a missing file"""
+    
+    if content is None:
+        return None
+    return hashlib.md5(content.encode()).hexdigest()
+
+def read_versioned(path) -> Tuple[Optional[str], Optional[str]]:
+    """Content of a file and its version, or (None, None) if it is missing"""
+    
+    try:
+        with open(path, 'r') as f:
+            content = f.read()
+    except FileNotFoundError:
+        return None, None
+    return content, version_of(content)
+
+def write_atomic(path, content: str):
+    """Replace a file's content so readers see either all or none of it
+    
+    Does not lock; use update() or write_text() for shared files.
+    """
+    
+    path = Path(path)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(temp_path, os.stat(path).st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+def update(path, transform: Callable[[Optional[str]], Optional[str]]) -> Optional[str]:
+    """Read-modify-write a text file under its lock
+    
+    transform gets the current content, or None if the file is missing,
+    and returns the new content, or None to leave the file as it is.
+    Writers that skip the lock are caught by the version check and the
+    update is retried on what they wrote. Returns the content written.
+    """
+    
+    for attempt in range(UPDATE_ATTEMPTS):
+        with locked(path):
+            content, version = read_versioned(path)
+            new_content = transform(content)
+            if new_content is None or new_content == content:
+                return None
+            
+            # Nothing that honours the lock can write now; anything else
+            # shows up as a changed version
+            if read_versioned(path)[1] == version:
+                write_atomic(path, new_content)
+                return new_content
+        time.sleep(0.01 * (attempt + 1))
+    
+    raise VersionConflict(f"{path} kept changing during update")
+
+def update_json(path, transform: Callable[[dict], Optional[dict]], default=None) -> Optional[dict]:
+    """update() for a JSON file; transform may also change the data in place
+    
+    A missing file starts out as a copy of default, or {}. Returns the
+    data written, or None if nothing changed.
+    """
+    
+    written = []
+    
+    def transform_text(content):
+        written.clear()
+        data = json.loads(content) if content is not None else copy.deepcopy(default or {})
+        before = json.dumps(data, sort_keys=True)
+        new_data = transform(data)
+        if new_data is None:
+            new_data = data
+        if content is not None and json.dumps(new_data, sort_keys=True) == before:
+            return None
+        written.append(new_data)
+        return json.dumps(new_data, indent=2)
+    
+    update(path, transform_text)
+    return written[-1] if written else None
+
+def append(path, content: str, header: str = ''):
+    """Append to a text file under its lock, without rewriting it
+    
+    A missing or empty file starts with header. Only the appended bytes
+    are written, so the cost does not grow with the file, and readers
+    never see the existing content truncated.
+    """
+    
+    path = Path(path)
+    with locked(path):
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            data = content.encode()
+            if header and os.fstat(fd).st_size == 0:
+                data = header.encode() + data
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+def write_text(path, content: str):
+    """Replace a text file atomically under its lock"""
+    
+    with locked(path):
+        write_atomic(path, content)
+
+def write_json(path, data):
+    """Replace a JSON file atomically under its lock"""
+    
+    write_text(path, json.dumps(data, indent=2))
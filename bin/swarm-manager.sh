@@ -92,12 +92,18 @@ init_project() {
     PROJECT_PATH="$SWARM_HOME/projects/$project_name"
     mkdir -p "$PROJECT_PATH"/{todo,coordination,logs,prompts,phases,workspace}
     
+    local terminals=${SWARM_TERMINALS:-5}
+    if ! [[ "$terminals" =~ ^[0-9]+$ ]] || [ "$terminals" -lt 1 ]; then
+        echo "Warning: SWARM_TERMINALS=$SWARM_TERMINALS is not a positive integer, using 5" >&2
+        terminals=5
+    fi
+    
     # Generate project configuration
     cat > "$PROJECT_PATH/swarm.config" << EOF
 PROJECT_NAME="$project_name"
 PROJECT_PROMPT="$project_prompt"
 CREATED_AT="$(date)"
-TERMINALS=5
+TERMINALS=$terminals
 PHASES=4
 STATUS="INITIALIZED"
 EOF
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+"""
+Swarm Config - Project settings from swarm.config
+
+A project's swarm.config holds KEY=value lines, among them TERMINALS, the
+number of agent terminals working on it. The generators describe work per
+role; spread() shares those roles out over however many terminals the
+project has.
+"""
+
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+def env_terminals(default: int = 5) -> int:
+    """Terminal count from SWARM_TERMINALS; default if unset or invalid"""
+    
+    value = os.environ.get('SWARM_TERMINALS', '').strip()
+    if not value:
+        return default
+    try:
+        count = int(value)
+    except ValueError:
+        count = 0
+    if count < 1:
+        print(f"Warning: SWARM_TERMINALS={value!r} is not a positive integer, using {default}",
+              file=sys.stderr)
+        return default
+    return count
+
+# Terminals of a new project, and of one whose config does not say
+DEFAULT_TERMINALS = env_terminals()
+
+def parse_config(config_file) -> Dict[str, str]:
+    """KEY=value lines of a swarm.config file; {} if it is missing"""
+    
+    config = {}
+    try:
+        with open(config_file, 'r') as f:
+            for line in f:
+                if '=' in line:
+                    key, value = line.strip().split('=', 1)
+                    config[key] = value.strip('"')
+    except FileNotFoundError:
+        pass
+    return config
+
+def terminal_count(config: Dict[str, str]) -> int:
+    """Number of terminals a parsed config asks for"""
+    
+    try:
+        return max(1, int(config.get('TERMINALS', DEFAULT_TERMINALS)))
+    except ValueError:
+        return DEFAULT_TERMINALS
+
+def terminals(project_path) -> range:
+    """Terminal numbers of a project, from 1"""
+    
+    count = terminal_count(parse_config(Path(project_path) / 'swarm.config'))
+    return range(1, count + 1)
+
+def role_shares(roles: int, count: int) -> Dict[int, List[Tuple[int, int, int]]]:
+    """Which roles each of count terminals takes, as (role, part, parts)
+    
+    Terminal t takes role (t - 1) mod roles. With fewer terminals than
+    roles a terminal takes several; with more, the terminals sharing a
+    role each take one of its parts.
+    """
+    
+    shares = {terminal: [] for terminal in range(1, count + 1)}
+    for terminal in range(1, max(roles, count) + 1):
+        role = (terminal - 1) % roles
+        parts = len(range(role, count, roles)) if count > roles else 1
+        shares[(terminal - 1) % count + 1].append((role, (terminal - 1) // roles + 1, parts))
+    return shares
+
+def role_terminal(role: int, count: int) -> int:
+    """First terminal that takes a role"""
+    
+    return role % count + 1
+
+def part_label(text: str, part: int, parts: int) -> str:
+    return text if parts == 1 else f"{text} (part {part} of {parts})"
+
+def spread(items: Sequence[str], count: int) -> Dict[int, str]:
+    """Per-role texts shared out over count terminals, see role_shares()
+    
+    A terminal with several roles gets their texts joined by '; '.
+    """
+    
+    return {
+        terminal: '; '.join(part_label(items[role], part, parts) for role, part, parts in shares)
+        for terminal, shares in role_shares(len(items), count).items()
+    }
@@ -7,19 +7,155 @@ Task Tracker - Manages todo completion and prevents duplication
 import re
 import json
 import hashlib
+import io
+import os
+import sys
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Tuple
-import difflib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+import state_files
+import swarm_config
+import task_scheduler
+import todo_parser
+from task_similarity import SimilarityIndex
+from task_store import TaskStore
+
+# Parts of task text ignored by generate_task_id
+DIGITS_PATTERN = re.compile(r'\d+')
+
+# Tasks in a change request: list items whole, and elsewhere a verb and
+# the rest of its clause
+REQUEST_TASK_PATTERN = re.compile(
+    r'^[ \t]*(?:[-*•]|\d+\.)[ \t]+(?P<item>[^\n]*\S)'
+    r'|\b(?:add|implement|create|build|fix|update|improve)(?:e?s)?[ \t]+(?P<task>[^.,;\n]+)',
+    re.IGNORECASE | re.MULTILINE)
+
+# Bump when the form of parse_markdown_tasks results changes
+SCAN_CACHE_VERSION = 1
+CACHED_TASK_FIELDS = ('id', 'text', 'status', 'section', 'line_number', 'indent')
+
+# 'sqlite' keeps an indexed copy of the tasks in coordination/tasks.db
+TASK_STORE = os.environ.get('SWARM_TASK_STORE', 'json')
+
+def normalize_task_text(task_text: str) -> str:
+    """Task text compared case- and whitespace-insensitively"""
+    return ' '.join(task_text.split()).lower()
+
+def parse_update_batch(text: str) -> List[Dict]:
+    """Updates from a JSON array or from NDJSON, one object per line
+    
+    Each update has terminal, task and completed. Items that are not valid
+    come back with an error instead.
+    """
+    if text.lstrip().startswith('['):
+        items = json.loads(text)
+    else:
+        items = []
+        for line_number, line in enumerate(text.splitlines(), 1):
+            if line.strip():
+                try:
+                    items.append(json.loads(line))
+                except ValueError as e:
+                    items.append({'error': f"line {line_number}: {e}"})
+    
+    updates = []
+    for item in items:
+        if not isinstance(item, dict):
+            updates.append({'error': 'expected an object'})
+            continue
+        if 'error' in item:
+            updates.append(item)
+            continue
+        
+        completed = item.get('completed')
+        if isinstance(completed, str):
+            completed = completed.lower() == 'true'
+        
+        try:
+            terminal = int(item['terminal'])
+        except (KeyError, TypeError, ValueError):
+            updates.append({**item, 'error': 'terminal must be a number'})
+            continue
+        if not isinstance(item.get('task'), str) or not isinstance(completed, bool):
+            updates.append({**item, 'error': 'task and completed are required'})
+            continue
+        
+        updates.append({'terminal': terminal, 'task': item['task'], 'completed': completed})
+    return updates
+
+class TodoLineIndex:
+    """Tasks of one todo file by id, by text and by similarity
+    
+    Ids are both the tracker's, from task_id(text), and the parser's that
+    the Kanban API reports.
+    """
+    
+    def __init__(self, lines: List[str], task_id):
+        self.tasks = list(todo_parser.iter_tasks(lines))
+        self.by_id = {task.id: task for task in self.tasks}
+        self.by_text = {}
+        for task in self.tasks:
+            self.by_id.setdefault(task_id(task.text), task)
+            self.by_text.setdefault(normalize_task_text(task.text), task)
+        self.similar = None
+    
+    def find(self, task_text: str) -> Optional[todo_parser.TodoTask]:
+        """The task with this id or text, or else one 80% similar to it"""
+        task = self.by_id.get(task_text) or self.by_text.get(normalize_task_text(task_text))
+        if task:
+            return task
+        
+        # Built on the first fuzzy lookup only
+        if self.similar is None:
+            self.similar = SimilarityIndex(0.8)  # 80% similarity threshold
+            for task in self.tasks:
+                self.similar.add(task.text)
+        
+        position = self.similar.match(task_text)
+        return self.tasks[position] if position is not None else None
+
+def count_statuses(tasks: List[Dict]) -> Dict[str, int]:
+    counts = {}
+    for task in tasks:
+        counts[task['status']] = counts.get(task['status'], 0) + 1
+    return counts
+
+def task_from_row(row: Dict) -> Dict:
+    """A task store row in the form parse_markdown_tasks returns"""
+    return {
+        'id': row['id'],
+        'text': row['text'],
+        'completed': row['status'] == 'completed',
+        'status': row['status'],
+        'section': row['section'],
+        'line_number': row['line_number'],
+        'indent': row['indent'],
+        'file': row['file']
+    }
 
 class TaskTracker:
     """Tracks and manages tasks across all terminals"""
     
-    def __init__(self, project_path):
+    def __init__(self, project_path, store: str = TASK_STORE):
         self.project_path = Path(project_path)
         self.todo_dir = self.project_path / "todo"
+        self.terminals = swarm_config.terminals(self.project_path)
         self.tracking_file = self.project_path / "coordination" / "task-tracking.json"
-        self.load_tracking_data()
+        # Not .json, so that the Kanban watcher ignores the scan cache; task
+        # lists are kept beside it in coordination/task-scan/
+        self.scan_cache_file = self.project_path / "coordination" / "task-scan.cache"
+        self.completions_file = self.scan_cache_file.with_suffix('') / "completions.cache"
+        
+        # With the SQLite store, task-tracking.json is neither read nor written
+        self.store = None
+        if store == 'sqlite':
+            self.store = TaskStore(self.project_path / "coordination" / "tasks.db")
+        else:
+            self.load_tracking_data()
     
     def load_tracking_data(self):
         """Load existing tracking data"""
@@ -37,102 +173,245 @@ class TaskTracker:
     
     def save_tracking_data(self):
         """Save tracking data"""
+        if self.store:
+            self._notify_kanban()
+            return
+        
         self.tracking_data['last_updated'] = datetime.now().isoformat()
         self.tracking_file.parent.mkdir(exist_ok=True)
-        with open(self.tracking_file, 'w') as f:
-            json.dump(self.tracking_data, f, indent=2)
+        state_files.write_json(self.tracking_file, self.tracking_data)
         
         # Trigger update for Kanban if running
         self._notify_kanban()
     
     def scan_todos(self) -> Dict:
         """Scan all todo files and extract tasks"""
-        all_tasks = {}
+        if self.store:
+            self.sync_store()
+            all_tasks = {terminal_num: [] for terminal_num in self.store.terminals()}
+            for row in self.store.tasks():
+                all_tasks[row['terminal']].append(task_from_row(row))
+            return all_tasks
         
-        for terminal_num in range(1, 6):
-            todo_file = self.todo_dir / f"terminal-{terminal_num}.md"
-            if todo_file.exists():
-                tasks = self.parse_markdown_tasks(todo_file)
-                all_tasks[terminal_num] = tasks
-        
-        return all_tasks
+        return {
+            terminal_num: tasks
+            for terminal_num, (_, tasks) in self.scan_cached(with_tasks=True).items()
+        }
     
-    def parse_markdown_tasks(self, file_path: Path) -> List[Dict]:
-        """Parse tasks from markdown file"""
-        tasks = []
-        current_section = ""
-        
-        with open(file_path, 'r') as f:
-            lines = f.readlines()
-        
-        for i, line in enumerate(lines):
-            # Track sections
-            if line.startswith('#'):
-                current_section = line.strip('#').strip()
+    def scan_cached(self, with_tasks: bool) -> Dict[int, Tuple[Dict, Optional[List[Dict]]]]:
+        """Status counts, and tasks if asked for, of each terminal's todo file
+        
+        Parses are cached in coordination/ by file path, mtime and content
+        hash. The counts live in a small index so that status queries never
+        load the task lists. Files modified shortly before they were last
+        checked are hashed again, as a same-size edit within one mtime
+        tick would otherwise go unnoticed.
+        """
+        index = self.load_scan_index()
+        index_changed = False
+        results = {}
+        parsed = {}
+        
+        for terminal_num in self.terminals:
+            todo_file = self.todo_dir / f"terminal-{terminal_num}.md"
+            if not todo_file.exists():
+                continue
             
-            # Find tasks (both completed and uncompleted)
-            task_match = re.match(r'^(\s*)- \[([ xX])\] (.+)$', line)
-            if task_match:
-                indent = len(task_match.group(1))
-                completed = task_match.group(2).lower() == 'x'
-                task_text = task_match.group(3)
+            key = str(todo_file.relative_to(self.project_path))
+            entry = index.get(key)
+            checked_ns = time.time_ns()
+            stat = todo_file.stat()
+            tasks = None
+            
+            if (not entry or (entry['mtime_ns'], entry['size']) != (stat.st_mtime_ns, stat.st_size)
+                    or not state_files.stat_trusted(stat.st_mtime_ns, entry.get('checked_ns', 0))):
+                with open(todo_file, 'rb') as f:
+                    content = f.read()
+                content_hash = hashlib.md5(content).hexdigest()
                 
-                # Generate unique ID for task
-                task_id = self.generate_task_id(file_path.name, task_text)
+                # A new mtime with the same content, e.g. after a touch, needs no reparse
+                if not entry or entry['hash'] != content_hash:
+                    tasks = self.parse_markdown_tasks(todo_file, io.StringIO(content.decode(), newline=None))
+                    self.save_cached_tasks(todo_file, content_hash, tasks)
+                    parsed[terminal_num] = tasks
+                    entry = {'hash': content_hash, 'counts': count_statuses(tasks)}
                 
-                tasks.append({
-                    'id': task_id,
-                    'text': task_text,
-                    'completed': completed,
-                    'section': current_section,
-                    'line_number': i,
-                    'indent': indent,
-                    'file': file_path.name
-                })
+                entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size, checked_ns=checked_ns)
+                index[key] = entry
+                index_changed = True
+            
+            if with_tasks and tasks is None:
+                tasks = self.load_cached_tasks(todo_file, entry['hash'])
+                if tasks is None:
+                    tasks = self.parse_markdown_tasks(todo_file)
+                    self.save_cached_tasks(todo_file, entry['hash'], tasks)
+            
+            results[terminal_num] = (entry['counts'], tasks)
+        
+        if index_changed:
+            self.save_scan_index(index)
+        if parsed:
+            self.track_completions(parsed)
         
+        return results
+    
+    def track_completions(self, parsed: Dict[int, List[Dict]]):
+        """Note when scans first saw each task of these terminals and saw it done
+        
+        This is the completion history of markdown mode, as the SQLite
+        store keeps its own; its times are only as fine as scans are
+        frequent. It is kept beside the scan cache, which the Kanban
+        watcher ignores, and only for tasks still in the todo files.
+        """
+        if not self.scan_cache_file.parent.exists():
+            return
+        now = round(time.time(), 1)
+        
+        def note(data):
+            for terminal_num, tasks in parsed.items():
+                previous = data.get(str(terminal_num), {})
+                current = {}
+                for task in tasks:
+                    _, first_seen, completed = previous.get(task['text'], (task['section'], now, None))
+                    if task['completed'] != (completed is not None):
+                        completed = now if task['completed'] else None
+                    current[task['text']] = [task['section'], first_seen, completed]
+                data[str(terminal_num)] = current
+        
+        state_files.update_json(self.completions_file, note)
+    
+    def load_scan_index(self) -> Dict:
+        """Cache entries by todo file path; empty if missing or outdated"""
+        try:
+            with open(self.scan_cache_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != SCAN_CACHE_VERSION:
+            return {}
+        return data['files']
+    
+    def save_scan_index(self, index: Dict):
+        if not self.scan_cache_file.parent.exists():
+            return
+        data = {'version': SCAN_CACHE_VERSION, 'files': index}
+        state_files.write_text(self.scan_cache_file, json.dumps(data, indent=2))
+    
+    def cached_tasks_file(self, todo_file: Path) -> Path:
+        return self.scan_cache_file.with_suffix('') / f"{todo_file.name}.cache"
+    
+    def load_cached_tasks(self, todo_file: Path, content_hash: str) -> Optional[List[Dict]]:
+        """Cached parse of a todo file, if it is of this content"""
+        try:
+            with open(self.cached_tasks_file(todo_file), 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('hash') != content_hash:
+            return None
+        
+        file_name = todo_file.name
+        tasks = []
+        for row in data['rows']:
+            task = dict(zip(CACHED_TASK_FIELDS, row))
+            task['completed'] = task['status'] == 'completed'
+            task['file'] = file_name
+            tasks.append(task)
         return tasks
     
+    def save_cached_tasks(self, todo_file: Path, content_hash: str, tasks: List[Dict]):
+        # Rows rather than dicts keep the cache a fraction of the size
+        cache_file = self.cached_tasks_file(todo_file)
+        if not cache_file.parent.parent.exists():
+            return
+        cache_file.parent.mkdir(exist_ok=True)
+        data = {
+            'hash': content_hash,
+            'rows': [[task[field] for field in CACHED_TASK_FIELDS] for task in tasks]
+        }
+        state_files.write_text(cache_file, json.dumps(data, separators=(',', ':')))
+    
+    def sync_store(self, terminal_nums: Optional[Iterable[int]] = None):
+        """Re-import todo files changed since the store last saw them"""
+        for terminal_num in (self.terminals if terminal_nums is None else terminal_nums):
+            todo_file = self.todo_dir / f"terminal-{terminal_num}.md"
+            self.store.sync_file(terminal_num, todo_file, self.parse_markdown_tasks)
+    
+    def parse_markdown_tasks(self, file_path: Path, lines: Optional[Iterable[str]] = None) -> List[Dict]:
+        """Parse tasks from markdown file, or from its lines if already read"""
+        tasks = todo_parser.iter_tasks(lines) if lines is not None else todo_parser.parse_file(file_path)
+        return [
+            {
+                'id': self.generate_task_id(file_path.name, task.text),
+                'text': task.text,
+                'completed': task.state == 'completed',
+                'status': task.state,
+                'section': task.section,
+                'line_number': task.line - 1,
+                'indent': task.indent,
+                'file': file_path.name
+            }
+            for task in tasks
+        ]
+    
     def generate_task_id(self, file_name: str, task_text: str) -> str:
         """Generate unique ID for a task"""
         # Remove variable parts like numbers, dates
-        normalized = re.sub(r'\d+', 'N', task_text)
-        normalized = re.sub(r'\s+', ' ', normalized).strip().lower()
+        normalized = ' '.join(DIGITS_PATTERN.sub('N', task_text).split()).lower()
         
         # Create hash
         content = f"{file_name}:{normalized}"
         return hashlib.md5(content.encode()).hexdigest()[:8]
     
     def update_task_status(self, terminal_num: int, task_text: str, completed: bool):
-        """Update task status in markdown file"""
-        todo_file = self.todo_dir / f"terminal-{terminal_num}.md"
-        
-        if not todo_file.exists():
-            return False
-        
-        with open(todo_file, 'r') as f:
-            lines = f.readlines()
-        
-        updated = False
-        for i, line in enumerate(lines):
-            if '- [ ]' in line or '- [x]' in line or '- [X]' in line:
-                # Extract task text from line
-                task_match = re.match(r'^(\s*)- \[[ xX]\] (.+)$', line)
-                if task_match:
-                    line_task = task_match.group(2)
-                    # Check if this is the task we're looking for (fuzzy match)
-                    similarity = difflib.SequenceMatcher(None, task_text.lower(), line_task.lower()).ratio()
-                    if similarity > 0.8:  # 80% similarity threshold
-                        indent = task_match.group(1)
+        """Update task status in markdown file
+        
+        task_text is matched as a task id (the tracker's or the Kanban API's),
+        then as exact text, then fuzzily.
+        """
+        return self.update_task_statuses([(terminal_num, task_text, completed)])[0]
+    
+    def update_task_statuses(self, updates: List[Tuple[int, str, bool]]) -> List[bool]:
+        """Apply many (terminal, task, completed) updates, writing each file once
+        
+        Returns whether each update found its task.
+        """
+        results = [False] * len(updates)
+        
+        by_terminal = {}
+        for i, (terminal_num, _, _) in enumerate(updates):
+            by_terminal.setdefault(terminal_num, []).append(i)
+        
+        for terminal_num, positions in by_terminal.items():
+            todo_file = self.todo_dir / f"terminal-{terminal_num}.md"
+            if not todo_file.exists():
+                continue
+            
+            # Rerun from scratch if the file changes under us
+            def apply_updates(content):
+                if content is None:
+                    return None
+                
+                lines = content.splitlines(keepends=True)
+                index = TodoLineIndex(lines, lambda text: self.generate_task_id(todo_file.name, text))
+                for i in positions:
+                    _, task_text, completed = updates[i]
+                    task = index.find(task_text)
+                    results[i] = task is not None
+                    if task:
+                        # Only the checkbox changes, so the index stays valid
+                        mark = task.indent + 3
                         new_status = 'x' if completed else ' '
-                        lines[i] = f"{indent}- [{new_status}] {line_task}\n"
-                        updated = True
-                        break
+                        line = lines[task.line - 1]
+                        lines[task.line - 1] = line[:mark] + new_status + line[mark + 1:]
+                return ''.join(lines)
+            
+            state_files.update(todo_file, apply_updates)
         
-        if updated:
-            with open(todo_file, 'w') as f:
-                f.writelines(lines)
+        if self.store:
+            self.sync_store(by_terminal)
         
-        return updated
+        return results
     
     def merge_new_tasks(self, new_request: str) -> Dict:
         """Merge new tasks with existing todos, avoiding duplicates"""
@@ -140,12 +419,12 @@ class TaskTracker:
         # Scan current todos
         current_tasks = self.scan_todos()
         
-        # Extract all task texts for duplicate detection
-        existing_texts = []
+        # Index open task texts for duplicate detection
+        existing_texts = SimilarityIndex(0.7)  # 70% similarity threshold
         for terminal_tasks in current_tasks.values():
             for task in terminal_tasks:
                 if not task['completed']:
-                    existing_texts.append(task['text'].lower())
+                    existing_texts.add(task['text'])
         
         # Parse new request for potential tasks
         new_tasks = self.extract_tasks_from_request(new_request)
@@ -156,15 +435,9 @@ class TaskTracker:
         
         for task in new_tasks:
             # Check for similarity with existing tasks
-            is_duplicate = False
-            for existing in existing_texts:
-                similarity = difflib.SequenceMatcher(None, task.lower(), existing).ratio()
-                if similarity > 0.7:  # 70% similarity threshold
-                    duplicates.append(task)
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
+            if existing_texts.find(task) is not None:
+                duplicates.append(task)
+            else:
                 unique_new_tasks.append(task)
         
         # Distribute new tasks to terminals
@@ -178,60 +451,139 @@ class TaskTracker:
         }
     
     def extract_tasks_from_request(self, request: str) -> List[str]:
-        """Extract potential tasks from a change request"""
-        tasks = []
+        """Extract potential tasks from a change request
+        
+        One pass over the request. A list item is one task, even if it
+        contains a verb; a task repeated in the request is kept once.
+        """
+        tasks = {}
+        for match in REQUEST_TASK_PATTERN.finditer(request):
+            task = match.group('item')
+            if task is None:
+                task = match.group('task').strip().lower()
+                if len(task) <= 5:  # Minimum task length
+                    continue
+            tasks.setdefault(normalize_task_text(task), task)
+        
+        return list(tasks.values())
+    
+    def distribute_tasks(self, tasks: List[str], current_tasks: Dict) -> Dict:
+        """Distribute new tasks among terminals based on workload
+        
+        Each task goes to the terminal projected to finish soonest, counting
+        the estimated size of its open tasks and of tasks given to it earlier
+        in the same batch.
+        """
+        
+        # Configured terminals without a todo file yet start out idle
+        terminals = sorted(set(self.terminals) | set(current_tasks))
+        speeds, weights = self.cost_model()
+        loads = task_scheduler.projected_loads(current_tasks, terminals, speeds, weights)
+        costs = [task_scheduler.estimate_cost(task, section="New Tasks", section_weights=weights)
+                 for task in tasks]
+        
+        distribution = {t: [] for t in terminals}
+        for task, terminal in zip(tasks, task_scheduler.assign(costs, loads, speeds)):
+            distribution[terminal].append(task)
         
-        # Common task patterns
-        patterns = [
-            r'add[s]?\s+(.+?)(?:\.|,|;|$)',
-            r'implement[s]?\s+(.+?)(?:\.|,|;|$)',
-            r'create[s]?\s+(.+?)(?:\.|,|;|$)',
-            r'build[s]?\s+(.+?)(?:\.|,|;|$)',
-            r'fix[es]?\s+(.+?)(?:\.|,|;|$)',
-            r'update[s]?\s+(.+?)(?:\.|,|;|$)',
-            r'improve[s]?\s+(.+?)(?:\.|,|;|$)',
-        ]
+        return distribution
+    
+    def cost_model(self) -> Tuple[Dict[int, float], Dict[str, float]]:
+        """Terminal speeds and section weights, from completion history"""
+        completions = self.completion_times()
+        weights = task_scheduler.section_weights(completions)
+        return task_scheduler.terminal_speeds(completions, weights), weights
+    
+    def completion_times(self) -> List[Tuple[int, str, str, float]]:
+        """(terminal, text, section, seconds) of each completed task
         
-        request_lower = request.lower()
-        for pattern in patterns:
-            matches = re.finditer(pattern, request_lower)
-            for match in matches:
-                task = match.group(1).strip()
-                if len(task) > 5:  # Minimum task length
-                    tasks.append(task)
-        
-        # Also look for bullet points or numbered lists
-        lines = request.split('\n')
-        for line in lines:
-            line = line.strip()
-            if re.match(r'^[-*•]\s+(.+)$', line):
-                task = re.sub(r'^[-*•]\s+', '', line)
-                tasks.append(task)
-            elif re.match(r'^\d+\.\s+(.+)$', line):
-                task = re.sub(r'^\d+\.\s+', '', line)
-                tasks.append(task)
+        From the SQLite store's history, or else from what scans noted,
+        see track_completions().
+        """
+        if self.store:
+            self.sync_store()
+            return self.store.completion_times()
         
-        return tasks
+        self.scan_cached(with_tasks=False)
+        try:
+            with open(self.completions_file, 'r') as f:
+                tracked = json.load(f)
+        except (OSError, ValueError):
+            return []
+        return [
+            (int(terminal), text, section, completed - first_seen)
+            for terminal, tasks in tracked.items()
+            for text, (section, first_seen, completed) in tasks.items()
+            if completed is not None
+        ]
     
-    def distribute_tasks(self, tasks: List[str], current_tasks: Dict) -> Dict:
-        """Distribute new tasks among terminals based on workload"""
+    def rebalance_tasks(self, apply: bool = False) -> List[Dict]:
+        """Plan moves of pending tasks from busy terminals to idle ones
         
-        # Calculate current workload
-        workload = {}
-        for terminal, tasks_list in current_tasks.items():
-            incomplete = sum(1 for t in tasks_list if not t['completed'])
-            workload[terminal] = incomplete
+        Only tasks in pending sections move. With apply, moved tasks are
+        removed from their file and appended to the other terminal's.
+        """
+        current_tasks = self.scan_todos()
+        if not current_tasks:
+            return []
+        
+        speeds, weights = self.cost_model()
+        terminals = sorted(set(self.terminals) | set(current_tasks))
+        loads = task_scheduler.projected_loads(current_tasks, terminals, speeds, weights)
+        pending = {
+            terminal: [
+                (task, task_scheduler.estimate_cost(task['text'], section=task['section'],
+                                                    section_weights=weights))
+                for task in task_list if task['status'] == 'pending'
+            ]
+            for terminal, task_list in current_tasks.items()
+        }
+        moves = task_scheduler.rebalance(pending, loads, speeds)
         
-        # Sort terminals by workload (least busy first)
-        sorted_terminals = sorted(workload.keys(), key=lambda x: workload[x])
+        if apply and moves:
+            moves = self.move_tasks(moves)
         
-        # Distribute tasks
-        distribution = {t: [] for t in range(1, 6)}
-        for i, task in enumerate(tasks):
-            terminal = sorted_terminals[i % len(sorted_terminals)]
-            distribution[terminal].append(task)
+        return [{'task': task['text'], 'from': source, 'to': target} for task, source, target in moves]
+    
+    def move_tasks(self, moves: List[Tuple[Dict, int, int]]) -> List[Tuple[Dict, int, int]]:
+        """Move unchecked tasks between todo files; returns the moves made
+        
+        A task whose line changed since it was scanned stays where it is.
+        """
+        by_source = {}
+        for move in moves:
+            by_source.setdefault(move[1], []).append(move)
+        
+        moved = []
+        for source, source_moves in by_source.items():
+            removed = []
+            
+            def remove_lines(content):
+                removed.clear()
+                if content is None:
+                    return None
+                # Split as scanning did, so that line numbers agree
+                lines = io.StringIO(content).readlines()
+                for move in source_moves:
+                    task = move[0]
+                    line_number = task['line_number']
+                    match = todo_parser.TASK_PATTERN.match(lines[line_number]) if line_number < len(lines) else None
+                    if match and match.group(2) == ' ' and match.group(3).rstrip() == task['text']:
+                        lines[line_number] = None
+                        removed.append(move)
+                return ''.join(line for line in lines if line is not None)
+            
+            state_files.update(self.todo_dir / f"terminal-{source}.md", remove_lines)
+            moved.extend(removed)
         
-        return distribution
+        distribution = {}
+        for task, _, target in moved:
+            distribution.setdefault(target, []).append(task['text'])
+        self.append_tasks_to_todos(distribution, heading="Rebalanced Tasks")
+        if self.store:
+            self.sync_store(by_source)
+        
+        return moved
     
     def count_remaining_tasks(self, tasks: Dict) -> Dict:
         """Count remaining tasks per terminal"""
@@ -246,34 +598,46 @@ class TaskTracker:
             }
         return remaining
     
-    def append_tasks_to_todos(self, distribution: Dict):
+    def append_tasks_to_todos(self, distribution: Dict, heading: str = "New Tasks"):
         """Append new tasks to todo files"""
         
-        for terminal, tasks in distribution.items():
-            if not tasks:
-                continue
-            
-            todo_file = self.todo_dir / f"terminal-{terminal}.md"
-            
-            # Read existing content
-            if todo_file.exists():
-                with open(todo_file, 'r') as f:
-                    content = f.read()
-            else:
-                content = f"# Terminal {terminal} - Tasks\n\n"
-            
-            # Append new section
-            new_section = f"\n## New Tasks - {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
-            for task in tasks:
-                new_section += f"- [ ] {task}\n"
-            
-            # Write back
-            with open(todo_file, 'w') as f:
-                f.write(content + new_section)
+        self.append_task_sections(
+            (terminal, heading, tasks) for terminal, tasks in distribution.items())
+    
+    def append_task_sections(self, sections: Iterable[Tuple[int, str, List[str]]]):
+        """Append (terminal, heading, tasks) sections to todo files
+        
+        Sections are appended in order, with one write per file however
+        many sections it gets; the existing content is not read or
+        rewritten. Sections without tasks are skipped.
+        """
+        
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M')
+        appended = {}
+        for terminal, heading, tasks in sections:
+            if tasks:
+                appended.setdefault(terminal, []).append(
+                    f"\n## {heading} - {timestamp}\n" + "".join(f"- [ ] {task}\n" for task in tasks))
+        
+        for terminal, new_sections in appended.items():
+            state_files.append(self.todo_dir / f"terminal-{terminal}.md", "".join(new_sections),
+                               header=f"# Terminal {terminal} - Tasks\n\n")
+        
+        if self.store:
+            self.sync_store(appended)
     
     def get_status_summary(self) -> Dict:
         """Get summary of all tasks"""
-        tasks = self.scan_todos()
+        if self.store:
+            # Counted by the store's status index, not by rescanning
+            self.sync_store()
+            counts = {terminal: {} for terminal in self.store.terminals()}
+            counts.update(self.store.status_counts())
+        else:
+            counts = {
+                terminal: status_counts
+                for terminal, (status_counts, _) in self.scan_cached(with_tasks=False).items()
+            }
         
         summary = {
             'terminals': {},
@@ -284,9 +648,9 @@ class TaskTracker:
             'completion_percentage': 0
         }
         
-        for terminal, task_list in tasks.items():
-            completed = sum(1 for t in task_list if t['completed'])
-            total = len(task_list)
+        for terminal, status_counts in counts.items():
+            completed = status_counts.get('completed', 0)
+            total = sum(status_counts.values())
             
             summary['terminals'][terminal] = {
                 'total': total,
@@ -297,6 +661,7 @@ class TaskTracker:
             
             summary['total_tasks'] += total
             summary['completed_tasks'] += completed
+            summary['in_progress_tasks'] += status_counts.get('in_progress', 0)
         
         summary['pending_tasks'] = summary['total_tasks'] - summary['completed_tasks']
         
@@ -335,8 +700,11 @@ def main():
         print("Usage:")
         print("  task-tracker.py <project-path> scan        # Scan all todos")
         print("  task-tracker.py <project-path> update <terminal> <task> <status>")
+        print("  task-tracker.py <project-path> update-batch [file]  # JSON or NDJSON, - for stdin")
         print("  task-tracker.py <project-path> merge \"<new-request>\"")
         print("  task-tracker.py <project-path> status      # Get status summary")
+        print("  task-tracker.py <project-path> rebalance [--apply]  # Even out pending work")
+        print("  task-tracker.py <project-path> history [n] # Recent status changes (SQLite store)")
         sys.exit(1)
     
     project_path = sys.argv[1]
@@ -366,6 +734,42 @@ def main():
         else:
             print("✗ Task not found")
     
+    elif command == 'update-batch':
+        source = sys.argv[3] if len(sys.argv) > 3 else '-'
+        if source == '-':
+            text = sys.stdin.read()
+        else:
+            with open(source, 'r') as f:
+                text = f.read()
+        
+        try:
+            updates = parse_update_batch(text)
+        except ValueError as e:
+            print(f"✗ Invalid JSON: {e}", file=sys.stderr)
+            sys.exit(1)
+        
+        valid = [u for u in updates if 'error' not in u]
+        results = iter(tracker.update_task_statuses(
+            [(u['terminal'], u['task'], u['completed']) for u in valid]))
+        
+        # One result per input item, in input order
+        for update in updates:
+            if 'error' not in update:
+                update['updated'] = next(results)
+                if not update['updated']:
+                    update['error'] = 'task not found'
+            print(json.dumps(update))
+    
+    elif command == 'rebalance':
+        apply = '--apply' in sys.argv[3:]
+        moves = tracker.rebalance_tasks(apply=apply)
+        if not moves:
+            print("Terminals are balanced")
+        for move in moves:
+            print(f"  T{move['from']} → T{move['to']}: {move['task'][:60]}")
+        if moves and not apply:
+            print("\nRun with --apply to move these tasks")
+    
     elif command == 'merge':
         if len(sys.argv) < 4:
             print("Usage: task-tracker.py <project> merge \"<new-request>\"")
@@ -391,6 +795,17 @@ def main():
         tracker.append_tasks_to_todos(result['distribution'])
         print("\n✓ Tasks added to todo files")
     
+    elif command == 'history':
+        if not tracker.store:
+            print("History needs the SQLite store: set SWARM_TASK_STORE=sqlite")
+            sys.exit(1)
+        
+        tracker.sync_store()
+        limit = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+        for change in tracker.store.history(limit):
+            print(f"{change['at'][:19]}  T{change['terminal']}  "
+                  f"{change['old_status'] or 'new'} → {change['new_status']}  {change['text'][:60]}")
+    
     elif command == 'status':
         summary = tracker.get_status_summary()
         print(f"\nProject Status:")
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+
+"""
+Task Scheduler - Load-aware assignment of tasks to terminals
+
+Estimates how much work each task is, keeps every terminal's projected
+load in a min-heap, and gives each new task to the terminal that would
+finish soonest. Tasks in sections that historically took longer per unit
+of work count for more, and terminals that historically take longer get
+proportionally less.
+"""
+
+import heapq
+import re
+import statistics
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Work left on a task that is already being worked on, relative to a new one
+IN_PROGRESS_COST_FACTOR = 0.5
+
+# Completed tasks a terminal or section needs in its history before its
+# speed or weight is used
+MIN_SPEED_SAMPLES = 3
+
+# Parts of headings that differ between alike sections: the timestamp of
+# appended task sections, and numbers
+SECTION_TIMESTAMP_PATTERN = re.compile(r'\s+-\s+\d{4}-\d\d-\d\d \d\d:\d\d$')
+DIGITS_PATTERN = re.compile(r'\d+')
+
+def section_key(section: str) -> str:
+    """Form of a section heading under which its weight is learned"""
+    return DIGITS_PATTERN.sub('N', SECTION_TIMESTAMP_PATTERN.sub('', section).strip()).lower()
+
+def estimate_cost(text: str, status: str = 'pending', section: str = '',
+                  section_weights: Optional[Dict[str, float]] = None) -> float:
+    """Relative amount of work in a task, from its wording and section
+    
+    Longer descriptions mean more to do; one unit is a short task. The
+    result is scaled by the section's weight from section_weights().
+    """
+    
+    cost = 1.0 + len(text.split()) / 8
+    if section_weights:
+        cost *= section_weights.get(section_key(section), 1.0)
+    if status == 'in_progress':
+        cost *= IN_PROGRESS_COST_FACTOR
+    elif status == 'completed':
+        cost = 0.0
+    return cost
+
+def relative_medians(per_unit: Dict[Any, List[float]]) -> Dict[Any, float]:
+    """Each key's median sample relative to the median of those medians
+    
+    Keys with fewer than MIN_SPEED_SAMPLES samples are left out.
+    """
+    
+    medians = {
+        key: statistics.median(samples)
+        for key, samples in per_unit.items()
+        if len(samples) >= MIN_SPEED_SAMPLES
+    }
+    if not medians:
+        return {}
+    
+    typical = statistics.median(medians.values())
+    return {key: median / typical for key, median in medians.items()}
+
+def section_weights(completions: Iterable[Tuple[int, str, str, float]]) -> Dict[str, float]:
+    """Relative time per unit of work in each section, 1.0 being typical
+    
+    completions are (terminal, task text, section, seconds to complete).
+    Sections are keyed by section_key(); ones with too little history are
+    left out and count as typical.
+    """
+    
+    per_unit = {}
+    for _, text, section, seconds in completions:
+        if seconds > 0:
+            per_unit.setdefault(section_key(section), []).append(seconds / estimate_cost(text))
+    return relative_medians(per_unit)
+
+def terminal_speeds(completions: Iterable[Tuple[int, str, str, float]],
+                    weights: Optional[Dict[str, float]] = None) -> Dict[int, float]:
+    """Relative time per unit of work of each terminal, 1.0 being typical
+    
+    completions are as for section_weights(), whose result weights gives
+    the work in each task. Terminals with too little history are left out
+    and count as typical.
+    """
+    
+    per_unit = {}
+    for terminal, text, section, seconds in completions:
+        if seconds > 0:
+            cost = estimate_cost(text, section=section, section_weights=weights)
+            per_unit.setdefault(terminal, []).append(seconds / cost)
+    return relative_medians(per_unit)
+
+def projected_loads(current_tasks: Dict[int, List[Dict]], terminals: Iterable[int],
+                    speeds: Optional[Dict[int, float]] = None,
+                    weights: Optional[Dict[str, float]] = None) -> Dict[int, float]:
+    """Time each terminal needs for its open tasks, in units of work"""
+    
+    speeds = speeds or {}
+    return {
+        terminal: speeds.get(terminal, 1.0) * sum(
+            estimate_cost(task['text'], task['status'], task.get('section', ''), weights)
+            for task in current_tasks.get(terminal, [])
+        )
+        for terminal in terminals
+    }
+
+def assign(costs: List[float], loads: Dict[int, float],
+           speeds: Optional[Dict[int, float]] = None) -> List[int]:
+    """Terminal for each task, keeping the projected finish time low
+    
+    Largest tasks are placed first, each on the terminal whose projected
+    load is lowest at that point (longest processing time first).
+    """
+    
+    if not loads:
+        raise ValueError("no terminals to assign tasks to")
+    
+    speeds = speeds or {}
+    heap = [(load, terminal) for terminal, load in loads.items()]
+    heapq.heapify(heap)
+    
+    assignment = [0] * len(costs)
+    for i in sorted(range(len(costs)), key=lambda i: -costs[i]):
+        load, terminal = heapq.heappop(heap)
+        assignment[i] = terminal
+        heapq.heappush(heap, (load + costs[i] * speeds.get(terminal, 1.0), terminal))
+    return assignment
+
+def rebalance(pending: Dict[int, List[Tuple[Any, float]]], loads: Dict[int, float],
+              speeds: Optional[Dict[int, float]] = None) -> List[Tuple[Any, int, int]]:
+    """Moves of pending tasks that even out terminal loads
+    
+    pending maps each terminal to its movable (task, cost) pairs; loads
+    include them. A task moves from the busiest to the least busy terminal
+    while that lowers the busier of the two, picking the task that comes
+    closest to halving the gap. Returns (task, from, to) moves.
+    """
+    
+    speeds = speeds or {}
+    loads = dict(loads)
+    pending = {terminal: list(tasks) for terminal, tasks in pending.items()}
+    moves = []
+    
+    # Each task moves at most once, which bounds the loop
+    for _ in range(sum(len(tasks) for tasks in pending.values())):
+        busiest = max(loads, key=loads.get)
+        idlest = min(loads, key=loads.get)
+        gap = loads[busiest] - loads[idlest]
+        
+        best = None
+        for i, (_, cost) in enumerate(pending.get(busiest, [])):
+            added = cost * speeds.get(idlest, 1.0)
+            removed = cost * speeds.get(busiest, 1.0)
+            if loads[idlest] + added < loads[busiest]:
+                distance = abs(removed - gap / 2)
+                if best is None or distance < best[0]:
+                    best = (distance, i, added, removed)
+        if best is None:
+            break
+        
+        _, i, added, removed = best
+        task, _ = pending[busiest].pop(i)
+        loads[busiest] -= removed
+        loads[idlest] += added
+        moves.append((task, busiest, idlest))
+    
+    return moves
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+"""
+Task Similarity - Near-duplicate lookup over task texts
+
+Indexes task texts by character trigrams so that a lookup only runs difflib
+on the few texts that share enough trigrams with the query, instead of on
+every task.
+"""
+
+import difflib
+import math
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set
+
+GRAM_SIZE = 3
+
+# Fraction of a query's trigrams a text must share to be scored at all.
+# Texts above a 0.7 difflib ratio share far more than this in practice;
+# see benchmarks/task_dedup.py for agreement with a full scan.
+MIN_GRAM_OVERLAP = 0.25
+
+def grams(text: str) -> Set[str]:
+    """Character trigrams of a text, padded so short words still count"""
+    
+    padded = f" {text} "
+    if len(padded) <= GRAM_SIZE:
+        return {padded}
+    return {padded[i:i + GRAM_SIZE] for i in range(len(padded) - GRAM_SIZE + 1)}
+
+class SimilarityIndex:
+    """Texts indexed for lookups by difflib similarity ratio
+    
+    match() and find() agree with comparing the query against every indexed
+    text by SequenceMatcher(None, query, text).ratio() > threshold, except
+    for rare pairs that are similar while sharing few trigrams.
+    Matching is case-insensitive.
+    """
+    
+    def __init__(self, threshold: float = 0.7):
+        self.threshold = threshold
+        self.texts: List[str] = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+    
+    def __len__(self):
+        return len(self.texts)
+    
+    def add(self, text: str) -> int:
+        """Index a text and return its position"""
+        
+        text = text.lower()
+        position = len(self.texts)
+        self.texts.append(text)
+        for gram in grams(text):
+            self.postings[gram].append(position)
+        return position
+    
+    def candidates(self, query: str) -> List[int]:
+        """Positions of texts that could be above the threshold"""
+        
+        query = query.lower()
+        query_grams = grams(query)
+        required = max(1, math.ceil(len(query_grams) * MIN_GRAM_OVERLAP))
+        
+        # Shared gram counts come from the posting lists alone; Counter
+        # tallies each list in C, so texts sharing nothing cost nothing
+        shared = Counter()
+        postings = self.postings
+        for gram in query_grams:
+            if gram in postings:
+                shared.update(postings[gram])
+        
+        # difflib's ratio is at most 2 * min(len) / (len + len), which bounds
+        # how much longer or shorter a match can be
+        low = len(query) * self.threshold / (2 - self.threshold)
+        high = len(query) * (2 - self.threshold) / self.threshold
+        
+        # Most shared grams first, as those are the likeliest matches
+        texts = self.texts
+        candidates = []
+        for position, count in shared.most_common():
+            if count < required:
+                break
+            if low <= len(texts[position]) <= high:
+                candidates.append(position)
+        return candidates
+    
+    def match(self, query: str) -> Optional[int]:
+        """Position of an indexed text more similar to the query than the threshold"""
+        
+        matcher = difflib.SequenceMatcher(None, query.lower())
+        for position in self.candidates(query):
+            matcher.set_seq2(self.texts[position])
+            if (matcher.real_quick_ratio() > self.threshold
+                    and matcher.quick_ratio() > self.threshold
+                    and matcher.ratio() > self.threshold):
+                return position
+        return None
+    
+    def find(self, query: str) -> Optional[str]:
+        """An indexed text more similar to the query than the threshold, if any"""
+        
+        position = self.match(query)
+        return self.texts[position] if position is not None else None
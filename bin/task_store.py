@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+
+"""
+Task Store - SQLite index of a project's tasks and their history
+
+An optional store behind TaskTracker (SWARM_TASK_STORE=sqlite). The todo
+markdown files stay what agents read and edit; the store mirrors them in
+`coordination/tasks.db`, re-importing a file only when it changed, so that
+summaries and lookups are indexed queries instead of rescans. Status
+changes seen on import are kept as history.
+"""
+
+import hashlib
+import io
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import state_files
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    terminal INTEGER NOT NULL,
+    line_number INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    text TEXT NOT NULL,
+    section TEXT NOT NULL,
+    status TEXT NOT NULL,
+    indent INTEGER NOT NULL,
+    file TEXT NOT NULL,
+    PRIMARY KEY (terminal, line_number)
+);
+CREATE INDEX IF NOT EXISTS tasks_by_status ON tasks (terminal, status);
+CREATE INDEX IF NOT EXISTS tasks_by_id ON tasks (id);
+
+CREATE TABLE IF NOT EXISTS history (
+    at TEXT NOT NULL,
+    terminal INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    text TEXT NOT NULL,
+    old_status TEXT,
+    new_status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_by_id ON history (id);
+
+CREATE TABLE IF NOT EXISTS files (
+    terminal INTEGER PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT,
+    checked_ns INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# Seconds to wait for another process's write transaction
+BUSY_TIMEOUT = 10
+
+class TaskStore:
+    """Tasks of one project in SQLite, kept in step with its todo files"""
+    
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(exist_ok=True)
+        self.db = sqlite3.connect(str(self.db_path), timeout=BUSY_TIMEOUT, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(SCHEMA)
+        
+        # Stores created before files had a hash get the new columns
+        columns = {row['name'] for row in self.db.execute('PRAGMA table_info(files)')}
+        if 'hash' not in columns:
+            self.db.execute('ALTER TABLE files ADD COLUMN hash TEXT')
+            self.db.execute('ALTER TABLE files ADD COLUMN checked_ns INTEGER NOT NULL DEFAULT 0')
+    
+    def close(self):
+        self.db.close()
+    
+    def sync_file(self, terminal: int, todo_file: Path,
+                  parse: Callable[[Path, Iterable[str]], List[Dict]]) -> bool:
+        """Re-import a todo file if it changed since the last import
+        
+        parse returns the tasks in the file's lines as
+        TaskTracker.parse_markdown_tasks does. A file whose mtime and size
+        are unchanged is skipped once it was last checked well after it
+        was modified; otherwise it is hashed, as a same-size edit within
+        one mtime tick leaves both unchanged. Returns whether the file was
+        imported.
+        """
+        
+        checked_ns = time.time_ns()
+        try:
+            stat = todo_file.stat()
+            key = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            key = None
+        
+        imported = self._imported(terminal)
+        if key is None and imported is None:
+            return False
+        if (imported is not None and key == (imported['mtime_ns'], imported['size'])
+                and state_files.stat_trusted(key[0], imported['checked_ns'])):
+            return False
+        
+        content = content_hash = None
+        if key is not None:
+            try:
+                with open(todo_file, 'rb') as f:
+                    content = f.read().decode()
+            except FileNotFoundError:
+                key = None
+            else:
+                content_hash = hashlib.md5(content.encode()).hexdigest()
+        
+        # Checked again under the write lock, as another process may have
+        # imported the same change meanwhile
+        with self.transaction():
+            imported = self._imported(terminal)
+            if key is None:
+                if imported is None:
+                    return False
+                self._replace_terminal(terminal, [], None)
+                return True
+            
+            if imported is not None and imported['hash'] == content_hash:
+                self.db.execute(
+                    'UPDATE files SET mtime_ns = ?, size = ?, checked_ns = ? WHERE terminal = ?',
+                    (*key, checked_ns, terminal))
+                return False
+            
+            tasks = parse(todo_file, io.StringIO(content, newline=None))
+            self._replace_terminal(terminal, tasks, (*key, content_hash, checked_ns))
+        return True
+    
+    @contextmanager
+    def transaction(self):
+        self.db.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self.db.execute('ROLLBACK')
+            raise
+        self.db.execute('COMMIT')
+    
+    def _imported(self, terminal):
+        return self.db.execute(
+            'SELECT mtime_ns, size, hash, checked_ns FROM files WHERE terminal = ?',
+            (terminal,)).fetchone()
+    
+    def _replace_terminal(self, terminal, tasks, file_row):
+        """Replace a terminal's tasks, recording status changes as history"""
+        
+        now = datetime.now().isoformat()
+        db = self.db
+        old_status = {
+            (row['line_number'], row['text']): row['status']
+            for row in db.execute(
+                'SELECT line_number, text, status FROM tasks WHERE terminal = ?', (terminal,))
+        }
+        # Tasks that moved keep their history as long as the text is unchanged
+        old_by_text = {text: status for (_, text), status in old_status.items()}
+        
+        history = []
+        for task in tasks:
+            previous = old_status.get((task['line_number'], task['text']),
+                                      old_by_text.get(task['text']))
+            if previous != task['status']:
+                history.append((now, terminal, task['id'], task['text'],
+                                previous, task['status']))
+        
+        db.execute('DELETE FROM tasks WHERE terminal = ?', (terminal,))
+        db.executemany(
+            'INSERT INTO tasks (terminal, line_number, id, text, section, status, indent, file) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            [(terminal, t['line_number'], t['id'], t['text'], t['section'],
+              t['status'], t['indent'], t['file']) for t in tasks])
+        db.executemany('INSERT INTO history VALUES (?, ?, ?, ?, ?, ?)', history)
+        
+        if file_row is None:
+            db.execute('DELETE FROM files WHERE terminal = ?', (terminal,))
+        else:
+            db.execute('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)', (terminal, *file_row))
+    
+    def terminals(self) -> List[int]:
+        """Terminals whose todo file has been imported"""
+        
+        return [row['terminal'] for row in
+                self.db.execute('SELECT terminal FROM files ORDER BY terminal')]
+    
+    def tasks(self, terminal: Optional[int] = None, status: Optional[str] = None) -> List[Dict]:
+        """Tasks in file order, optionally of one terminal and status"""
+        
+        query = 'SELECT * FROM tasks'
+        conditions, params = [], []
+        if terminal is not None:
+            conditions.append('terminal = ?')
+            params.append(terminal)
+        if status is not None:
+            conditions.append('status = ?')
+            params.append(status)
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY terminal, line_number'
+        return [dict(row) for row in self.db.execute(query, params)]
+    
+    def find(self, task_id: str) -> List[Dict]:
+        return [dict(row) for row in self.db.execute(
+            'SELECT * FROM tasks WHERE id = ? ORDER BY terminal, line_number', (task_id,))]
+    
+    def status_counts(self) -> Dict[int, Dict[str, int]]:
+        """Task count per status for each terminal"""
+        
+        counts = {}
+        for row in self.db.execute(
+                'SELECT terminal, status, COUNT(*) AS n FROM tasks GROUP BY terminal, status'):
+            counts.setdefault(row['terminal'], {})[row['status']] = row['n']
+        return counts
+    
+    def completion_times(self) -> List[Tuple[int, str, str, float]]:
+        """(terminal, text, section, seconds) from first seeing a task to its completion
+        
+        The section is the task's current one; '' once it is gone.
+        """
+        
+        rows = self.db.execute(
+            'SELECT done.terminal, done.text, '
+            "COALESCE((SELECT section FROM tasks WHERE terminal = done.terminal AND id = done.id), '') "
+            'AS section, (julianday(done.at) - julianday(MIN(seen.at))) * 86400 AS seconds '
+            'FROM history AS done JOIN history AS seen '
+            'ON seen.terminal = done.terminal AND seen.text = done.text '
+            'AND seen.old_status IS NULL AND seen.rowid < done.rowid '
+            "WHERE done.new_status = 'completed' GROUP BY done.rowid")
+        return [(row['terminal'], row['text'], row['section'], row['seconds']) for row in rows]
+    
+    def history(self, limit: int = 50, task_id: Optional[str] = None) -> List[Dict]:
+        """Most recent status changes first"""
+        
+        if task_id is not None:
+            rows = self.db.execute(
+                'SELECT * FROM history WHERE id = ? ORDER BY rowid DESC LIMIT ?', (task_id, limit))
+        else:
+            rows = self.db.execute('SELECT * FROM history ORDER BY rowid DESC LIMIT ?', (limit,))
+        return [dict(row) for row in rows]
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+"""
+Todo Parser - Single-pass parser for terminal todo checklists
+
+Shared by the task tracker and the Kanban server so that both read
+`todo/terminal-N.md` files the same way.
+"""
+
+import hashlib
+import re
+from typing import Iterable, Iterator, NamedTuple
+
+TASK_PATTERN = re.compile(r'([ \t]*)- \[([ xX])\][ \t]*(.*)')
+
+# Unchecked tasks under headings with these words are in progress, others
+# are pending
+IN_PROGRESS_SECTION_WORDS = ('current', 'working', 'in progress')
+
+class TodoTask(NamedTuple):
+    """One checklist item"""
+    id: str         # Stable across checkbox changes; see iter_tasks()
+    text: str
+    section: str    # Nearest heading above the task
+    line: int       # 1-based line number
+    indent: int
+    state: str      # 'completed', 'in_progress' or 'pending'
+
+def iter_tasks(lines: Iterable[str]) -> Iterator[TodoTask]:
+    """Yield the tasks of a todo file from its lines, in order
+    
+    A task's id hashes its section and text, so it does not change with its
+    checkbox; identical tasks within one section are told apart by
+    occurrence.
+    """
+    
+    # Hot loop: records are built with tuple.__new__ to skip NamedTuple's
+    # Python-level constructor
+    match_task = TASK_PATTERN.match
+    md5 = hashlib.md5
+    new_record = tuple.__new__
+    section = ''
+    open_state = 'pending'
+    seen_ids = {}
+    
+    for line_number, line in enumerate(lines, 1):
+        if line.startswith('#'):
+            section = line.strip('#').strip()
+            open_state = section_state(section)
+            continue
+        
+        match = match_task(line)
+        if match:
+            indent, mark, text = match.groups()
+            text = text.rstrip()
+            
+            base = md5(f"{section}:{text}".encode()).hexdigest()[:8]
+            occurrence = seen_ids.get(base, 0)
+            seen_ids[base] = occurrence + 1
+            
+            yield new_record(TodoTask, (
+                base if occurrence == 0 else f"{base}-{occurrence}",
+                text, section, line_number, len(indent),
+                open_state if mark == ' ' else 'completed'
+            ))
+
+def parse_file(file_path) -> Iterator[TodoTask]:
+    """Yield the tasks of a todo file, reading it line by line"""
+    
+    with open(file_path, 'r') as f:
+        yield from iter_tasks(f)
+
+def section_state(section: str) -> str:
+    """State of the unchecked tasks under a section heading"""
+    
+    section = section.lower()
+    if any(word in section for word in IN_PROGRESS_SECTION_WORDS):
+        return 'in_progress'
+    return 'pending'
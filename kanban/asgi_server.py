@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+
+"""
+Swarm Kanban ASGI Server - asyncio serving mode for the Kanban server
+
+Serves the same routes and Socket.IO events as server.py from one event
+loop, so idle WebSocket and SSE connections cost memory but no thread.
+File parsing and other blocking work runs on a bounded thread pool.
+
+Usage: python3 asgi_server.py [project_path]
+"""
+
+import asyncio
+import json
+import mimetypes
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import parse_qs
+
+import socketio
+from werkzeug.security import safe_join
+
+import server
+
+KANBAN_DIR = Path(__file__).parent
+
+# Threads available for parsing project files and other blocking calls
+PARSE_WORKERS = int(os.environ.get('KANBAN_PARSE_WORKERS', '4'))
+
+parse_executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix='kanban-parse')
+sio = socketio.AsyncServer(async_mode='asgi', cors_allowed_origins='*')
+event_loop = None
+
+async def blocking(func, *args):
+    """Run a blocking call on the parse executor"""
+    return await asyncio.get_running_loop().run_in_executor(parse_executor, func, *args)
+
+def emit_threadsafe(event, payload, room):
+    """Emit to a Socket.IO room from a watcher or executor thread"""
+    asyncio.run_coroutine_threadsafe(sio.emit(event, payload, room=room), event_loop)
+
+class HTTPRequest:
+    """The parts of an ASGI HTTP request the routes use"""
+    
+    def __init__(self, scope):
+        self.method = scope['method']
+        self.path = scope['path']
+        self.query_string = scope.get('query_string', b'')
+        self.args = {key: values[0] for key, values in parse_qs(self.query_string.decode()).items()}
+        self.headers = {key.decode().lower(): value.decode() for key, value in scope['headers']}
+    
+    def matches_etag(self, etag):
+        return server.etag_matches(self.headers.get('if-none-match'), etag)
+    
+    def accepts_gzip(self):
+        return 'gzip' in self.headers.get('accept-encoding', '')
+
+def without_body(send):
+    """send for a HEAD request: the headers of the GET response, no body"""
+    
+    async def send_head(message):
+        if message['type'] == 'http.response.body':
+            message = dict(message, body=b'')
+        await send(message)
+    return send_head
+
+async def respond(send, status, body=b'', content_type='application/json', headers=None):
+    """Send a complete HTTP response"""
+    
+    if isinstance(body, str):
+        body = body.encode()
+    headers = dict(headers or {})
+    if content_type:
+        headers['Content-Type'] = content_type
+    headers['Content-Length'] = str(len(body))
+    
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(key.encode(), value.encode()) for key, value in headers.items()]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+async def respond_json(send, payload, status=200):
+    await respond(send, status, json.dumps(payload))
+
+async def respond_not_modified(send, etag):
+    await respond(send, 304, content_type=None, headers={'ETag': f'"{etag}"'})
+
+async def respond_encoded(request, send, encoded, headers=None):
+    """Serve an EncodedJSON with its ETag, gzipped when worthwhile"""
+    
+    if request.matches_etag(encoded.etag):
+        await respond_not_modified(send, encoded.etag)
+        return
+    
+    body = encoded.body
+    headers = dict(headers or {}, ETag=f'"{encoded.etag}"', Vary='Accept-Encoding')
+    if len(body) >= server.GZIP_MIN_BYTES and request.accepts_gzip():
+        body = await blocking(encoded.gzipped)
+        headers['Content-Encoding'] = 'gzip'
+    
+    await respond(send, 200, body, headers=headers)
+
+async def respond_file(send, path):
+    if path is None or not os.path.isfile(path):
+        await respond_json(send, {'error': 'Not found'}, 404)
+        return
+    
+    body = await blocking(Path(path).read_bytes)
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    await respond(send, 200, body, content_type)
+
+async def index(request, send, receive):
+    """Main kanban board page"""
+    await respond_file(send, str(KANBAN_DIR / 'kanban-react.html'))
+
+async def send_static(request, send, receive, path):
+    """Serve static files"""
+    await respond_file(send, safe_join(str(KANBAN_DIR / 'static'), path))
+
+async def get_status(request, send, receive):
+    """Get project status, for ?project=<name> or the default project"""
+    
+    project_name = request.args.get('project')
+    model = await blocking(server.get_project_state, project_name)
+    if model is None:
+        if project_name:
+            await respond_json(send, {'error': 'Project not found'}, 404)
+        else:
+            await respond_json(send, await blocking(server.parse_project_status))
+        return
+    
+    # While the watcher runs, the version is current without reparsing
+    await blocking(server.ensure_current, model)
+    
+    if request.matches_etag(model.etag()):
+        await respond_not_modified(send, model.etag())
+        return
+    await respond_encoded(request, send, await blocking(model.encoded))
+
+async def stream_status(request, send, receive):
+    """Stream a project's status as Server-Sent Events, see server.StatusStream"""
+    
+    model = await blocking(server.get_project_state, request.args.get('project'))
+    if model is None:
+        await respond_json(send, {'error': 'Project not found'}, 404)
+        return
+    
+    headers = {'Content-Type': 'text/event-stream; charset=utf-8', **server.SSE_HEADERS}
+    if request.method == 'HEAD':
+        await respond(send, 200, content_type=None, headers=headers)
+        return
+    
+    stream = server.StatusStream(model, request.headers.get('last-event-id'))
+    subscriber = server.stream_broker.subscribe(model.name, asyncio.get_running_loop())
+    disconnected = asyncio.Event()
+    
+    async def watch_disconnect():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+        disconnected.set()
+        subscriber.wake()
+    
+    watcher = asyncio.create_task(watch_disconnect())
+    
+    async def send_frames(data):
+        if data:
+            await send({'type': 'http.response.body', 'body': data.encode(), 'more_body': True})
+    
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [(key.lower().encode(), value.encode()) for key, value in headers.items()]
+        })
+        
+        await send_frames(await blocking(stream.opening))
+        while not disconnected.is_set():
+            frames, overflowed = await subscriber.get_async(server.HEARTBEAT_SECONDS)
+            if disconnected.is_set():
+                break
+            await send_frames(stream.next_frames(frames, overflowed))
+    finally:
+        watcher.cancel()
+        server.stream_broker.unsubscribe(subscriber)
+
+async def get_history(request, send, receive):
+    """Get a project's status history for burn-up and throughput charts"""
+    
+    model = await blocking(server.get_project_state, request.args.get('project'))
+    if model is None:
+        await respond_json(send, {'error': 'Project not found'}, 404)
+        return
+    
+    try:
+        encoded = await blocking(server.history_body, model, request.args)
+    except ValueError as e:
+        await respond_json(send, {'error': str(e)}, 400)
+        return
+    
+    await respond_encoded(request, send, encoded)
+
+async def get_tasks(request, send, receive):
+    """Get a page of a project's tasks, with the filters of server.py"""
+    
+    model = await blocking(server.get_project_state, request.args.get('project'))
+    if model is None:
+        await respond_json(send, {'error': 'Project not found'}, 404)
+        return
+    
+    index = await blocking(model.task_index)
+    etag = server.query_etag('tasks', f'{model.name}-{index.version}', request.query_string)
+    if request.matches_etag(etag):
+        await respond_not_modified(send, etag)
+        return
+    
+    try:
+        encoded, total = server.tasks_page(index, request.args, etag)
+    except ValueError as e:
+        await respond_json(send, {'error': str(e)}, 400)
+        return
+    
+    await respond_encoded(request, send, encoded, headers={'X-Total-Count': str(total)})
+
+async def get_metrics(request, send, receive):
+    """Prometheus metrics"""
+    await respond(send, 200, server.metrics.render(), 'text/plain; version=0.0.4')
+
+async def get_stats(request, send, receive):
+    """Get watcher pipeline counters and per-project subscribers"""
+    await respond_json(send, server.server_stats())
+
+async def get_projects(request, send, receive):
+    """Get list of available projects, with q, status, offset and limit"""
+    
+    index = server.project_index
+    await blocking(index.refresh)
+    etag = server.query_etag('projects', index.version, request.query_string)
+    if request.matches_etag(etag):
+        await respond_not_modified(send, etag)
+        return
+    
+    try:
+        encoded, total = server.projects_page(index, request.args, etag)
+    except ValueError as e:
+        await respond_json(send, {'error': str(e)}, 400)
+        return
+    
+    await respond_encoded(request, send, encoded, headers={'X-Total-Count': str(total)})
+
+async def load_project(request, send, receive, project_name):
+    """Load a specific project and start watching it"""
+    
+    model = await blocking(server.get_project_state, project_name)
+    if model is None:
+        await respond_json(send, {'error': 'Project not found'}, 404)
+        return
+    
+    if not server.current_project:
+        server.current_project = model.project_path
+    
+    await respond_json(send, {'success': True, 'project': project_name})
+
+ROUTES = [
+    (re.compile(r'/$'), index),
+    (re.compile(r'/api/status$'), get_status),
+    (re.compile(r'/api/stream$'), stream_status),
+    (re.compile(r'/api/history$'), get_history),
+    (re.compile(r'/api/tasks$'), get_tasks),
+    (re.compile(r'/metrics$'), get_metrics),
+    (re.compile(r'/api/stats$'), get_stats),
+    (re.compile(r'/api/projects$'), get_projects),
+    (re.compile(r'/api/project/([^/]+)$'), load_project),
+    (re.compile(r'/static/(.+)$'), send_static),
+]
+
+async def http_app(scope, receive, send):
+    """ASGI app for every request that is not Socket.IO"""
+    
+    if scope['type'] != 'http':
+        return
+    
+    request = HTTPRequest(scope)
+    for pattern, handler in ROUTES:
+        match = pattern.match(request.path)
+        if match:
+            if scope['method'] not in ('GET', 'HEAD'):
+                await respond_json(send, {'error': 'Method not allowed'}, 405)
+                return
+            if scope['method'] == 'HEAD':
+                send = without_body(send)
+            await handler(request, send, receive, *match.groups())
+            return
+    
+    await respond_json(send, {'error': 'Not found'}, 404)
+
+async def subscribe_client(sid, project_name):
+    """Move a client into a project's room"""
+    
+    previous = server.client_projects.get(sid)
+    if previous and previous != project_name:
+        sio.leave_room(sid, previous)
+    
+    sio.enter_room(sid, project_name)
+    server.client_projects[sid] = project_name
+    
+    if previous != project_name:
+        server.project_subscribers[project_name] = server.project_subscribers.get(project_name, 0) + 1
+        if previous:
+            server.unsubscribe_count(previous)
+
+async def emit_status(sid, model):
+    """Send a project's full status to one client"""
+    
+    await sio.emit('status_update', await blocking(server.current_status, model.name), to=sid)
+    server.EMITS.inc()
+    server.EMIT_BYTES.inc(len((await blocking(model.encoded)).body))
+
+@sio.on('connect')
+async def handle_connect(sid, environ):
+    """Handle client connection, following the default project"""
+    if server.current_project:
+        model = await blocking(server.get_project_state)
+        await subscribe_client(sid, model.name)
+        await emit_status(sid, model)
+
+@sio.on('disconnect')
+async def handle_disconnect(sid):
+    """Handle client disconnection"""
+    project_name = server.client_projects.pop(sid, None)
+    if project_name:
+        server.unsubscribe_count(project_name)
+
+@sio.on('subscribe')
+async def handle_subscribe(sid, data):
+    """Follow a single project's updates"""
+    
+    model = await blocking(server.get_project_state, (data or {}).get('project'))
+    if model is None:
+        await sio.emit('status_update', {'error': 'Project not found'}, to=sid)
+        return
+    
+    await subscribe_client(sid, model.name)
+    await emit_status(sid, model)
+
+@sio.on('request_update')
+async def handle_update_request(sid):
+    """Handle manual update request, also used by clients to resync"""
+    
+    model = await blocking(server.get_project_state, server.client_projects.get(sid))
+    if model is None:
+        await sio.emit('status_update', await blocking(server.parse_project_status), to=sid)
+        return
+    await emit_status(sid, model)
+
+async def heartbeat_loop():
+    """Send each subscribed project's room a keep-alive, as server.py does"""
+    
+    while True:
+        await asyncio.sleep(server.HEARTBEAT_SECONDS)
+        await blocking(server.send_heartbeats,
+                       lambda project_name, beat: emit_threadsafe('heartbeat', beat, project_name))
+
+async def startup():
+    global event_loop
+    
+    event_loop = asyncio.get_running_loop()
+    server.status_listeners.append(
+        lambda model, event, payload: emit_threadsafe(event, payload, model.name))
+    asyncio.create_task(heartbeat_loop())
+
+app = socketio.ASGIApp(sio, other_asgi_app=http_app, on_startup=startup)
+
+def main():
+    """Main entry point"""
+    
+    try:
+        import uvicorn
+    except ImportError:
+        print("The ASGI server needs uvicorn: pip install 'uvicorn[standard]'")
+        sys.exit(1)
+    
+    if len(sys.argv) > 1:
+        server.current_project = server.load_project_state(sys.argv[1]).project_path
+    
+    port = int(os.environ.get('KANBAN_PORT', '5555'))
+    
+    print("=" * 60)
+    print("  Swarm Kanban Server (ASGI)")
+    print("=" * 60)
+    print(f"  Running on: http://localhost:{port}")
+    print("  Press Ctrl+C to stop")
+    print("=" * 60)
+    
+    uvicorn.run(app, host='0.0.0.0', port=port, log_level='warning')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+
+"""
+Status Bus - Local pub/sub between the kanban hub and its web workers
+
+The hub process watches and parses projects and publishes status events;
+worker processes serve clients from what they receive. Messages are
+newline-delimited JSON over a Unix socket.
+"""
+
+import json
+import os
+import queue
+import socket
+import threading
+import time
+
+# Messages buffered per worker before the oldest are dropped; a worker that
+# loses messages notices the version gap and asks for a resync
+BUS_QUEUE_SIZE = 4096
+
+def encode(message):
+    return (json.dumps(message, separators=(',', ':')) + '\n').encode()
+
+class WorkerConnection:
+    """Hub side of one worker connection with a bounded send queue"""
+    
+    def __init__(self, sock, on_request, on_close):
+        self.sock = sock
+        self.on_request = on_request
+        self.on_close = on_close
+        self.outbox = queue.Queue(maxsize=BUS_QUEUE_SIZE)
+        self.dropped = 0
+        self.closed = False
+        self.close_lock = threading.Lock()
+    
+    def start(self):
+        threading.Thread(target=self._write_loop, daemon=True).start()
+        threading.Thread(target=self._read_loop, daemon=True).start()
+    
+    def send(self, data):
+        while not self.closed:
+            try:
+                self.outbox.put_nowait(data)
+                return
+            except queue.Full:
+                try:
+                    self.outbox.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+    
+    def close(self):
+        """Close the connection; never blocks, even with a full queue"""
+        
+        with self.close_lock:
+            if self.closed:
+                return
+            self.closed = True
+        
+        # Queued messages will not be sent now; make room for the sentinel
+        # that stops the writer
+        while True:
+            try:
+                self.outbox.put_nowait(None)
+                break
+            except queue.Full:
+                try:
+                    self.outbox.get_nowait()
+                except queue.Empty:
+                    pass
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+        self.on_close(self)
+    
+    def _write_loop(self):
+        while True:
+            data = self.outbox.get()
+            if data is None or self.closed:
+                return
+            try:
+                self.sock.sendall(data)
+            except OSError:
+                self.close()
+                return
+    
+    def _read_loop(self):
+        try:
+            for line in self.sock.makefile('rb'):
+                try:
+                    self.on_request(self, json.loads(line))
+                except ValueError:
+                    continue
+        except OSError:
+            pass
+        self.close()
+
+class BusBroker:
+    """Hub side of the bus: accepts workers and fans messages out to them
+    
+    on_request(connection, message) is called for messages from workers.
+    """
+    
+    def __init__(self, path, on_request):
+        self.path = path
+        self.on_request = on_request
+        self.lock = threading.Lock()
+        self.connections = set()
+        self.messages_published = 0
+    
+    def start(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.path)
+        server.listen(64)
+        threading.Thread(target=self._accept_loop, args=(server,), daemon=True).start()
+    
+    def _accept_loop(self, server):
+        while True:
+            sock, _ = server.accept()
+            connection = WorkerConnection(sock, self.on_request, self._remove)
+            # Registered before its threads start, so that a worker that
+            # disconnects at once is removed again rather than left behind
+            with self.lock:
+                self.connections.add(connection)
+            connection.start()
+    
+    def _remove(self, connection):
+        with self.lock:
+            self.connections.discard(connection)
+    
+    def publish(self, message, connection=None):
+        """Send a message to every worker, or only to one connection"""
+        
+        data = encode(message)
+        if connection is not None:
+            connection.send(data)
+            return
+        
+        with self.lock:
+            connections = list(self.connections)
+        for connection in connections:
+            connection.send(data)
+        self.messages_published += 1
+    
+    def stats(self):
+        with self.lock:
+            return {
+                'workers': len(self.connections),
+                'messages_published': self.messages_published,
+                'dropped': sum(c.dropped for c in self.connections)
+            }
+
+class BusClient:
+    """Worker side of the bus
+    
+    Calls on_message(message) for every message from the hub, and
+    on_connect() after each (re)connection so the worker can resubscribe.
+    """
+    
+    def __init__(self, path, on_message, on_connect):
+        self.path = path
+        self.on_message = on_message
+        self.on_connect = on_connect
+        self.sock = None
+        self.send_lock = threading.Lock()
+        self.connected = threading.Event()
+    
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+    
+    def send(self, message):
+        """Send a request to the hub; dropped while disconnected"""
+        
+        if not self.connected.wait(5):
+            return
+        try:
+            with self.send_lock:
+                self.sock.sendall(encode(message))
+        except OSError:
+            pass
+    
+    def _run(self):
+        while True:
+            try:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.connect(self.path)
+            except OSError:
+                time.sleep(0.5)
+                continue
+            
+            self.sock = sock
+            self.connected.set()
+            self.on_connect()
+            
+            try:
+                for line in sock.makefile('rb'):
+                    try:
+                        message = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.on_message(message)
+            except OSError:
+                pass
+            
+            self.connected.clear()
+            sock.close()
+            time.sleep(0.5)
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+
+"""
+Status History - Compact time series of project status for the Kanban server
+"""
+
+import json
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from pathlib import Path
+
+HISTORY_FILE = 'status-history.jsonl'
+
+# Seconds between batched writes of recorded samples
+HISTORY_FLUSH_SECONDS = float(os.environ.get('KANBAN_HISTORY_FLUSH_SECONDS', '5'))
+
+# Ring buffer tiers: (name, bucket seconds, capacity). Every sample goes into
+# each tier; coarser tiers keep only the last sample per bucket.
+TIERS = (
+    ('raw', 0, 2000),
+    ('minute', 60, 24 * 60),
+    ('hour', 3600, 90 * 24),
+)
+
+_histories = weakref.WeakSet()
+_flusher = None
+_flusher_lock = threading.Lock()
+
+def make_sample(status, timestamp=None):
+    """Reduce a status snapshot to a compact sample
+    
+    Terminals map to [progress, completed tasks, total tasks].
+    """
+    
+    terminals = {}
+    for tid, terminal in status.get('terminals', {}).items():
+        counts = terminal.get('task_counts') or {}
+        terminals[tid] = [
+            terminal.get('progress', 0),
+            counts.get('completed', 0),
+            counts.get('total', 0)
+        ]
+    
+    return {
+        't': int(timestamp if timestamp is not None else time.time()),
+        'phase': status.get('phase', {}).get('current'),
+        'overall': status.get('overall_progress', 0),
+        'terminals': terminals
+    }
+
+def throughput(samples):
+    """Tasks completed per hour, from increases in completed counts
+    
+    Returns (hourly buckets, overall rate over the sample span).
+    """
+    
+    buckets = {}
+    completed_total = 0
+    previous = None
+    for sample in samples:
+        if previous is not None:
+            completed = 0
+            for tid, values in sample['terminals'].items():
+                before = previous['terminals'].get(tid)
+                if before and values[1] > before[1]:
+                    completed += values[1] - before[1]
+            if completed:
+                hour = sample['t'] - sample['t'] % 3600
+                buckets[hour] = buckets.get(hour, 0) + completed
+                completed_total += completed
+        previous = sample
+    
+    hourly = [{'hour': hour, 'completed': count} for hour, count in sorted(buckets.items())]
+    
+    span_hours = (samples[-1]['t'] - samples[0]['t']) / 3600 if len(samples) > 1 else 0
+    rate = completed_total / span_hours if span_hours > 0 else 0
+    return hourly, round(rate, 2)
+
+def empty_tiers():
+    return {name: deque(maxlen=capacity) for name, _, capacity in TIERS}
+
+class StatusHistory:
+    """Ring-buffered status time series persisted in coordination/
+    
+    Samples are appended to an on-disk log in batches by a shared
+    background thread, so recording only costs an in-memory append. The log
+    is compacted from the downsampled tiers once it grows past twice the
+    size the last compaction left, and at least twice the raw tier's
+    capacity, so that full coarse tiers do not make every flush a rewrite.
+    """
+    
+    def __init__(self, coordination_dir):
+        self.path = Path(coordination_dir) / HISTORY_FILE
+        self.lock = threading.Lock()
+        self.tiers = empty_tiers()
+        self.pending = []
+        self.log_lines = 0
+        # Lines the last compaction kept, up to all three tiers' worth
+        self.compacted_lines = 0
+        self.log_id = None
+        self.log_offset = 0
+        self._load()
+        self._register()
+    
+    def _register(self):
+        _register(self)
+    
+    def _load(self):
+        """Add the samples written to the log since it was last read"""
+        
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return
+        
+        with f:
+            stat = os.fstat(f.fileno())
+            if (stat.st_dev, stat.st_ino) != self.log_id or stat.st_size < self.log_offset:
+                # First read, or the log was compacted into a new file
+                if self.log_id is not None:
+                    self.tiers = empty_tiers()
+                self.log_id = (stat.st_dev, stat.st_ino)
+                self.log_offset = 0
+                self.log_lines = 0
+            f.seek(self.log_offset)
+            data = f.read()
+        
+        # A torn last line may be still being written; it is read next time
+        end = data.rfind(b'\n') + 1
+        for line in data[:end].splitlines():
+            try:
+                self._add(json.loads(line))
+            except (ValueError, KeyError, TypeError):
+                # Torn line from an interrupted write
+                continue
+            self.log_lines += 1
+        self.log_offset += end
+    
+    def _add(self, sample):
+        for name, bucket_seconds, _ in TIERS:
+            tier = self.tiers[name]
+            if (bucket_seconds and tier
+                    and tier[-1]['t'] // bucket_seconds == sample['t'] // bucket_seconds):
+                tier[-1] = sample
+            else:
+                tier.append(sample)
+    
+    def record(self, status):
+        """Record a status snapshot"""
+        
+        if 'error' in status:
+            return
+        
+        sample = make_sample(status)
+        with self.lock:
+            last = self.tiers['raw'][-1] if self.tiers['raw'] else None
+            if last and {**last, 't': sample['t']} == sample:
+                return
+            self._add(sample)
+            self.pending.append(sample)
+    
+    def flush(self):
+        """Write pending samples to disk"""
+        
+        with self.lock:
+            if not self.pending:
+                return
+            pending = self.pending
+            self.pending = []
+            compact = self.log_lines + len(pending) > 2 * max(self.compacted_lines, TIERS[0][2])
+            if compact:
+                samples = self._compacted()
+        
+        if not self.path.parent.exists():
+            return
+        
+        if compact:
+            tmp_path = self.path.with_name(f'.{HISTORY_FILE}.tmp')
+            with open(tmp_path, 'w') as f:
+                f.writelines(json.dumps(s, separators=(',', ':')) + '\n' for s in samples)
+            os.replace(tmp_path, self.path)
+            self.log_lines = len(samples)
+            self.compacted_lines = len(samples)
+        else:
+            with open(self.path, 'a') as f:
+                f.writelines(json.dumps(s, separators=(',', ':')) + '\n' for s in pending)
+            self.log_lines += len(pending)
+    
+    def _compacted(self):
+        """All retained samples, oldest first, at the finest resolution held"""
+        
+        samples = list(self.tiers[TIERS[0][0]])
+        for name, _, _ in TIERS[1:]:
+            start = samples[0]['t'] if samples else None
+            samples = [s for s in self.tiers[name] if start is None or s['t'] < start] + samples
+        return samples
+    
+    def query(self, since=None, until=None, resolution='auto'):
+        """Return (resolution, samples) for a time range
+        
+        With resolution 'auto' the finest tier that covers `since` is used.
+        """
+        
+        with self.lock:
+            if resolution == 'auto':
+                resolution = TIERS[-1][0]
+                for name, _, _ in TIERS:
+                    tier = self.tiers[name]
+                    if tier and (len(tier) < tier.maxlen
+                                 or since is not None and tier[0]['t'] <= since):
+                        resolution = name
+                        break
+            samples = list(self.tiers[resolution])
+        
+        if since is not None:
+            samples = [s for s in samples if s['t'] >= since]
+        if until is not None:
+            samples = [s for s in samples if s['t'] <= until]
+        return resolution, samples
+
+class FollowedStatusHistory(StatusHistory):
+    """Read-only view of a StatusHistory that another process records
+    
+    Each query first reads what was appended to the log since the last
+    one, rather than the whole log.
+    """
+    
+    def _register(self):
+        # Nothing is recorded here, so there is nothing to flush
+        pass
+    
+    def record(self, status):
+        raise RuntimeError(f'{self.path} is recorded by another process')
+    
+    def query(self, since=None, until=None, resolution='auto'):
+        with self.lock:
+            self._load()
+        return super().query(since, until, resolution)
+
+def _register(history):
+    global _flusher
+    
+    _histories.add(history)
+    with _flusher_lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=_flush_loop, daemon=True)
+            _flusher.start()
+
+def _flush_loop():
+    while True:
+        time.sleep(HISTORY_FLUSH_SECONDS)
+        for history in list(_histories):
+            try:
+                history.flush()
+            except OSError as e:
+                print(f'History write failed: {e}')
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+"""
+Metrics - Minimal in-process registry rendered in Prometheus text format
+"""
+
+import functools
+import threading
+from bisect import bisect_left
+from time import perf_counter
+
+# Default histogram buckets in seconds, tuned for file parsing
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+class Counter:
+    """Monotonic counter"""
+    
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+        self.lock = threading.Lock()
+    
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+    
+    def render(self):
+        return [f'{self.name} {self.value}']
+
+class Histogram:
+    """Histogram over fixed buckets
+    
+    Bucket counts live in a preallocated list, so observing a value only
+    increments existing slots.
+    """
+    
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.lock = threading.Lock()
+    
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+    
+    def timed(self, func):
+        """Decorator observing the duration of each call"""
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.observe(perf_counter() - start)
+        return wrapper
+    
+    def render(self):
+        with self.lock:
+            counts = list(self.counts)
+            total = self.sum
+        
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{bound}"}} {cumulative}')
+        cumulative += counts[-1]
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {cumulative}')
+        lines.append(f'{self.name}_sum {total}')
+        lines.append(f'{self.name}_count {cumulative}')
+        return lines
+
+class Collected:
+    """Metric whose value is read from a callback at scrape time
+    
+    The callback returns a number, or a dict of {label value: number} which
+    is rendered with the metric's label name.
+    """
+    
+    def __init__(self, name, help_text, metric_type, callback, label=None):
+        self.name = name
+        self.help = help_text
+        self.type = metric_type
+        self.callback = callback
+        self.label = label
+    
+    def render(self):
+        value = self.callback()
+        if not isinstance(value, dict):
+            return [f'{self.name} {value}']
+        return [f'{self.name}{{{self.label}="{escape_label(key)}"}} {count}'
+                for key, count in sorted(value.items())]
+
+def escape_label(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+class MetricsRegistry:
+    """Holds metrics and renders them for a /metrics scrape"""
+    
+    def __init__(self):
+        self.metrics = []
+    
+    def counter(self, name, help_text):
+        return self._add(Counter(name, help_text))
+    
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        return self._add(Histogram(name, help_text, buckets))
+    
+    def collected(self, name, help_text, metric_type, callback, label=None):
+        return self._add(Collected(name, help_text, metric_type, callback, label))
+    
+    def _add(self, metric):
+        self.metrics.append(metric)
+        return metric
+    
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            metric_type = getattr(metric, 'type', None) or type(metric).__name__.lower()
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric_type}')
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
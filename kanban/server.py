@@ -4,95 +4,266 @@
 Swarm Kanban Server - Real-time monitoring interface for swarm agents
 """
 
-from flask import Flask, render_template, jsonify, send_from_directory
-from flask_socketio import SocketIO, emit
+from flask import Flask, Response, render_template, jsonify, request, send_from_directory
+from flask_socketio import SocketIO, emit, join_room, leave_room
+import gzip
+import hashlib
 import json
 import os
+import signal
+import subprocess
+import sys
+import base64
+from bisect import bisect_right
 from pathlib import Path
 from datetime import datetime
 import threading
 import time
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
+from bus import BusBroker, BusClient
+from history import TIERS, FollowedStatusHistory, StatusHistory, throughput
+from metrics import MetricsRegistry
+from sse import StreamBroker, format_event
+
+# The todo parser and config reader are shared with the tools in bin/
+sys.path.insert(0, str(Path(__file__).parent.parent / 'bin'))
+import swarm_config
+import todo_parser
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'swarm-kanban-secret-key'
 socketio = SocketIO(app, cors_allowed_origins="*")
 
+SWARM_HOME = Path(__file__).parent.parent
+PROJECTS_DIR = Path(os.environ.get('KANBAN_PROJECTS_DIR', SWARM_HOME / 'projects'))
+
 # Global state
-current_project = None
-file_observer = None
+current_project = None   # Default project for clients that have not subscribed
+file_observer = None     # Shared observer for every watched project
+
+# Watched projects: project name -> StatusModel
+watched_projects = {}
+project_watches = {}
+watched_projects_lock = threading.Lock()
+
+# Socket.IO session id -> subscribed project name, and clients per project
+client_projects = {}
+project_subscribers = {}
+
+# Multi-process mode: the hub watches and parses projects and publishes
+# status events over a local bus to KANBAN_WORKERS worker processes, which
+# only serve clients
+WORKERS = int(os.environ.get('KANBAN_WORKERS', '1'))
+ROLE = os.environ.get('KANBAN_ROLE', 'hub')
+
+# Part of every ETag, as versions start over when the server restarts;
+# workers share the hub's so that their ETags agree
+BOOT_ID = os.environ.get('KANBAN_BOOT_ID') or os.urandom(4).hex()
+bus_broker = None   # Hub side of the bus, when workers are running
+bus_client = None   # Worker side of the bus
+
+# Callbacks (model, event, payload) run for every status event sent to
+# clients; the ASGI server uses this to reach its own Socket.IO clients
+status_listeners = []
+
+metrics = MetricsRegistry()
+PARSE_STATUS_SECONDS = metrics.histogram(
+    'kanban_parse_project_status_seconds', 'Time spent in parse_project_status')
+PARSE_TODO_SECONDS = metrics.histogram(
+    'kanban_parse_todo_file_seconds', 'Time spent parsing one todo file')
+PARSE_CACHE_HITS = metrics.counter(
+    'kanban_parse_cache_hits_total', 'File parses answered from the parse cache')
+PARSE_CACHE_MISSES = metrics.counter(
+    'kanban_parse_cache_misses_total', 'File parses that had to read the file')
+EMITS = metrics.counter(
+    'kanban_emits_total', 'Events sent to Socket.IO and SSE clients')
+EMIT_BYTES = metrics.counter(
+    'kanban_emit_bytes_total', 'Bytes of event payloads sent to Socket.IO and SSE clients')
+
+# Per-file parse cache: path -> (mtime_ns, size, parsed_at_ns, result)
+_parse_cache = {}
+_parse_cache_lock = threading.Lock()
+
+# Files modified this recently may still change without moving mtime on
+# coarse-grained filesystems, so their cache entries are not trusted yet
+RACY_WINDOW_NS = 2_000_000_000
+
+# Watcher events arriving within this window are handled as one update
+DEBOUNCE_SECONDS = float(os.environ.get('KANBAN_DEBOUNCE_SECONDS', '0.25'))
+
+# Interval between keep-alive heartbeats sent to clients
+HEARTBEAT_SECONDS = float(os.environ.get('KANBAN_HEARTBEAT_SECONDS', '5'))
+
+# JSON responses larger than this are gzipped for clients that accept it
+GZIP_MIN_BYTES = 1024
+
+# Default and maximum page size of /api/tasks
+TASK_PAGE_SIZE = 50
+TASK_PAGE_MAX = 500
+
+# The project index rechecks swarm.config files at most this often unless
+# the watcher on projects/ reports a change first
+PROJECT_INDEX_TTL_SECONDS = float(os.environ.get('KANBAN_PROJECT_INDEX_TTL_SECONDS', '10'))
+
+class UpdateCoalescer:
+    """Coalesces bursts of watcher events into a single update
+    
+    The first event of a burst starts a window of `window` seconds; events
+    arriving in that window are deduplicated and handled by one call to
+    `callback(keys)` on a background worker thread.
+    """
+    
+    def __init__(self, callback, window=DEBOUNCE_SECONDS):
+        self.callback = callback
+        self.window = window
+        self.pending = set()
+        self.condition = threading.Condition()
+        self.thread = None
+        
+        # Counters
+        self.events_received = 0
+        self.events_coalesced = 0
+        self.flushes = 0
+        self._burst_events = 0
+    
+    def submit(self, key):
+        """Queue a changed (project, path) key"""
+        
+        with self.condition:
+            self.events_received += 1
+            self._burst_events += 1
+            self.pending.add(key)
+            
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+            
+            self.condition.notify()
+    
+    def stats(self):
+        """Return the pipeline counters"""
+        
+        with self.condition:
+            return {
+                'events_received': self.events_received,
+                'events_coalesced': self.events_coalesced,
+                'flushes': self.flushes,
+                'pending': len(self.pending),
+                'window_seconds': self.window
+            }
+    
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+            
+            # Let the rest of the burst arrive
+            time.sleep(self.window)
+            
+            with self.condition:
+                keys = self.pending
+                self.pending = set()
+                self.events_coalesced += self._burst_events - 1
+                self._burst_events = 0
+                self.flushes += 1
+            
+            try:
+                self.callback(keys)
+            except Exception as e:
+                print(f'Update failed: {e}')
+
+WATCHED_EVENT_TYPES = {'created', 'modified', 'moved', 'deleted'}
 
 class TodoFileHandler(FileSystemEventHandler):
-    """Watches todo files for changes"""
+    """Watches a project's todo and coordination files for changes"""
     
-    def on_modified(self, event):
-        if event.src_path.endswith('.md'):
-            # Parse and emit updated data
-            update_data = parse_project_status()
-            socketio.emit('status_update', update_data)
+    def __init__(self, project_name):
+        super().__init__()
+        self.project_name = project_name
+    
+    def on_any_event(self, event):
+        # Ignore open/close events, including our own reads
+        if event.is_directory or event.event_type not in WATCHED_EVENT_TYPES:
+            return
+        
+        # Atomic saves show up as a move onto the real file
+        path = getattr(event, 'dest_path', '') or event.src_path
+        if self.wanted(path):
+            update_pipeline.submit((self.project_name, path))
+    
+    def wanted(self, path):
+        return path.endswith(('.md', '.json'))
+
+class SwarmConfigHandler(TodoFileHandler):
+    """Watches a project's swarm.config, whose TERMINALS sets the terminals shown"""
+    
+    def wanted(self, path):
+        return os.path.basename(path) == 'swarm.config'
 
-def parse_project_status():
+@PARSE_STATUS_SECONDS.timed
+def parse_project_status(project_path=None):
     """Parse all project files to get current status"""
     
-    if not current_project:
+    project_path = project_path or current_project
+    if not project_path:
         return {'error': 'No project loaded'}
     
-    project_path = Path(current_project)
+    project_path = Path(project_path)
     status = {
         'project_name': project_path.name,
         'timestamp': datetime.now().isoformat(),
         'terminals': {},
+        'terminal_count': len(project_terminals(project_path)),
         'phase': {},
         'overall_progress': 0
     }
     
     # Parse phase status
     phase_file = project_path / 'coordination' / 'phase-status.json'
-    if phase_file.exists():
-        with open(phase_file, 'r') as f:
-            phase_data = json.load(f)
-            status['phase'] = {
-                'current': phase_data.get('current_phase', 1),
-                'name': phase_data.get(f"phase_{phase_data.get('current_phase', 1)}", {}).get('name', 'Unknown'),
-                'status': phase_data.get(f"phase_{phase_data.get('current_phase', 1)}", {}).get('status', 'UNKNOWN')
+    phase_data = cached_parse(phase_file, load_json_file)
+    if phase_data is not None:
+        status['phase'] = {
+            'current': phase_data.get('current_phase', 1),
+            'name': phase_data.get(f"phase_{phase_data.get('current_phase', 1)}", {}).get('name', 'Unknown'),
+            'status': phase_data.get(f"phase_{phase_data.get('current_phase', 1)}", {}).get('status', 'UNKNOWN')
+        }
+        
+        # Get terminal status from phase data
+        current_phase_key = f"phase_{phase_data.get('current_phase', 1)}"
+        if current_phase_key in phase_data:
+            terminals = phase_data[current_phase_key].get('terminals', {})
+            for tid, tdata in terminals.items():
+                status['terminals'][tid] = {
+                    'status': tdata.get('status', 'NOT_STARTED'),
+                    'progress': tdata.get('progress', 0),
+                    'task': tdata.get('task', 'No task assigned')
+                }
+    
+    # Parse todo files for task counts; the tasks themselves are served
+    # from the TaskIndex by /api/tasks
+    for terminal_key, tasks in load_terminal_tasks(project_path).items():
+        if terminal_key not in status['terminals']:
+            status['terminals'][terminal_key] = {
+                'status': 'NOT_STARTED',
+                'progress': 0,
+                'task': 'Loading...'
             }
-            
-            # Get terminal status from phase data
-            current_phase_key = f"phase_{phase_data.get('current_phase', 1)}"
-            if current_phase_key in phase_data:
-                terminals = phase_data[current_phase_key].get('terminals', {})
-                for tid, tdata in terminals.items():
-                    status['terminals'][tid] = {
-                        'status': tdata.get('status', 'NOT_STARTED'),
-                        'progress': tdata.get('progress', 0),
-                        'task': tdata.get('task', 'No task assigned')
-                    }
-    
-    # Parse todo files for tasks
-    todo_dir = project_path / 'todo'
-    if todo_dir.exists():
-        for terminal_num in range(1, 6):
-            terminal_file = todo_dir / f'terminal-{terminal_num}.md'
-            if terminal_file.exists():
-                tasks = parse_todo_file(terminal_file)
-                
-                terminal_key = str(terminal_num)
-                if terminal_key not in status['terminals']:
-                    status['terminals'][terminal_key] = {
-                        'status': 'NOT_STARTED',
-                        'progress': 0,
-                        'task': 'Loading...'
-                    }
-                
-                status['terminals'][terminal_key]['tasks'] = tasks
-                
-                # Calculate progress
-                total_tasks = len(tasks['all'])
-                completed_tasks = len(tasks['completed'])
-                if total_tasks > 0:
-                    calculated_progress = int((completed_tasks / total_tasks) * 100)
-                    status['terminals'][terminal_key]['progress'] = calculated_progress
+        
+        status['terminals'][terminal_key]['task_counts'] = {
+            'completed': len(tasks['completed']),
+            'in_progress': len(tasks['in_progress']),
+            'pending': len(tasks['pending']),
+            'total': len(tasks['all'])
+        }
+        
+        # Calculate progress
+        total_tasks = len(tasks['all'])
+        completed_tasks = len(tasks['completed'])
+        if total_tasks > 0:
+            calculated_progress = int((completed_tasks / total_tasks) * 100)
+            status['terminals'][terminal_key]['progress'] = calculated_progress
     
     # Calculate overall progress
     total_progress = 0
@@ -106,6 +277,66 @@ def parse_project_status():
     
     return status
 
+def load_terminal_tasks(project_path):
+    """Return terminal id -> parsed todo file for a project's terminals"""
+    
+    terminal_tasks = {}
+    todo_dir = Path(project_path) / 'todo'
+    if todo_dir.exists():
+        for terminal_num in project_terminals(project_path):
+            tasks = cached_parse(todo_dir / f'terminal-{terminal_num}.md', parse_todo_file)
+            if tasks is not None:
+                terminal_tasks[str(terminal_num)] = tasks
+    return terminal_tasks
+
+def project_terminals(project_path):
+    """Terminal numbers of a project, from TERMINALS in its swarm.config"""
+    
+    config = cached_parse(Path(project_path) / 'swarm.config', parse_swarm_config)
+    return range(1, swarm_config.terminal_count(config or {}) + 1)
+
+def cached_parse(file_path, parser):
+    """Return parser(file_path), reparsing only when the file changed
+
+    Results are keyed on the file's mtime_ns and size. Returns None if the
+    file does not exist.
+    """
+    
+    cache_key = str(file_path)
+    try:
+        stat = os.stat(cache_key)
+    except FileNotFoundError:
+        with _parse_cache_lock:
+            _parse_cache.pop(cache_key, None)
+        return None
+    
+    with _parse_cache_lock:
+        entry = _parse_cache.get(cache_key)
+    
+    if entry:
+        mtime_ns, size, parsed_at_ns, result = entry
+        if (mtime_ns == stat.st_mtime_ns and size == stat.st_size
+                and parsed_at_ns - mtime_ns > RACY_WINDOW_NS):
+            PARSE_CACHE_HITS.inc()
+            return result
+    
+    PARSE_CACHE_MISSES.inc()
+    
+    parsed_at_ns = time.time_ns()
+    result = parser(file_path)
+    
+    with _parse_cache_lock:
+        _parse_cache[cache_key] = (stat.st_mtime_ns, stat.st_size, parsed_at_ns, result)
+    
+    return result
+
+def load_json_file(file_path):
+    """Load a JSON file"""
+    
+    with open(file_path, 'r') as f:
+        return json.load(f)
+
+@PARSE_TODO_SECONDS.timed
 def parse_todo_file(file_path):
     """Parse a markdown todo file"""
     
@@ -116,65 +347,779 @@ def parse_todo_file(file_path):
         'all': []
     }
     
-    with open(file_path, 'r') as f:
-        lines = f.readlines()
+    for task in todo_parser.parse_file(file_path):
+        tasks[task.state].append({
+            'id': task.id,
+            'text': task.text,
+            'section': task.section,
+            'status': task.state,
+            'line': task.line
+        })
+        tasks['all'].append(task.text)
+    
+    return tasks
+
+# Top-level status fields a status_delta carries whole when they change
+STATUS_DELTA_KEYS = ('phase', 'overall_progress', 'terminal_count')
+
+def diff_status(old, new):
+    """Compute the changes that turn status snapshot old into new
+    
+    Returns None if nothing but the timestamp changed.
+    """
+    
+    changes = {}
+    
+    for key in STATUS_DELTA_KEYS:
+        if old.get(key) != new.get(key):
+            changes[key] = new.get(key)
+    
+    terminals = {}
+    old_terminals = old.get('terminals', {})
+    for tid, terminal in new.get('terminals', {}).items():
+        old_terminal = old_terminals.get(tid, {})
+        terminal_changes = {}
+        
+        fields = {key: value for key, value in terminal.items()
+                  if old_terminal.get(key) != value}
+        if fields:
+            terminal_changes['fields'] = fields
+        
+        if terminal_changes:
+            terminals[tid] = terminal_changes
+    
+    if terminals:
+        changes['terminals'] = terminals
     
-    current_section = ''
-    for line in lines:
-        # Track sections
-        if line.startswith('#'):
-            current_section = line.strip('#').strip()
+    removed_terminals = [tid for tid in old_terminals if tid not in new.get('terminals', {})]
+    if removed_terminals:
+        changes['removed_terminals'] = removed_terminals
+    
+    return changes or None
+
+def apply_delta(status, delta):
+    """Apply a status_delta to a snapshot, as the dashboard does"""
+    
+    status = dict(status, terminals=dict(status.get('terminals', {})))
+    
+    for key in STATUS_DELTA_KEYS:
+        if key in delta:
+            status[key] = delta[key]
+    status['timestamp'] = delta['timestamp']
+    status['version'] = delta['version']
+    
+    for tid in delta.get('removed_terminals', []):
+        status['terminals'].pop(tid, None)
+    
+    for tid, changes in delta.get('terminals', {}).items():
+        status['terminals'][tid] = dict(status['terminals'].get(tid, {}), **changes.get('fields', {}))
+    
+    return status
+
+class TaskIndex:
+    """In-memory index of one project's tasks, served by /api/tasks
+    
+    Tasks are kept in terminal and line order. The index is only rebuilt
+    when a todo file was reparsed, since the parse cache hands back the same
+    object while a file is unchanged.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sources = {}
+        self.entries = []
+        self.version = 0
+    
+    def update(self, terminal_tasks):
+        """Reindex from terminal id -> parsed todo file"""
+        
+        with self.lock:
+            if (terminal_tasks.keys() == self.sources.keys()
+                    and all(tasks is self.sources[tid] for tid, tasks in terminal_tasks.items())):
+                return
+            
+            entries = [
+                dict(task, terminal=tid)
+                for tid, tasks in terminal_tasks.items()
+                for key in ('completed', 'in_progress', 'pending')
+                for task in tasks[key]
+            ]
+            entries.sort(key=task_sort_key)
+            
+            self.sources = dict(terminal_tasks)
+            if entries != self.entries:
+                self.entries = entries
+                self.version += 1
+    
+    def query(self, terminal=None, status=None, section=None, search=None,
+              cursor=None, limit=TASK_PAGE_SIZE, offset=0):
+        """Return (total, page, next_cursor) of tasks matching the filters
+        
+        cursor is the sort key of the last task of the previous page, so
+        pages stay consistent while tasks are added or removed. offset
+        skips that many more tasks.
+        """
+        
+        entries = self.entries
+        if terminal:
+            entries = [e for e in entries if e['terminal'] == terminal]
+        if status:
+            entries = [e for e in entries if e['status'] == status]
+        if section:
+            section = section.lower()
+            entries = [e for e in entries if e['section'].lower() == section]
+        if search:
+            search = search.lower()
+            entries = [e for e in entries if search in e['text'].lower()]
+        
+        start = offset
+        if cursor is not None:
+            start += bisect_right([task_sort_key(e) for e in entries], cursor)
+        page = entries[start:start + limit]
         
-        # Parse tasks
-        if '- [x]' in line.lower() or '- [X]' in line:
-            task = line.replace('- [x]', '').replace('- [X]', '').strip()
-            tasks['completed'].append({
-                'text': task,
-                'section': current_section,
-                'status': 'completed'
+        next_cursor = None
+        if start + limit < len(entries):
+            next_cursor = encode_task_cursor(task_sort_key(page[-1]))
+        return len(entries), page, next_cursor
+
+def task_sort_key(task):
+    return int(task['terminal']), task['line']
+
+def encode_task_cursor(key):
+    return base64.urlsafe_b64encode(f'{key[0]}:{key[1]}'.encode()).decode()
+
+def decode_task_cursor(cursor):
+    """Inverse of encode_task_cursor; raises ValueError if malformed"""
+    
+    try:
+        terminal, line = base64.urlsafe_b64decode(cursor.encode()).decode().split(':')
+    except (UnicodeError, ValueError):
+        raise ValueError(f'Invalid cursor: {cursor}')
+    return int(terminal), int(line)
+
+def query_tasks(index, args):
+    """Run an /api/tasks query from its arguments
+    
+    Returns (total, page, next_cursor). Raises ValueError for a malformed
+    limit, offset or cursor.
+    """
+    
+    limit = min(max(int_arg(args, 'limit', TASK_PAGE_SIZE), 1), TASK_PAGE_MAX)
+    offset = max(int_arg(args, 'offset', 0), 0)
+    cursor = decode_task_cursor(args['cursor']) if args.get('cursor') else None
+    return index.query(terminal=args.get('terminal'), status=args.get('status'),
+                       section=args.get('section'), search=args.get('q'),
+                       cursor=cursor, limit=limit, offset=offset)
+
+def int_arg(args, name, default=None):
+    """A query argument as an int, or default if it is missing
+    
+    Raises ValueError with a message fit for the client if it is malformed.
+    """
+    
+    value = args.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an integer')
+
+class StatusModel:
+    """Versioned status of one project
+    
+    Every change bumps the version. Clients receive a full snapshot once and
+    then only deltas; a client that sees a delta whose base_version is not
+    the version it holds asks for a full snapshot again.
+    """
+    
+    history_class = StatusHistory
+    
+    def __init__(self, project_path):
+        self.project_path = str(project_path)
+        self.name = Path(project_path).name
+        self.lock = threading.Lock()
+        self.version = 0
+        self.snapshot = None
+        self._encoded = None
+        self.history = self.history_class(Path(project_path) / 'coordination')
+        self.tasks = TaskIndex()
+    
+    def refresh(self):
+        """Reparse the project and return the (event, payload) to broadcast
+        
+        Returns None if the status did not change since the last refresh.
+        """
+        
+        with self.lock:
+            status = parse_project_status(self.project_path)
+            previous = self.snapshot
+            
+            if previous is None or 'error' in previous or 'error' in status:
+                changes = status
+                event = 'status_update'
+            else:
+                changes = diff_status(previous, status)
+                if changes is None:
+                    return None
+                event = 'status_delta'
+            
+            base_version = self.version
+            self.version += 1
+            status['version'] = self.version
+            self.snapshot = status
+            self.history.record(status)
+            
+            if event == 'status_update':
+                return event, status
+            
+            changes.update({
+                'project_name': status['project_name'],
+                'timestamp': status['timestamp'],
+                'version': self.version,
+                'base_version': base_version
             })
-            tasks['all'].append(task)
-        elif '- [ ]' in line:
-            task = line.replace('- [ ]', '').strip()
-            # Check if it looks like it's being worked on
-            if any(keyword in current_section.lower() for keyword in ['current', 'working', 'in progress']):
-                tasks['in_progress'].append({
-                    'text': task,
-                    'section': current_section,
-                    'status': 'in_progress'
-                })
+            return event, changes
+    
+    def etag(self):
+        """Entity tag of the current snapshot"""
+        return f'{BOOT_ID}-{self.name}-{self.version}'
+    
+    def task_index(self):
+        """Return the project's TaskIndex, brought up to date"""
+        
+        self.tasks.update(load_terminal_tasks(self.project_path))
+        return self.tasks
+    
+    def encoded(self):
+        """Return the current snapshot as EncodedJSON, serialized once per version"""
+        
+        with self.lock:
+            if self._encoded is None or self._encoded.etag != self.etag():
+                self._encoded = EncodedJSON(self.snapshot, self.etag())
+            return self._encoded
+
+class MirroredStatusModel(StatusModel):
+    """A worker's copy of a StatusModel kept current from the hub's events
+    
+    Only the hub parses and watches a project's status files and records
+    its history, which workers follow from the log the hub writes.
+    refresh() only waits for the first snapshot after the project was
+    requested from the hub. Workers still parse todo files for /api/tasks
+    and index the projects directory for /api/projects themselves.
+    """
+    
+    history_class = FollowedStatusHistory
+    
+    def __init__(self, project_path):
+        super().__init__(project_path)
+        self.received = threading.Event()
+    
+    def refresh(self):
+        self.received.wait(5)
+        return None
+    
+    def apply(self, event, payload):
+        """Apply an event from the hub
+        
+        Returns False if it cannot be applied because events were missed.
+        """
+        
+        with self.lock:
+            if event == 'status_update':
+                if payload.get('version', 0) < self.version:
+                    return False
+                self.snapshot = payload
+                self.version = payload.get('version', 0)
             else:
-                tasks['pending'].append({
-                    'text': task,
-                    'section': current_section,
-                    'status': 'pending'
-                })
-            tasks['all'].append(task)
+                if self.snapshot is None or payload['base_version'] != self.version:
+                    return False
+                self.snapshot = apply_delta(self.snapshot, payload)
+                self.version = payload['version']
+        
+        self.received.set()
+        return True
+
+class EncodedJSON:
+    """A JSON body serialized once, with its gzip form built on first use"""
     
-    return tasks
+    def __init__(self, payload, etag=None):
+        self.body = json.dumps(payload).encode()
+        self.etag = etag or hashlib.md5(self.body).hexdigest()
+        self._gzipped = None
+    
+    def gzipped(self):
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=6)
+        return self._gzipped
+
+def etag_matches(if_none_match, etag):
+    """Whether an If-None-Match header covers etag
+    
+    Compares weakly, as RFC 7232 asks for If-None-Match, so a W/ tag that
+    a proxy weakened after compressing the body still matches.
+    """
+    
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix('W/').strip('"') for tag in if_none_match.split(',')}
+    return etag in tags or '*' in tags
+
+def query_etag(kind, version, query_string):
+    """ETag of a query's result, from the version of the data it reads"""
+    return f'{kind}-{BOOT_ID}-{version}-{hashlib.md5(query_string).hexdigest()[:8]}'
+
+def float_arg(args, name):
+    """A query argument as a float; None if it is missing or malformed"""
+    
+    try:
+        return float(args[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def tasks_page(index, args, etag):
+    """The /api/tasks body for a query, and the total number of matches
+    
+    Raises ValueError for a malformed limit or cursor.
+    """
+    
+    total, tasks, next_cursor = query_tasks(index, args)
+    return EncodedJSON({'tasks': tasks, 'next_cursor': next_cursor}, etag), total
+
+def projects_page(index, args, etag):
+    """The /api/projects body for a query, and the total number of matches
+    
+    Raises ValueError for a malformed offset or limit.
+    """
+    
+    offset = max(int_arg(args, 'offset', 0), 0)
+    limit = int_arg(args, 'limit')
+    limit = max(limit, 0) if limit is not None else None
+    
+    total, projects = index.query(args.get('q'), args.get('status'), offset, limit)
+    return EncodedJSON(projects, etag), total
+
+def history_body(model, args):
+    """The /api/history body for a query
+    
+    Raises ValueError for an unknown resolution.
+    """
+    
+    resolution = args.get('resolution', 'auto')
+    if resolution != 'auto' and resolution not in {name for name, _, _ in TIERS}:
+        raise ValueError(f'Unknown resolution: {resolution}')
+    
+    if model.snapshot is None:
+        broadcast_status(model)
+    
+    resolution, samples = model.history.query(float_arg(args, 'since'), float_arg(args, 'until'), resolution)
+    hourly, rate = throughput(samples)
+    
+    return EncodedJSON({
+        'project_name': model.name,
+        'resolution': resolution,
+        'samples': samples,
+        'throughput': {
+            'hourly': hourly,
+            'tasks_per_hour': rate
+        }
+    })
+
+def ensure_current(model):
+    """Bring a model's snapshot up to date, unless the watcher keeps it so"""
+    
+    watcher_alive = file_observer is not None and file_observer.is_alive()
+    if model.snapshot is None or not watcher_alive:
+        broadcast_status(model)
+
+def counted_frame(frame):
+    EMITS.inc()
+    EMIT_BYTES.inc(len(frame))
+    return frame
+
+SSE_HEADERS = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+
+class StatusStream:
+    """The frames one /api/stream client is sent
+    
+    Sends a full status_update, then the same status_delta events as the
+    Socket.IO clients get, and a heartbeat when idle. A client whose queue
+    overflows gets a fresh status_update instead of the dropped deltas.
+    """
+    
+    def __init__(self, model, last_event_id=None):
+        self.model = model
+        self.last_event_id = last_event_id
+        self.sent_version = 0
+    
+    def opening(self):
+        """The first frame; none if the client resumes at the current version"""
+        
+        snapshot = current_status(self.model.name)
+        self.sent_version = snapshot.get('version') or 0
+        if self.last_event_id == str(self.sent_version):
+            return ''
+        return counted_frame(format_event('status_update', snapshot, self.sent_version))
+    
+    def next_frames(self, frames, overflowed):
+        """The text to send for what a Subscriber returned, a heartbeat if nothing"""
+        
+        if overflowed:
+            snapshot = self.model.snapshot
+            self.sent_version = snapshot.get('version') or 0
+            return counted_frame(format_event('status_update', snapshot, self.sent_version))
+        
+        if frames:
+            # Skip events already covered by the snapshot sent
+            return ''.join(frame for event_id, frame in frames
+                           if event_id is None or event_id > self.sent_version)
+        
+        return counted_frame(format_event('heartbeat', {
+            'project_name': self.model.name,
+            'version': self.model.version,
+            'timestamp': datetime.now().isoformat()
+        }))
+
+def not_modified(etag):
+    """Return a 304 response if the client already holds etag, else None"""
+    
+    if etag_matches(request.headers.get('If-None-Match'), etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    return None
 
-def watch_project_files(project_path):
-    """Start watching project files for changes"""
+def json_response(encoded):
+    """Serve an EncodedJSON with its ETag, gzipped when worthwhile"""
+    
+    response = not_modified(encoded.etag)
+    if response:
+        return response
+    
+    body = encoded.body
+    headers = {'Vary': 'Accept-Encoding'}
+    if len(body) >= GZIP_MIN_BYTES and 'gzip' in request.accept_encodings:
+        body = encoded.gzipped()
+        headers['Content-Encoding'] = 'gzip'
+    
+    response = Response(body, mimetype='application/json', headers=headers)
+    response.set_etag(encoded.etag)
+    return response
+
+def load_project_state(project_path):
+    """Register a project, start watching it and return its StatusModel"""
+    
+    project_path = os.path.abspath(project_path)
+    name = Path(project_path).name
+    
+    with watched_projects_lock:
+        model = watched_projects.get(name)
+        if model is None:
+            if bus_client:
+                model = MirroredStatusModel(project_path)
+            else:
+                model = StatusModel(project_path)
+                watch_project_files(model)
+            watched_projects[name] = model
+            created = True
+        else:
+            created = False
+    
+    if created and bus_client:
+        bus_client.send({'type': 'watch', 'project_path': project_path})
+    
+    return model
+
+def get_project_state(project_name=None):
+    """Return the StatusModel for a project name, loading it if needed
+    
+    Without a name the default project is used. Returns None if the
+    project does not exist.
+    """
+    
+    if not project_name:
+        return load_project_state(current_project) if current_project else None
+    
+    model = watched_projects.get(project_name)
+    if model is None:
+        project_path = project_dir(project_name)
+        if project_path is None:
+            return None
+        model = load_project_state(project_path)
+    return model
+
+def project_dir(project_name):
+    """Directory of a project in PROJECTS_DIR, or None if there is none
+    
+    A name is a single path component, and the directory it resolves to
+    must be inside PROJECTS_DIR, so requests cannot reach other paths.
+    """
+    
+    if (project_name in ('.', '..') or '/' in project_name or '\\' in project_name
+            or '\0' in project_name):
+        return None
+    
+    project_path = PROJECTS_DIR / project_name
+    if PROJECTS_DIR.resolve() not in project_path.resolve().parents or not project_path.is_dir():
+        return None
+    return project_path
+
+stream_broker = StreamBroker()
+
+def broadcast_status(model):
+    """Broadcast a project's latest status change, if any, to its subscribers"""
+    
+    update = model.refresh()
+    if update:
+        event, payload = update
+        fan_out(model, event, payload)
+        if bus_broker:
+            bus_broker.publish({'type': 'event', 'project': model.name,
+                                'event': event, 'payload': payload})
+
+def fan_out(model, event, payload):
+    """Send a status event to the project's Socket.IO and SSE clients"""
+    
+    socketio.emit(event, payload, to=model.name)
+    for listener in status_listeners:
+        listener(model, event, payload)
+    
+    recipients = project_subscribers.get(model.name, 0)
+    if recipients:
+        size = len(model.encoded().body) if event == 'status_update' else len(json.dumps(payload))
+        EMITS.inc(recipients)
+        EMIT_BYTES.inc(recipients * size)
+    
+    recipients, size = stream_broker.publish(model.name, event, payload, payload.get('version'))
+    EMITS.inc(recipients)
+    EMIT_BYTES.inc(recipients * size)
+
+def handle_changes(keys):
+    """Refresh each project touched by a burst of watcher events once"""
+    
+    for project_name in {project_name for project_name, _ in keys}:
+        model = watched_projects.get(project_name)
+        if model:
+            broadcast_status(model)
+
+update_pipeline = UpdateCoalescer(handle_changes)
+
+def handle_bus_request(connection, message):
+    """Hub: answer a worker's request for a project's full status"""
+    
+    if message.get('type') == 'watch':
+        model = load_project_state(message['project_path'])
+        if model.snapshot is None:
+            broadcast_status(model)
+    elif message.get('type') == 'resync':
+        model = watched_projects.get(message.get('project'))
+        if model is None:
+            return
+    else:
+        return
+    
+    bus_broker.publish({'type': 'event', 'project': model.name,
+                        'event': 'status_update', 'payload': model.snapshot}, connection)
+
+def handle_bus_message(message):
+    """Worker: pass a status event from the hub on to this worker's clients"""
+    
+    model = watched_projects.get(message.get('project'))
+    if model is None or message.get('type') != 'event':
+        return
+    
+    if model.apply(message['event'], message['payload']):
+        fan_out(model, message['event'], message['payload'])
+    else:
+        bus_client.send({'type': 'resync', 'project': model.name})
+
+def handle_bus_connect():
+    """Worker: ask the hub again for every project this worker serves"""
+    
+    for model in list(watched_projects.values()):
+        bus_client.send({'type': 'watch', 'project_path': model.project_path})
+
+def start_workers(port):
+    """Hub: start the bus and one worker process per port after ours"""
+    
+    global bus_broker
+    
+    bus_path = os.environ.get('KANBAN_BUS_SOCKET', f'/tmp/swarm-kanban-{port}.sock')
+    bus_broker = BusBroker(bus_path, handle_bus_request)
+    bus_broker.start()
+    
+    workers = []
+    for i in range(1, WORKERS + 1):
+        env = dict(os.environ, KANBAN_ROLE='worker', KANBAN_PORT=str(port + i),
+                   KANBAN_BUS_SOCKET=bus_path, KANBAN_BOOT_ID=BOOT_ID)
+        workers.append(subprocess.Popen([sys.executable, __file__] + sys.argv[1:], env=env))
+    
+    def stop_workers(*_):
+        for worker in workers:
+            worker.terminate()
+        try:
+            os.unlink(bus_path)
+        except OSError:
+            pass
+        sys.exit(0)
+    
+    signal.signal(signal.SIGTERM, stop_workers)
+    signal.signal(signal.SIGINT, stop_workers)
+    return workers
+
+def current_status(project_name=None):
+    """Return a project's full status snapshot, broadcasting any pending
+    change first"""
+    
+    model = get_project_state(project_name)
+    if model is None:
+        return parse_project_status()
+    
+    broadcast_status(model)
+    return model.snapshot
+
+def get_file_observer():
+    """Return the shared file observer, starting it on first use"""
     
     global file_observer
     
-    if file_observer:
-        file_observer.stop()
+    if file_observer is None:
+        file_observer = Observer()
+        file_observer.start()
+    return file_observer
+
+def watch_project_files(model):
+    """Start watching a project's files for changes"""
     
-    event_handler = TodoFileHandler()
-    file_observer = Observer()
+    file_observer = get_file_observer()
+    event_handler = TodoFileHandler(model.name)
+    watches = []
     
     # Watch todo directory
-    todo_dir = Path(project_path) / 'todo'
+    todo_dir = Path(model.project_path) / 'todo'
     if todo_dir.exists():
-        file_observer.schedule(event_handler, str(todo_dir), recursive=True)
+        watches.append(file_observer.schedule(event_handler, str(todo_dir), recursive=True))
     
     # Watch coordination directory
-    coord_dir = Path(project_path) / 'coordination'
+    coord_dir = Path(model.project_path) / 'coordination'
     if coord_dir.exists():
-        file_observer.schedule(event_handler, str(coord_dir), recursive=True)
+        watches.append(file_observer.schedule(event_handler, str(coord_dir), recursive=True))
+    
+    # Watch swarm.config, whose TERMINALS sets which todo files count
+    watches.append(file_observer.schedule(
+        SwarmConfigHandler(model.name), model.project_path, recursive=False))
+    
+    project_watches[model.name] = watches
+
+def parse_swarm_config(file_path):
+    """Parse a swarm.config file of KEY=value lines"""
+    
+    return swarm_config.parse_config(file_path)
+
+class ProjectsDirHandler(FileSystemEventHandler):
+    """Invalidates the project index when projects are added or removed"""
+    
+    def __init__(self, index):
+        super().__init__()
+        self.index = index
+    
+    def on_any_event(self, event):
+        if event.event_type in WATCHED_EVENT_TYPES:
+            self.index.invalidate()
+
+class ProjectIndex:
+    """In-memory index of the projects directory
+    
+    Rebuilt only when the watcher on projects/ reports a change or the TTL
+    expires; swarm.config files are reparsed only when their mtime changes.
+    """
+    
+    def __init__(self, projects_dir, ttl=PROJECT_INDEX_TTL_SECONDS):
+        self.projects_dir = Path(projects_dir)
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = []
+        self.version = 0
+        self.dirty = True
+        self.checked_at = 0.0
+        self.watch = None
+    
+    def invalidate(self):
+        self.dirty = True
+    
+    def refresh(self):
+        """Rebuild the index if it may be stale"""
+        
+        with self.lock:
+            if not self.dirty and time.monotonic() - self.checked_at < self.ttl:
+                return
+            
+            if self.watch is None and self.projects_dir.exists():
+                self.watch = get_file_observer().schedule(
+                    ProjectsDirHandler(self), str(self.projects_dir), recursive=False)
+            
+            self.dirty = False
+            self.checked_at = time.monotonic()
+            
+            entries = []
+            if self.projects_dir.exists():
+                for project_dir in sorted(self.projects_dir.iterdir()):
+                    if not project_dir.is_dir():
+                        continue
+                    config = cached_parse(project_dir / 'swarm.config', parse_swarm_config)
+                    if config is None:
+                        continue
+                    
+                    entries.append({
+                        'name': project_dir.name,
+                        'path': str(project_dir),
+                        'created': config.get('CREATED_AT', 'Unknown'),
+                        'status': config.get('STATUS', 'Unknown')
+                    })
+            
+            if entries != self.entries:
+                self.entries = entries
+                self.version += 1
     
-    file_observer.start()
+    def query(self, search=None, status=None, offset=0, limit=None):
+        """Return (total, page) of entries matching the filters"""
+        
+        entries = self.entries
+        if search:
+            search = search.lower()
+            entries = [e for e in entries if search in e['name'].lower()]
+        if status:
+            entries = [e for e in entries if e['status'].lower() == status.lower()]
+        
+        end = offset + limit if limit is not None else None
+        return len(entries), entries[offset:end]
+
+project_index = ProjectIndex(PROJECTS_DIR)
+
+def subscriber_counts():
+    """Return the number of subscribed Socket.IO clients per project"""
+    return dict(project_subscribers)
+
+def connected_clients():
+    """Return Socket.IO and SSE clients per project"""
+    
+    counts = subscriber_counts()
+    for project_name, count in stream_broker.stats()['subscribers'].items():
+        counts[project_name] = counts.get(project_name, 0) + count
+    return counts
+
+metrics.collected('kanban_watcher_events_received_total', 'File watcher events received',
+                  'counter', lambda: update_pipeline.events_received)
+metrics.collected('kanban_watcher_events_coalesced_total', 'Watcher events merged into another update',
+                  'counter', lambda: update_pipeline.events_coalesced)
+metrics.collected('kanban_watcher_flushes_total', 'Coalesced updates processed',
+                  'counter', lambda: update_pipeline.flushes)
+metrics.collected('kanban_watched_projects', 'Projects being watched',
+                  'gauge', lambda: len(watched_projects))
+metrics.collected('kanban_connected_clients', 'Connected Socket.IO and SSE clients per project',
+                  'gauge', connected_clients, label='project')
+metrics.collected('kanban_sse_dropped_events_total', 'Events dropped from full SSE client queues',
+                  'counter', lambda: stream_broker.stats()['dropped'])
 
 @app.route('/')
 def index():
@@ -184,50 +1129,148 @@ def index():
 
 @app.route('/api/status')
 def get_status():
-    """Get current project status"""
-    return jsonify(parse_project_status())
+    """Get project status, for ?project=<name> or the default project"""
+    
+    project_name = request.args.get('project')
+    model = get_project_state(project_name)
+    if model is None:
+        if project_name:
+            return jsonify({'error': 'Project not found'}), 404
+        return jsonify(parse_project_status())
+    
+    # While the watcher runs, the version is current without reparsing
+    ensure_current(model)
+    return not_modified(model.etag()) or json_response(model.encoded())
+
+@app.route('/api/stream')
+def stream_status():
+    """Stream a project's status as Server-Sent Events, see StatusStream"""
+    
+    model = get_project_state(request.args.get('project'))
+    if model is None:
+        return jsonify({'error': 'Project not found'}), 404
+    
+    stream = StatusStream(model, request.headers.get('Last-Event-ID'))
+    subscriber = stream_broker.subscribe(model.name)
+    
+    def generate():
+        try:
+            yield stream.opening()
+            while True:
+                yield stream.next_frames(*subscriber.get(HEARTBEAT_SECONDS))
+        finally:
+            stream_broker.unsubscribe(subscriber)
+    
+    return Response(generate(), mimetype='text/event-stream', headers=SSE_HEADERS)
+
+@app.route('/api/history')
+def get_history():
+    """Get a project's status history for burn-up and throughput charts
+    
+    Optional query parameters: project, since and until (Unix seconds), and
+    resolution (raw, minute, hour or auto).
+    """
+    
+    model = get_project_state(request.args.get('project'))
+    if model is None:
+        return jsonify({'error': 'Project not found'}), 404
+    
+    try:
+        return json_response(history_body(model, request.args))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/tasks')
+def get_tasks():
+    """Get a page of a project's tasks
+    
+    Optional query parameters: project, terminal, status (completed,
+    in_progress or pending), section, q (text substring), limit and cursor
+    (the next_cursor of the previous page). The total number of matches is
+    returned in the X-Total-Count header.
+    """
+    
+    model = get_project_state(request.args.get('project'))
+    if model is None:
+        return jsonify({'error': 'Project not found'}), 404
+    
+    index = model.task_index()
+    etag = query_etag('tasks', f'{model.name}-{index.version}', request.query_string)
+    response = not_modified(etag)
+    if response:
+        return response
+    
+    try:
+        encoded, total = tasks_page(index, request.args, etag)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    response = json_response(encoded)
+    response.headers['X-Total-Count'] = str(total)
+    return response
+
+@app.route('/metrics')
+def get_metrics():
+    """Prometheus metrics"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+def server_stats():
+    """Watcher pipeline counters and per-project subscribers"""
+    return {
+        'watcher': update_pipeline.stats(),
+        'projects': {
+            name: {'version': model.version}
+            for name, model in list(watched_projects.items())
+        },
+        'subscribers': subscriber_counts(),
+        'streams': stream_broker.stats(),
+        'bus': bus_broker.stats() if bus_broker else None
+    }
+
+@app.route('/api/stats')
+def get_stats():
+    """Get watcher pipeline counters and per-project subscribers"""
+    return jsonify(server_stats())
 
 @app.route('/api/projects')
 def get_projects():
-    """Get list of available projects"""
-    
-    swarm_home = Path(__file__).parent.parent
-    projects_dir = swarm_home / 'projects'
-    
-    projects = []
-    if projects_dir.exists():
-        for project_dir in projects_dir.iterdir():
-            if project_dir.is_dir() and (project_dir / 'swarm.config').exists():
-                config = {}
-                with open(project_dir / 'swarm.config', 'r') as f:
-                    for line in f:
-                        if '=' in line:
-                            key, value = line.strip().split('=', 1)
-                            config[key] = value.strip('"')
-                
-                projects.append({
-                    'name': project_dir.name,
-                    'path': str(project_dir),
-                    'created': config.get('CREATED_AT', 'Unknown'),
-                    'status': config.get('STATUS', 'Unknown')
-                })
-    
-    return jsonify(projects)
+    """Get list of available projects
+    
+    Optional query parameters: q (name substring), status, offset, limit.
+    The total number of matches is returned in the X-Total-Count header.
+    """
+    
+    project_index.refresh()
+    etag = query_etag('projects', project_index.version, request.query_string)
+    response = not_modified(etag)
+    if response:
+        return response
+    
+    try:
+        encoded, total = projects_page(project_index, request.args, etag)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    response = json_response(encoded)
+    response.headers['X-Total-Count'] = str(total)
+    return response
 
 @app.route('/api/project/<project_name>')
 def load_project(project_name):
-    """Load a specific project"""
+    """Load a specific project and start watching it
     
-    global current_project
+    Clients choose what they follow with the Socket.IO 'subscribe' event;
+    the first project loaded also becomes the default.
+    """
     
-    swarm_home = Path(__file__).parent.parent
-    project_path = swarm_home / 'projects' / project_name
+    global current_project
     
-    if not project_path.exists():
+    model = get_project_state(project_name)
+    if model is None:
         return jsonify({'error': 'Project not found'}), 404
     
-    current_project = str(project_path)
-    watch_project_files(current_project)
+    if not current_project:
+        current_project = model.project_path
     
     return jsonify({'success': True, 'project': project_name})
 
@@ -236,56 +1279,146 @@ def send_static(path):
     """Serve static files"""
     return send_from_directory('static', path)
 
+def subscribe_client(project_name):
+    """Move the current client into a project's room"""
+    
+    sid = request.sid
+    previous = client_projects.get(sid)
+    if previous and previous != project_name:
+        leave_room(previous)
+    
+    join_room(project_name)
+    client_projects[sid] = project_name
+    
+    if previous != project_name:
+        project_subscribers[project_name] = project_subscribers.get(project_name, 0) + 1
+        if previous:
+            unsubscribe_count(previous)
+
+def unsubscribe_count(project_name):
+    count = project_subscribers.get(project_name, 0) - 1
+    if count > 0:
+        project_subscribers[project_name] = count
+    else:
+        project_subscribers.pop(project_name, None)
+
+def emit_status(model):
+    """Send a project's full status to the current client"""
+    
+    emit('status_update', current_status(model.name))
+    EMITS.inc()
+    EMIT_BYTES.inc(len(model.encoded().body))
+
 @socketio.on('connect')
 def handle_connect():
-    """Handle client connection"""
+    """Handle client connection, following the default project"""
     print('Client connected')
     if current_project:
-        emit('status_update', parse_project_status())
+        model = get_project_state()
+        subscribe_client(model.name)
+        emit_status(model)
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle client disconnection"""
     print('Client disconnected')
+    project_name = client_projects.pop(request.sid, None)
+    if project_name:
+        unsubscribe_count(project_name)
+
+@socketio.on('subscribe')
+def handle_subscribe(data):
+    """Follow a single project's updates"""
+    
+    project_name = (data or {}).get('project')
+    model = get_project_state(project_name)
+    if model is None:
+        emit('status_update', {'error': 'Project not found'})
+        return
+    
+    subscribe_client(model.name)
+    emit_status(model)
 
 @socketio.on('request_update')
 def handle_update_request():
-    """Handle manual update request"""
-    emit('status_update', parse_project_status())
+    """Handle manual update request, also used by clients to resync"""
+    
+    model = get_project_state(client_projects.get(request.sid))
+    if model is None:
+        emit('status_update', parse_project_status())
+        return
+    emit_status(model)
 
-def periodic_update():
-    """Send periodic updates to all clients"""
+def heartbeat_loop():
+    """Send each subscribed project's room a keep-alive with its version
+    
+    Status changes are pushed by the file watcher, so the heartbeat does no
+    parsing. Clients whose version differs from the heartbeat's resync. Only
+    when no watcher is running does it fall back to polling for changes.
+    """
     while True:
-        time.sleep(5)  # Update every 5 seconds
-        if current_project:
-            socketio.emit('status_update', parse_project_status())
+        time.sleep(HEARTBEAT_SECONDS)
+        send_heartbeats(lambda project_name, beat: socketio.emit('heartbeat', beat, to=project_name))
+
+def send_heartbeats(emit_to):
+    """Send one round of heartbeats with emit_to(project_name, beat)"""
+    
+    watcher_alive = file_observer is not None and file_observer.is_alive()
+    timestamp = datetime.now().isoformat()
+    
+    for project_name in subscriber_counts():
+        model = watched_projects.get(project_name)
+        if model is None:
+            continue
+        
+        if not watcher_alive:
+            broadcast_status(model)
+        
+        beat = {
+            'project_name': project_name,
+            'version': model.version,
+            'timestamp': timestamp
+        }
+        emit_to(project_name, beat)
+        
+        recipients = project_subscribers.get(project_name, 0)
+        EMITS.inc(recipients)
+        EMIT_BYTES.inc(recipients * len(json.dumps(beat)))
 
 def main():
     """Main entry point"""
     
-    import sys
+    global bus_client
+    
+    # Use port 5555 to avoid conflicts with AirPlay Receiver on macOS
+    port = int(os.environ.get('KANBAN_PORT', '5555'))
+    
+    if ROLE == 'worker':
+        bus_client = BusClient(os.environ['KANBAN_BUS_SOCKET'], handle_bus_message, handle_bus_connect)
+        bus_client.start()
+    elif WORKERS > 1:
+        start_workers(port)
     
     # Check if project path provided
     if len(sys.argv) > 1:
         global current_project
-        current_project = sys.argv[1]
-        watch_project_files(current_project)
+        current_project = load_project_state(sys.argv[1]).project_path
     
-    # Start periodic update thread
-    update_thread = threading.Thread(target=periodic_update, daemon=True)
-    update_thread.start()
-    
-    # Use port 5555 to avoid conflicts with AirPlay Receiver on macOS
-    port = 5555
+    # Start heartbeat thread
+    heartbeat_thread = threading.Thread(target=heartbeat_loop, daemon=True)
+    heartbeat_thread.start()
     
     print("=" * 60)
     print("  Swarm Kanban Server")
     print("=" * 60)
     print(f"  Running on: http://localhost:{port}")
+    if bus_broker:
+        print(f"  Workers on: ports {port + 1}-{port + WORKERS}")
     print(f"  Press Ctrl+C to stop")
     print("=" * 60)
     
-    socketio.run(app, host='0.0.0.0', port=port, debug=False)
+    # The dashboard is a local tool, so Werkzeug's server is good enough
+    socketio.run(app, host='0.0.0.0', port=port, debug=False, allow_unsafe_werkzeug=True)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
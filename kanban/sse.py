@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+
+"""
+Server-Sent Events - Fan-out of status events to /api/stream subscribers
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+
+# Events buffered per subscriber before the oldest are dropped
+SSE_QUEUE_SIZE = 64
+
+def format_event(event, data, event_id=None):
+    """Format one Server-Sent Events frame"""
+    
+    frame = f'event: {event}\ndata: {json.dumps(data, separators=(",", ":"))}\n\n'
+    if event_id is not None:
+        frame = f'id: {event_id}\n' + frame
+    return frame
+
+class Subscriber:
+    """One stream client with a bounded queue of pending frames
+    
+    When the queue is full the oldest frame is dropped and the subscriber is
+    flagged, so the stream sends a full snapshot instead of a broken chain
+    of deltas.
+    """
+    
+    def __init__(self, project_name, maxsize=SSE_QUEUE_SIZE):
+        self.project_name = project_name
+        self.frames = deque(maxlen=maxsize)
+        self.ready = threading.Event()
+        self.lock = threading.Lock()
+        self.overflowed = False
+        self.dropped = 0
+    
+    def put(self, frame, event_id=None):
+        """Queue a frame; returns whether the oldest frame was dropped for it"""
+        
+        with self.lock:
+            dropped = len(self.frames) == self.frames.maxlen
+            if dropped:
+                self.overflowed = True
+                self.dropped += 1
+            self.frames.append((event_id, frame))
+        self.ready.set()
+        return dropped
+    
+    def get(self, timeout):
+        """Wait for pending frames; returns ([(event_id, frame)], overflowed)
+        
+        Returns an empty list if nothing arrived within timeout.
+        """
+        
+        self.ready.wait(timeout)
+        with self.lock:
+            frames = list(self.frames)
+            overflowed = self.overflowed
+            self.frames.clear()
+            self.overflowed = False
+            self.ready.clear()
+        return frames, overflowed
+
+class AsyncSubscriber(Subscriber):
+    """Subscriber that an asyncio task can wait on without holding a thread"""
+    
+    def __init__(self, project_name, loop, maxsize=SSE_QUEUE_SIZE):
+        super().__init__(project_name, maxsize)
+        self.loop = loop
+        self.pending = asyncio.Event()
+    
+    def put(self, frame, event_id=None):
+        dropped = super().put(frame, event_id)
+        self.wake()
+        return dropped
+    
+    def wake(self):
+        """Wake the waiting task; safe to call from any thread"""
+        try:
+            self.loop.call_soon_threadsafe(self.pending.set)
+        except RuntimeError:
+            # Event loop already closed
+            pass
+    
+    async def get_async(self, timeout):
+        """Like get(), awaiting frames on the event loop"""
+        
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                await asyncio.wait_for(self.pending.wait(), max(remaining, 0))
+            except asyncio.TimeoutError:
+                return self.get(0)
+            
+            self.pending.clear()
+            frames, overflowed = self.get(0)
+            if frames or overflowed or remaining <= 0:
+                return frames, overflowed
+
+class StreamBroker:
+    """Publishes preformatted frames to every subscriber of a project
+    
+    Publishing never blocks on a subscriber: each frame is formatted once
+    and appended to every subscriber's bounded queue.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = {}
+        self.frames_published = 0
+        # Frames dropped from any subscriber's queue, including ones gone since
+        self.dropped_total = 0
+    
+    def subscribe(self, project_name, loop=None):
+        """Add a subscriber; with an asyncio loop it is an AsyncSubscriber"""
+        
+        subscriber = AsyncSubscriber(project_name, loop) if loop else Subscriber(project_name)
+        with self.lock:
+            self.subscribers.setdefault(project_name, set()).add(subscriber)
+        return subscriber
+    
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            subscribers = self.subscribers.get(subscriber.project_name)
+            if subscribers:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self.subscribers[subscriber.project_name]
+    
+    def publish(self, project_name, event, data, event_id=None):
+        """Queue an event for a project's subscribers
+        
+        Returns (number of subscribers, frame size in bytes).
+        """
+        
+        with self.lock:
+            subscribers = list(self.subscribers.get(project_name, ()))
+        if not subscribers:
+            return 0, 0
+        
+        frame = format_event(event, data, event_id)
+        dropped = sum(1 for subscriber in subscribers if subscriber.put(frame, event_id))
+        with self.lock:
+            self.frames_published += 1
+            self.dropped_total += dropped
+        return len(subscribers), len(frame)
+    
+    def stats(self):
+        with self.lock:
+            return {
+                'subscribers': {name: len(subs) for name, subs in self.subscribers.items()},
+                'dropped': self.dropped_total,
+                'frames_published': self.frames_published
+            }